@@ -0,0 +1,99 @@
+"""Benchmark: custo do vetor de complexidade em função da profundidade de aninhamento.
+
+Compara o algoritmo anterior (um `ast.walk` por componente, que re-percorre cada
+corpo aninhado uma vez por escopo envolvente: O(n * profundidade)) com a
+travessia única de `_summarize_tree` (O(nós)).
+
+Uso:
+    python benchmarks/bench_complexity_nesting.py [--depths 5 10 20 40 80] [--repeat 5]
+"""
+
+from __future__ import annotations
+
+import argparse
+import ast
+import time
+from typing import Dict, List
+
+from sheer_audit.scan.advanced import _complexity_from_counts, _summarize_tree
+
+_COMPONENTS = (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)
+
+
+def build_nested_source(depth: int, statements: int = 20) -> str:
+    """Gera classes/funções aninhadas com `statements` if/for por nível."""
+
+    lines: List[str] = []
+    for level in range(depth):
+        indent = "    " * level
+        keyword = "class" if level % 2 == 0 else "def"
+        signature = f"C{level}:" if keyword == "class" else f"f{level}(self):"
+        lines.append(f"{indent}{keyword} {signature}")
+        for index in range(statements):
+            lines.append(f"{indent}    if {index}:")
+            lines.append(f"{indent}        for _ in range({index}):")
+            lines.append(f"{indent}            pass")
+    lines.append("    " * depth + "pass")
+    return "\n".join(lines) + "\n"
+
+
+def legacy_complexity_vector(tree: ast.AST) -> List[Dict[str, object]]:
+    """Reprodução do algoritmo anterior (walk por componente) para comparação."""
+
+    vector: List[Dict[str, object]] = []
+    stack: List[ast.AST] = []
+
+    def walk(node: ast.AST) -> None:
+        if isinstance(node, _COMPONENTS):
+            counts = {"decorators": len(node.decorator_list), "conditionals": 0, "loops": 0}
+            for child in ast.walk(node):
+                if isinstance(child, ast.If):
+                    counts["conditionals"] += 1
+                elif isinstance(child, (ast.For, ast.AsyncFor, ast.While)):
+                    counts["loops"] += 1
+            vector.append({"x": node.name, "y": len(stack), **_complexity_from_counts(counts, len(stack))})
+            stack.append(node)
+            for child in ast.iter_child_nodes(node):
+                walk(child)
+            stack.pop()
+            return
+        for child in ast.iter_child_nodes(node):
+            walk(child)
+
+    walk(tree)
+    return vector
+
+
+def _best_of(repeat: int, fn) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--depths", type=int, nargs="+", default=[5, 10, 20, 40, 80])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'depth':>6} {'nodes':>8} {'before (ms)':>12} {'after (ms)':>11} {'speedup':>8}")
+    for depth in args.depths:
+        tree = ast.parse(build_nested_source(depth))
+        nodes = sum(1 for _ in ast.walk(tree))
+
+        before_vector = legacy_complexity_vector(tree)
+        after_vector = _summarize_tree("bench.py", tree, None)["complexity_vector"]
+        assert [item["partial_derivative"] for item in before_vector] == [
+            item["partial_derivative"] for item in after_vector
+        ], "algoritmos divergem"
+
+        before = _best_of(args.repeat, lambda: legacy_complexity_vector(tree))
+        after = _best_of(args.repeat, lambda: _summarize_tree("bench.py", tree, None))
+        print(f"{depth:>6} {nodes:>8} {before * 1000:>12.2f} {after * 1000:>11.2f} {before / after:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -10,13 +10,15 @@ from pathlib import Path
 import typer
 from rich.console import Console
 
+from .config import load_architecture
 from .db.triggers import run_forward_fix_audit
 from .governance.axisfolds import AxisFoldsLock
 from .governance.planning import build_governance_bundle
 from .model.db_engine import SheerDBEngine
 from .model.hybrid_db import HybridAuditDB
 from .model.schema import Finding, RepoInfo, RepoModel
-from .scan.advanced import SheerAdvancedEngine
+from .scan.advanced import FullAnalysis, SheerAdvancedEngine
+from .scan.index import DEFAULT_INDEX_PATH
 
 app = typer.Typer(help="Sheer Audit CLI")
 analyze_app = typer.Typer(help="Análise granular de componentes")
@@ -29,33 +31,80 @@ app.add_typer(blueprint_app, name="blueprint")
 app.add_typer(evolution_app, name="evolution")
 
 
+def _build_engine(
+    repo_path: str,
+    config: str = "",
+    index_path: str | None = None,
+    jobs: int = 1,
+    discovery: str = "fs",
+    since: str | None = None,
+) -> SheerAdvancedEngine:
+    """Motor com a mesma `[architecture]` em todo comando (`--config` ou sheer.toml da raiz)."""
+
+    try:
+        return SheerAdvancedEngine(
+            repo_path,
+            index_path=index_path,
+            jobs=jobs,
+            discovery=discovery,
+            since=since,
+            architecture=load_architecture(repo_path, config),
+        )
+    except (FileNotFoundError, ValueError) as exc:
+        console.print(f"❌ {exc}")
+        raise typer.Exit(code=2)
+
+
+def _print_timings(analysis: FullAnalysis) -> None:
+    console.print("⏱️  Tempo por estágio (s):")
+    for stage, seconds in analysis.timings.items():
+        console.print(f"  {stage}: {seconds:.6f}")
+
+
 @app.command()
 def advanced(
     full_scan: bool = typer.Option(True, help="Executa mapeamento cartesiano e detecção estrutural."),
     uml: bool = typer.Option(False, help="Exibe etapa de UML (placeholder determinístico)."),
     ieee: bool = typer.Option(False, help="Gera pacote IEEE 1016/1028."),
     export: str = typer.Option("docs/sheer_audit", help="Diretório de exportação de artefatos."),
+    index_path: str = typer.Option(
+        DEFAULT_INDEX_PATH,
+        help="Índice incremental: auto (cache do usuário, fora do repo), caminho ou vazio (desativa).",
+    ),
+    jobs: int = typer.Option(1, "--jobs", help="Processos para análise por arquivo (0 = todos os núcleos)."),
+    timings: bool = typer.Option(False, "--timings", help="Exibe relatório de tempo por estágio da análise."),
+    discovery: str = typer.Option("fs", "--discovery", help="fs (varre o disco) ou git (arquivos rastreados)."),
+    since: str = typer.Option("", "--since", help="Reporta só arquivos alterados desde a ref git (o grafo segue seus imports)."),
+    config: str = typer.Option(
+        "", "--config", help="sheer.toml com [architecture] (padrão: sheer.toml da raiz, se existir)."
+    ),
 ) -> None:
     """Executa o modo de engenharia avançada IEEE/ITIL."""
 
     console.print("[bold blue]Iniciando Suite de Auditoria Avançada IEEE/ITIL...[/bold blue]")
-    engine = SheerAdvancedEngine(".")
-
-    if full_scan:
-        cartesian = engine.generate_cartesian_map()
-        errors = engine.detect_structural_errors()
+    engine = _build_engine(".", config, index_path=index_path, jobs=jobs, discovery=discovery, since=since or None)
+    try:
+        analysis = engine.run_full_analysis() if full_scan or ieee else None
+    except (FileNotFoundError, ValueError) as exc:
+        console.print(f"❌ {exc}")
+        raise typer.Exit(code=2)
+
+    if analysis is not None and full_scan:
         console.print(
-            f"Indexing concluído: {len(cartesian['coordinates'])} componentes, "
-            f"{len(errors)} erros estruturais."
+            f"Indexing concluído: {len(analysis.cartesian['coordinates'])} componentes, "
+            f"{len(analysis.structural_errors)} erros estruturais."
         )
 
     if uml:
         console.print("Gerando Diagramas de Sequência e Classe... (roadmap)")
 
     if ieee:
-        manifest = engine.export_ieee_pack(export)
+        manifest = engine.export_ieee_pack(export, analysis=analysis)
         console.print(f"Relatórios IEEE gerados em {export} com {manifest['metrics']}.")
 
+    if analysis is not None and timings:
+        _print_timings(analysis)
+
 
 @app.command()
 def scan(
@@ -65,15 +114,23 @@ def scan(
     db_user: str = typer.Option("USER_IA_SERVICE", "--db-user", help="Identidade de serviço para trilha."),
     audit_version: str = typer.Option("2.0.0", help="Versão da linha de auditoria."),
     vault_path: str = typer.Option("docs/sheeraudit/2.0.0/logs/audit.sheerdb", help="Vault append-only."),
+    discovery: str = typer.Option("fs", "--discovery", help="fs (varre o disco) ou git (arquivos rastreados)."),
+    since: str = typer.Option("", "--since", help="Audita só arquivos alterados desde a ref git (o grafo segue seus imports)."),
 ) -> None:
     """Executa scan com gatilho Forward-Fix e consolida evidências."""
 
-    result = run_forward_fix_audit(
-        target_path=target_path,
-        reports_path=f"docs/sheeraudit/{audit_version}/reports",
-        repo_path=".",
-        run_id=f"{audit_version}-{mode}",
-    )
+    try:
+        result = run_forward_fix_audit(
+            target_path=target_path,
+            reports_path=f"docs/sheeraudit/{audit_version}/reports",
+            repo_path=".",
+            run_id=f"{audit_version}-{mode}",
+            since=since or None,
+            discovery=discovery,
+        )
+    except ValueError as exc:
+        console.print(f"❌ {exc}")
+        raise typer.Exit(code=2)
 
     payload = {
         "audit_version": audit_version,
@@ -114,15 +171,15 @@ def scan(
 def audit_secure(
     repo_path: str = typer.Option(".", help="Raiz do repositório para análise."),
     vault_path: str = typer.Option("docs/sheer_audit/vault/audit.sheerdb", help="Arquivo SheerDB."),
+    fsync: bool = typer.Option(False, "--fsync", help="Força fsync único após gravar o lote."),
 ) -> None:
     """Executa auditoria profunda e salva resultados no SheerDB."""
 
-    engine = SheerAdvancedEngine(repo_path)
+    engine = _build_engine(repo_path)
     db = SheerDBEngine(vault_path=vault_path)
 
     errors = engine.detect_structural_errors()
-    for error in errors:
-        db.commit_record("system_errors", error)
+    db.commit_many("system_errors", errors, fsync=fsync)
 
     console.print(f"✅ Auditoria concluída. {len(errors)} registos blindados no SheerDB.")
 
@@ -151,16 +208,23 @@ def snapshot_command(
     ref: str = typer.Option("working-tree", help="Commit/tag/branch da fotografia."),
     vault_path: str = typer.Option("docs/sheer_audit/vault/audit.sheerdb", help="Arquivo SheerDB."),
     timestamp: str = typer.Option("static", help="Timestamp lógico determinístico."),
+    index_path: str = typer.Option(
+        DEFAULT_INDEX_PATH,
+        help="Índice incremental: auto (cache do usuário, fora do repo), caminho ou vazio (desativa).",
+    ),
+    jobs: int = typer.Option(1, "--jobs", help="Processos para análise por arquivo (0 = todos os núcleos)."),
+    timings: bool = typer.Option(False, "--timings", help="Exibe relatório de tempo por estágio da análise."),
 ) -> None:
     """Cria snapshot com componentes, findings, dependências e mapa de execução."""
 
     repo = Path(repo_path)
-    engine = SheerAdvancedEngine(str(repo))
+    engine = _build_engine(str(repo), index_path=index_path, jobs=jobs)
     db = SheerDBEngine(vault_path=vault_path)
 
-    findings = engine.detect_structural_errors()
-    components = engine.build_component_inventory()
-    execution_tree = engine.build_execution_tree()
+    analysis = engine.run_full_analysis()
+    findings = analysis.structural_errors
+    components = analysis.inventory
+    execution_tree = analysis.execution_tree
     dependencies = _extract_dependencies(repo)
 
     payload: dict[str, object] = {
@@ -182,6 +246,8 @@ def snapshot_command(
     console.print(
         f"📸 Snapshot `{snapshot_id}` salvo com {len(components)} componentes e {len(findings)} findings."
     )
+    if timings:
+        _print_timings(analysis)
 
 
 @app.command("analyze")
@@ -189,23 +255,20 @@ def analyze_command(
     component: list[str] = typer.Option([], "--component", help="Filtro de componente(s) por substring."),
     repo_path: str = typer.Option(".", help="Raiz do repositório analisado."),
     output: str = typer.Option("docs/sheeraudit/2.0.0/component_analysis.json", help="Saída JSON."),
+    index_path: str = typer.Option(
+        DEFAULT_INDEX_PATH,
+        help="Índice incremental: auto (cache do usuário, fora do repo), caminho ou vazio (desativa).",
+    ),
+    jobs: int = typer.Option(1, "--jobs", help="Processos para análise por arquivo (0 = todos os núcleos)."),
+    timings: bool = typer.Option(False, "--timings", help="Exibe relatório de tempo por estágio da análise."),
 ) -> None:
     """Executa análise granular por componente (um ou vários)."""
 
-    engine = SheerAdvancedEngine(repo_path)
-    components = engine.build_component_inventory()
-    findings = engine.detect_structural_errors()
-
-    if component:
-        filters = [token.lower() for token in component]
-        components = [
-            item for item in components if any(token in str(item["id"]).lower() for token in filters)
-        ]
-        findings = [
-            item
-            for item in findings
-            if any(token in str(item["file"]).lower() for token in filters)
-        ]
+    engine = _build_engine(repo_path, index_path=index_path, jobs=jobs)
+    # Com filtros, só arquivos candidatos são resumidos (pushdown no engine).
+    analysis = engine.run_filtered_analysis(component) if component else engine.run_full_analysis()
+    components = analysis.inventory
+    findings = analysis.structural_errors
 
     payload = {
         "repo_path": str(Path(repo_path).resolve()),
@@ -220,6 +283,8 @@ def analyze_command(
     target.parent.mkdir(parents=True, exist_ok=True)
     target.write_text(json.dumps(payload, indent=2, ensure_ascii=False), encoding="utf-8")
     console.print(f"🔎 Análise de componentes exportada para {target}")
+    if timings:
+        _print_timings(analysis)
 
 
 @blueprint_app.command("generate")
@@ -244,9 +309,9 @@ def blueprint_generate_command(
         findings = list(snapshot.get("findings", []))
         source = f"snapshot:{snapshot_id}"
     else:
-        engine = SheerAdvancedEngine(repo_path)
-        components = engine.build_component_inventory()
-        findings = engine.detect_structural_errors()
+        analysis = _build_engine(repo_path).run_full_analysis()
+        components = analysis.inventory
+        findings = analysis.structural_errors
 
     by_kind: dict[str, int] = {}
     for component in components:
@@ -442,19 +507,60 @@ def db_command(
     export_csv: str = typer.Option("", "--export-csv", help="Exporta banco para CSV no caminho indicado."),
     list_snapshots: bool = typer.Option(False, "--list-snapshots", help="Lista snapshots persistidos."),
     purge: bool = typer.Option(False, "--purge", help="Remove arquivo de banco local."),
+    rebuild_index: bool = typer.Option(False, "--rebuild-index", help="Reconstrói o índice lateral de offsets."),
+    verify_index: bool = typer.Option(False, "--verify-index", help="Confere o índice lateral contra o vault."),
+    jobs: int = typer.Option(1, "--jobs", help="Processos para --verify (vault fatiado por linhas)."),
+    verify_chain: bool = typer.Option(
+        False, "--verify-chain", help="Verificação encadeada incremental a partir do último checkpoint."
+    ),
+    full_chain: bool = typer.Option(False, "--full-chain", help="Com --verify-chain, recalcula a cadeia desde o início."),
+    export_legacy: str = typer.Option("", "--export-legacy", help="Exporta o vault no formato SIGNATURE|JSON."),
+    import_legacy: str = typer.Option("", "--import-legacy", help="Importa um vault SIGNATURE|JSON existente."),
+    backend: str = typer.Option("auto", "--backend", help="file, sqlite ou auto (pela extensão do vault)."),
     vault_path: str = typer.Option("docs/sheer_audit/vault/audit.sheerdb", help="Arquivo SheerDB."),
 ) -> None:
     """Gerencia operações de manutenção do SheerDB."""
 
-    db = SheerDBEngine(vault_path=vault_path)
+    try:
+        db = SheerDBEngine(vault_path=vault_path, backend=backend)
+    except ValueError as exc:
+        console.print(f"❌ {exc}")
+        raise typer.Exit(code=2)
 
     if init:
         path = db.init_storage()
         console.print(f"SheerDB inicializado em {path}.")
 
+    if import_legacy:
+        count = db.import_legacy(import_legacy)
+        console.print(f"Importados {count} registros de {import_legacy} ({db.backend}).")
+
     if verify:
-        stats = db.verify_integrity()
+        stats = db.verify_integrity_report(jobs=jobs)
         console.print(f"Integridade: total={stats['total']} valid={stats['valid']} invalid={stats['invalid']}")
+        offsets = list(stats["invalid_offsets"])
+        if offsets:
+            shown = ", ".join(str(offset) for offset in offsets[:20])
+            suffix = f" (+{len(offsets) - 20})" if len(offsets) > 20 else ""
+            console.print(f"Offsets inválidos: {shown}{suffix}")
+
+    if verify_chain:
+        try:
+            chain = db.verify_chain(full=full_chain)
+        except ValueError as exc:
+            console.print(f"❌ {exc}")
+            raise typer.Exit(code=2)
+        console.print(
+            f"Cadeia: ok={chain['chain_ok']} total={chain['total']} valid={chain['valid']} "
+            f"invalid={chain['invalid']} checked={chain['checked']} resumed_from={chain['resumed_from']}"
+        )
+        if not chain["chain_ok"]:
+            console.print(f"❌ Trecho adulterado (bytes): {chain['tampered_segment']}")
+            raise typer.Exit(code=1)
+
+    if export_legacy:
+        count = db.export_legacy(export_legacy)
+        console.print(f"Vault legado exportado em {export_legacy} com {count} registros.")
 
     if export_csv:
         count = db.export_csv(export_csv)
@@ -464,11 +570,37 @@ def db_command(
         snapshots = db.list_snapshots()
         console.print_json(json.dumps(snapshots, ensure_ascii=False, indent=2))
 
+    if rebuild_index:
+        count = db.rebuild_index()
+        target = db.path if db.backend == "sqlite" else db.index_path
+        console.print(f"Índice reconstruído em {target} com {count} entradas.")
+
+    if verify_index:
+        index_stats = db.verify_index()
+        console.print(
+            f"Índice: entries={index_stats['entries']} consistent={index_stats['consistent']} "
+            f"inconsistent={index_stats['inconsistent']} "
+            f"covered={index_stats['covered_bytes']}/{index_stats['vault_bytes']} bytes"
+        )
+
     if purge:
         db.purge()
         console.print("Vault removido com sucesso.")
 
-    if not any([init, verify, export_csv, list_snapshots, purge]):
+    if not any(
+        [
+            init,
+            verify,
+            verify_chain,
+            export_csv,
+            list_snapshots,
+            purge,
+            rebuild_index,
+            verify_index,
+            export_legacy,
+            import_legacy,
+        ]
+    ):
         console.print("Nenhuma operação escolhida. Use --help.")
 
 
@@ -482,13 +614,65 @@ def analyze_component_command(
 ) -> None:
     """Analisa um único componente e persiste AST em camada híbrida."""
 
-    engine = SheerAdvancedEngine(repo_path)
-    hybrid = HybridAuditDB(sql_path=sql_path, blob_root=blob_root)
+    engine = _build_engine(repo_path)
     component_data = engine.analyze_component(name)
-    record = hybrid.persist_component_audit(component_data=component_data, version_tag=version_tag)
+    with HybridAuditDB(sql_path=sql_path, blob_root=blob_root) as hybrid:
+        record = hybrid.persist_component_audit(component_data=component_data, version_tag=version_tag)
     console.print_json(json.dumps(record, ensure_ascii=False))
 
 
+@analyze_app.command("lineage")
+def analyze_lineage_command(
+    component: str = typer.Option("", "--component", help="Filtra por nome exato do componente."),
+    version_from: str = typer.Option("", "--version-from", help="Versão mínima (inclusiva)."),
+    version_to: str = typer.Option("", "--version-to", help="Versão máxima (inclusiva)."),
+    status: str = typer.Option("", "--status", help="Filtra por status (STABLE/FAIL)."),
+    latest: bool = typer.Option(False, "--latest", help="Apenas a versão mais recente de cada componente."),
+    limit: int = typer.Option(100, "--limit", help="Tamanho da página."),
+    cursor: str = typer.Option("", "--cursor", help="next_cursor da página anterior."),
+    sql_path: str = typer.Option("docs/sheer_audit/vault/lineage.db", help="Banco SQL de linhagem."),
+) -> None:
+    """Consulta paginada da linhagem persistida por `analyze component`."""
+
+    with HybridAuditDB(sql_path=sql_path) as hybrid:
+        try:
+            page = hybrid.query_lineage(
+                component=component or None,
+                version_from=version_from or None,
+                version_to=version_to or None,
+                status=status or None,
+                latest=latest,
+                limit=limit,
+                cursor=cursor or None,
+            )
+        except ValueError as exc:
+            console.print(f"❌ {exc}")
+            raise typer.Exit(code=2)
+    console.print_json(json.dumps(page, ensure_ascii=False))
+
+
+@analyze_app.command("calls")
+def analyze_calls_command(
+    repo_path: str = typer.Option(".", help="Raiz do repositório."),
+    output: str = typer.Option("docs/sheeraudit/2.0.0/call_graph.json", help="RepoModel JSON com arestas CALLS."),
+    index_path: str = typer.Option(
+        DEFAULT_INDEX_PATH,
+        help="Índice incremental: auto (cache do usuário, fora do repo), caminho ou vazio (desativa).",
+    ),
+) -> None:
+    """Exporta o grafo de chamadas entre símbolos como `RepoModel.edges` (tipo CALLS)."""
+
+    engine = _build_engine(repo_path, index_path=index_path)
+    edges = engine.build_call_edges()
+    repo = Path(repo_path).resolve()
+    report = RepoModel(repo=RepoInfo(root=str(repo), name=repo.name), edges=edges, metrics={"call_edges": len(edges)})
+
+    target = Path(output)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    target.write_text(report.model_dump_json(indent=2), encoding="utf-8")
+    console.print(f"📞 {len(edges)} arestas CALLS exportadas para {target}")
+
+
 @blueprint_app.command("generate")
 def blueprint_generate_command(
     repo_path: str = typer.Option(".", help="Raiz do repositório."),
@@ -496,9 +680,9 @@ def blueprint_generate_command(
 ) -> None:
     """Gera blueprint textual do estado atual."""
 
-    engine = SheerAdvancedEngine(repo_path)
-    components = engine.build_component_inventory()
-    execution_tree = engine.build_execution_tree()
+    analysis = _build_engine(repo_path).run_full_analysis()
+    components = analysis.inventory
+    execution_tree = analysis.execution_tree
 
     lines = ["# Blueprint Atual", "", f"- Componentes: **{len(components)}**", "", "## Execução"]
     for module_name, symbols in execution_tree.items():
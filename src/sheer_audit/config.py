@@ -89,7 +89,8 @@ def load_config(path: str = "sheer.toml") -> SheerConfig:
     if not Path(path).exists():
         raise FileNotFoundError(f"Config file not found: {path}")
 
-    raw = toml.load(path)
+    # `utf-8-sig`: aceita arquivos salvos com BOM (como o sheer.toml deste repositório).
+    raw = toml.loads(Path(path).read_text(encoding="utf-8-sig"))
 
     project = ProjectConfig(**raw.get("project", {}))
 
@@ -145,3 +146,19 @@ def load_config(path: str = "sheer.toml") -> SheerConfig:
         architecture=architecture,
         docs=docs,
     )
+
+
+def load_architecture(repo_path: str = ".", config_path: str = "") -> Optional[ArchitectureConfig]:
+    """Seção `[architecture]` usada por toda construção do motor de análise.
+
+    Com `config_path`, lê esse arquivo (que precisa existir); sem ele, usa o
+    `sheer.toml` da raiz do repositório analisado, se houver. None mantém as
+    regras de camada padrão.
+    """
+
+    if config_path:
+        return load_config(config_path).architecture
+    candidate = Path(repo_path) / "sheer.toml"
+    if candidate.is_file():
+        return load_config(str(candidate)).architecture
+    return None
@@ -5,16 +5,34 @@ import json
 from pathlib import Path
 from typing import Any, Dict, List
 
+from ..config import load_architecture
 from ..scan.advanced import SheerAdvancedEngine
 
 
-def perform_semantic_scan(target_path: str, repo_path: str = ".") -> Dict[str, Any]:
-    """Executa varredura semântica determinística no escopo indicado."""
+def perform_semantic_scan(
+    target_path: str,
+    repo_path: str = ".",
+    since: str | None = None,
+    discovery: str = "fs",
+    config: str = "",
+) -> Dict[str, Any]:
+    """Executa varredura semântica determinística no escopo indicado.
+
+    Com `since`, só arquivos alterados desde a ref git são reportados; o grafo
+    cobre o fecho de imports a partir deles, inclusive módulos inalterados.
+    """
 
-    engine = SheerAdvancedEngine(repo_path=repo_path)
+    engine = SheerAdvancedEngine(
+        repo_path=repo_path,
+        discovery=discovery,
+        since=since,
+        architecture=load_architecture(repo_path, config),
+    )
+    # Só o escopo e o fecho de imports alcançável a partir dele são analisados.
+    summaries = engine.scoped_summaries(target_path)
     structural_errors = [
         error
-        for error in engine.detect_structural_errors()
+        for error in engine.detect_structural_errors(summaries=summaries)
         if error["file"].startswith(target_path.rstrip("/"))
     ]
 
@@ -94,10 +112,15 @@ def run_forward_fix_audit(
     reports_path: str = "docs/sheeraudit/2.0.0/reports",
     repo_path: str = ".",
     run_id: str | None = None,
+    since: str | None = None,
+    discovery: str = "fs",
+    config: str = "",
 ) -> Dict[str, Any]:
     """Executa auditoria no modo de governança linear (Forward-Fix)."""
 
-    findings = perform_semantic_scan(target_path=target_path, repo_path=repo_path)
+    findings = perform_semantic_scan(
+        target_path=target_path, repo_path=repo_path, since=since, discovery=discovery, config=config
+    )
     artifacts: Dict[str, str] = {}
 
     if findings["critical_errors"]:
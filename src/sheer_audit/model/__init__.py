@@ -1,4 +1,5 @@
 from .db_engine import SheerDBEngine
 from .hybrid_db import HybridAuditDB
+from .sqlite_vault import SQLiteVault
 
-__all__ = ["SheerDBEngine", "HybridAuditDB"]
+__all__ = ["SheerDBEngine", "HybridAuditDB", "SQLiteVault"]
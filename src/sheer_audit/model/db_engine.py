@@ -5,18 +5,95 @@ import hashlib
 import hmac
 import json
 import os
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Dict, List, Sequence
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from .sqlite_vault import SQLITE_SUFFIXES, SQLiteVault, VaultRow
+
+_JSON_DECODER = json.JSONDecoder()
+# Entradas do índice são gravadas com `sort_keys`: filtro barato antes do `json.loads`.
+_SNAPSHOT_INDEX_MARKER = b'"table": "snapshots"'
+DEFAULT_VERIFY_CHUNK_BYTES = 64 * 1024 * 1024
+CHAIN_VERSION = 1
+CHAIN_GENESIS = "0" * 64
+CHAIN_CHECKPOINT_EVERY = 1024
+
+
+def _verify_range(task: Tuple[str, bytes, int, int]) -> Dict[str, object]:
+    """Worker: valida o HMAC das linhas que começam em `[start, end)` do vault.
+
+    `start` precisa estar alinhado a um início de linha; a última linha pode
+    ultrapassar `end` e é lida inteira (o próximo trecho começa depois dela).
+    """
+
+    path, key, start, end = task
+    total = 0
+    valid = 0
+    invalid_offsets: List[int] = []
+    with open(path, "rb") as handle:
+        handle.seek(start)
+        offset = start
+        while offset < end:
+            line = handle.readline()
+            if not line:
+                break
+            line_offset = offset
+            offset += len(line)
+            row = line.decode("utf-8", errors="replace").strip()
+            if not row:
+                continue
+            total += 1
+            sig, sep, content = row.partition("|")
+            expected = hmac.new(key, content.encode("utf-8"), hashlib.sha256).hexdigest()
+            if sep and hmac.compare_digest(sig, expected):
+                valid += 1
+            else:
+                invalid_offsets.append(line_offset)
+
+    return {"total": total, "valid": valid, "invalid": len(invalid_offsets), "invalid_offsets": invalid_offsets}
+
+
+class SheerDBBatch:
+    """Lote de registros pendentes de `SheerDBEngine.batch`."""
+
+    def __init__(self, engine: "SheerDBEngine") -> None:
+        self._engine = engine
+        self._pending: List[Tuple[str, Dict[str, object], str]] = []
+
+    def commit_record(self, table: str, data: Dict[str, object], timestamp: str = "static") -> None:
+        self._pending.append((table, data, timestamp))
+
+    def flush(self, fsync: bool = False) -> int:
+        written = self._engine._append_records(self._pending, fsync=fsync)
+        self._pending = []
+        return written
 
 
 class SheerDBEngine:
-    """Append-only store com assinatura HMAC para evidências de auditoria."""
+    """Append-only store com assinatura HMAC para evidências de auditoria.
 
-    def __init__(self, vault_path: str = "docs/sheer_audit/vault/audit.sheerdb"):
+    `backend="file"` usa o formato legado `SIGNATURE|JSON` (com índice lateral e
+    cadeia de hashes); `backend="sqlite"` guarda os mesmos pares assinados em
+    SQLite/WAL indexado por tabela, timestamp e snapshot_id. `"auto"` escolhe
+    SQLite para caminhos `.sqlite`/`.sqlite3`.
+    """
+
+    def __init__(self, vault_path: str = "docs/sheer_audit/vault/audit.sheerdb", backend: str = "auto"):
         self.path = Path(vault_path)
         self.path.parent.mkdir(parents=True, exist_ok=True)
         self.key = os.getenv("SHEER_DB_SECRET", "axis_folds_2026_secure").encode("utf-8")
+        if backend == "auto":
+            backend = "sqlite" if self.path.suffix in SQLITE_SUFFIXES else "file"
+        if backend not in {"file", "sqlite"}:
+            raise ValueError(f"backend desconhecido: {backend}")
+        self.backend = backend
+        self._sqlite = SQLiteVault(self.path) if backend == "sqlite" else None
+        self.index_path = self.path.with_name(self.path.name + ".idx")
+        self.chain_path = self.path.with_name(self.path.name + ".chain")
+        self._index_cache: Optional[Tuple[int, List[Dict[str, object]], Dict[object, List[Dict[str, object]]]]] = None
 
     def _generate_hmac(self, payload: str) -> str:
         return hmac.new(self.key, payload.encode("utf-8"), hashlib.sha256).hexdigest()
@@ -25,74 +102,548 @@ class SheerDBEngine:
         """Inicializa o vault local para comandos de preflight/db init."""
 
         self.path.parent.mkdir(parents=True, exist_ok=True)
-        self.path.touch(exist_ok=True)
+        if self._sqlite is not None:
+            self._sqlite.connect()
+        else:
+            self.path.touch(exist_ok=True)
         return self.path
 
+    def close(self) -> None:
+        if self._sqlite is not None:
+            self._sqlite.close()
+
     def commit_record(self, table: str, data: Dict[str, object], timestamp: str = "static") -> None:
         """Salva registro assinado em formato SIGNATURE|JSON\\n."""
 
-        entry = {"version": "2.1.0", "timestamp": timestamp, "table": table, "payload": data}
-        raw_json = json.dumps(entry, sort_keys=True, ensure_ascii=False)
-        signature = self._generate_hmac(raw_json)
+        self._append_records([(table, data, timestamp)])
+
+    def commit_many(
+        self,
+        table: str,
+        records: Iterable[Dict[str, object]],
+        timestamp: str = "static",
+        fsync: bool = False,
+    ) -> int:
+        """Assina e grava vários registros da mesma tabela em um único append."""
+
+        return self._append_records([(table, data, timestamp) for data in records], fsync=fsync)
+
+    @contextmanager
+    def batch(self, fsync: bool = False) -> Iterator["SheerDBBatch"]:
+        """Acumula `commit_record` de várias tabelas e grava tudo ao sair do bloco.
+
+        Se o bloco levantar exceção nada é gravado (sem lote parcial no vault).
+        """
+
+        pending = SheerDBBatch(self)
+        yield pending
+        pending.flush(fsync=fsync)
+
+    def _append_records(self, items: Sequence[Tuple[str, Dict[str, object], str]], fsync: bool = False) -> int:
+        if not items:
+            return 0
+
+        if self._sqlite is not None:
+            rows: List[VaultRow] = []
+            for table, data, timestamp in items:
+                entry = {"version": "2.1.0", "timestamp": timestamp, "table": table, "payload": data}
+                raw_json = json.dumps(entry, sort_keys=True, ensure_ascii=False)
+                snapshot_id = data.get("snapshot_id") if table == "snapshots" else None
+                rows.append(
+                    (
+                        table,
+                        timestamp,
+                        None if snapshot_id is None else str(snapshot_id),
+                        self._generate_hmac(raw_json),
+                        raw_json,
+                    )
+                )
+            self._sqlite.append(rows, fsync=fsync)
+            return len(rows)
+
+        lines: List[bytes] = []
+        index_entries: List[Dict[str, object]] = []
+        for table, data, timestamp in items:
+            entry = {"version": "2.1.0", "timestamp": timestamp, "table": table, "payload": data}
+            raw_json = json.dumps(entry, sort_keys=True, ensure_ascii=False)
+            signature = self._generate_hmac(raw_json)
+            line = f"{signature}|{raw_json}\n".encode("utf-8")
+            lines.append(line)
+            index_entries.append(
+                {
+                    "length": len(line),
+                    "signature": signature,
+                    "table": table,
+                    "snapshot_id": data.get("snapshot_id") if table == "snapshots" else None,
+                }
+            )
 
+        self._sync_index()
         with self.path.open("ab") as handle:
-            handle.write(f"{signature}|{raw_json}\n".encode("utf-8"))
-
-    def _iter_verified_entries(self) -> Sequence[Dict[str, object]]:
-        rows: List[Dict[str, object]] = []
+            offset = handle.tell()
+            handle.write(b"".join(lines))
+            if fsync:
+                handle.flush()
+                os.fsync(handle.fileno())
+
+        for index_entry in index_entries:
+            index_entry["offset"] = offset
+            offset += int(index_entry["length"])
+        self._append_index_entries(index_entries)
+        return len(lines)
+
+    # --- índice lateral de offsets -------------------------------------------------
+    #
+    # `<vault>.idx` guarda uma linha JSON por linha do vault (offset, tamanho,
+    # assinatura, tabela e snapshot_id) para que buscas façam seek direto no
+    # registro em vez de reler, re-assinar e decodificar o vault inteiro. O índice
+    # cobre o vault de forma contígua; se o vault crescer por fora (escritor
+    # legado) o trecho faltante é indexado sob demanda, e se encolher o índice é
+    # reconstruído.
+
+    def _index_entry_for_line(self, offset: int, line: bytes) -> Dict[str, object]:
+        entry: Dict[str, object] = {
+            "offset": offset,
+            "length": len(line),
+            "signature": "",
+            "table": None,
+            "snapshot_id": None,
+        }
+        row = line.decode("utf-8", errors="replace").strip()
+        try:
+            sig, content = row.split("|", 1)
+        except ValueError:
+            return entry
+
+        # Tabela e snapshot_id não dependem da chave: um índice construído sob outro
+        # `SHEER_DB_SECRET` continua localizando os registros. O HMAC é conferido
+        # na leitura (`_read_indexed`).
+        entry["signature"] = sig
+        try:
+            record = json.loads(content)
+        except ValueError:
+            return entry
+        if not isinstance(record, dict):
+            return entry
+
+        entry["table"] = record.get("table")
+        if record.get("table") == "snapshots":
+            entry["snapshot_id"] = record.get("payload", {}).get("snapshot_id")
+        return entry
+
+    def _scan_index_entries(self, start: int = 0) -> Iterator[Dict[str, object]]:
         if not self.path.exists():
-            return rows
-
+            return
         with self.path.open("rb") as handle:
+            handle.seek(start)
+            offset = start
             for line in handle:
-                row = line.decode("utf-8", errors="replace").strip()
-                if not row:
+                yield self._index_entry_for_line(offset, line)
+                offset += len(line)
+
+    def _append_index_entries(self, entries: Sequence[Dict[str, object]]) -> None:
+        if not entries:
+            return
+        with self.index_path.open("ab") as handle:
+            for entry in entries:
+                handle.write((json.dumps(entry, sort_keys=True, ensure_ascii=False) + "\n").encode("utf-8"))
+        self._index_cache = None
+
+    def _indexed_end(self) -> int:
+        """Fim (em bytes) do trecho do vault coberto pelo índice, lendo só a cauda."""
+
+        if not self.index_path.exists():
+            return 0
+        with self.index_path.open("rb") as handle:
+            handle.seek(0, os.SEEK_END)
+            size = handle.tell()
+            handle.seek(max(0, size - 65536))
+            lines = [line for line in handle.read().splitlines() if line.strip()]
+        if not lines:
+            return 0
+        try:
+            last = json.loads(lines[-1])
+            return int(last["offset"]) + int(last["length"])
+        except (ValueError, KeyError, TypeError):
+            return -1
+
+    def _sync_index(self) -> None:
+        vault_size = self.path.stat().st_size if self.path.exists() else 0
+        indexed_end = self._indexed_end()
+        if indexed_end == vault_size:
+            return
+        if indexed_end < 0 or indexed_end > vault_size:
+            self.rebuild_index()
+            return
+        self._append_index_entries(list(self._scan_index_entries(start=indexed_end)))
+
+    def rebuild_index(self) -> int:
+        """Reconstrói o índice lateral a partir do vault. Retorna o número de entradas."""
+
+        if self._sqlite is not None:
+            return self._sqlite.reindex()
+
+        tmp_path = self.index_path.with_name(self.index_path.name + ".tmp")
+        count = 0
+        with tmp_path.open("wb") as handle:
+            for entry in self._scan_index_entries():
+                handle.write((json.dumps(entry, sort_keys=True, ensure_ascii=False) + "\n").encode("utf-8"))
+                count += 1
+        os.replace(tmp_path, self.index_path)
+        self._index_cache = None
+        return count
+
+    def verify_index(self) -> Dict[str, int]:
+        """Confere se cada entrada do índice aponta para a linha assinada correspondente."""
+
+        vault_size = self.path.stat().st_size if self.path.exists() else 0
+        if self._sqlite is not None:
+            return dict(self._sqlite.check(), covered_bytes=vault_size, vault_bytes=vault_size)
+
+        stats = {"entries": 0, "consistent": 0, "inconsistent": 0, "covered_bytes": 0, "vault_bytes": vault_size}
+        if not self.index_path.exists():
+            return stats
+
+        expected_offset = 0
+        with self.index_path.open("rb") as index_handle, self.path.open("rb") as vault_handle:
+            for raw in index_handle:
+                if not raw.strip():
                     continue
+                stats["entries"] += 1
+                try:
+                    entry = json.loads(raw)
+                    offset, length = int(entry["offset"]), int(entry["length"])
+                except (ValueError, KeyError, TypeError):
+                    stats["inconsistent"] += 1
+                    continue
+
+                vault_handle.seek(offset)
+                line = vault_handle.read(length)
+                if offset == expected_offset and self._index_entry_for_line(offset, line) == entry:
+                    stats["consistent"] += 1
+                else:
+                    stats["inconsistent"] += 1
+                expected_offset = offset + length
+
+        stats["covered_bytes"] = expected_offset
+        return stats
+
+    def _load_index(self) -> Tuple[List[Dict[str, object]], Dict[object, List[Dict[str, object]]]]:
+        """Entradas da tabela `snapshots` (em ordem) e agrupadas por snapshot_id.
+
+        Só entradas de snapshot ficam em memória; as demais são descartadas sem
+        decodificar o JSON, então o cache cresce com o número de snapshots.
+        """
+
+        self._sync_index()
+        vault_size = self.path.stat().st_size if self.path.exists() else 0
+        if self._index_cache is not None and self._index_cache[0] == vault_size:
+            return self._index_cache[1], self._index_cache[2]
+
+        entries: List[Dict[str, object]] = []
+        by_snapshot: Dict[object, List[Dict[str, object]]] = {}
+        if self.index_path.exists():
+            with self.index_path.open("rb") as handle:
+                for raw in handle:
+                    if _SNAPSHOT_INDEX_MARKER not in raw:
+                        continue
+                    entry = json.loads(raw)
+                    if entry.get("table") == "snapshots":
+                        entries.append(entry)
+                        by_snapshot.setdefault(entry.get("snapshot_id"), []).append(entry)
+
+        self._index_cache = (vault_size, entries, by_snapshot)
+        return entries, by_snapshot
+
+    def _read_indexed(self, entries: Sequence[Dict[str, object]]) -> List[Dict[str, object]]:
+        """Lê por seek os registros apontados pelo índice, revalidando o HMAC de cada um."""
+
+        records: List[Dict[str, object]] = []
+        if not entries or not self.path.exists():
+            return records
+        with self.path.open("rb") as handle:
+            for entry in entries:
+                handle.seek(int(entry["offset"]))
+                row = handle.read(int(entry["length"])).decode("utf-8", errors="replace").strip()
                 try:
                     sig, content = row.split("|", 1)
                 except ValueError:
                     continue
-
-                if not hmac.compare_digest(sig, self._generate_hmac(content)):
+                if sig != entry.get("signature") or not hmac.compare_digest(sig, self._generate_hmac(content)):
                     continue
+                records.append(json.loads(content))
+        return records
 
-                rows.append(json.loads(content))
-
-        return rows
+    def _iter_rows(self, table: Optional[str] = None) -> Iterator[Tuple[Optional[str], str]]:
+        """Gera `(assinatura, conteúdo)` por linha não vazia; assinatura None se malformada.
 
-    def verify_integrity(self) -> Dict[str, int]:
-        total = 0
-        valid = 0
-        invalid = 0
+        No backend SQLite o filtro `table` vai para a consulta indexada; no formato
+        de arquivo ele é ignorado aqui e aplicado por `iter_entries`.
+        """
 
+        if self._sqlite is not None:
+            for _, sig, content in self._sqlite.iter_rows(table):
+                yield (sig or None), content
+            return
         if not self.path.exists():
-            return {"total": 0, "valid": 0, "invalid": 0}
-
+            return
         with self.path.open("rb") as handle:
             for line in handle:
                 row = line.decode("utf-8", errors="replace").strip()
                 if not row:
                     continue
-                total += 1
                 try:
                     sig, content = row.split("|", 1)
                 except ValueError:
-                    invalid += 1
+                    yield None, row
                     continue
+                yield sig, content
+
+    @staticmethod
+    def _peek_table(content: str) -> Optional[str]:
+        """Lê só o valor de `"table"` sem decodificar o registro inteiro.
+
+        Registros são serializados com `sort_keys`, então `"table"` vem depois de
+        `"payload"` e só é seguido por `timestamp`/`version` (strings, onde aspas
+        aparecem escapadas): a última ocorrência de `"table": ` é a chave do topo.
+        """
+
+        position = content.rfind('"table": ')
+        if position < 0:
+            return None
+        try:
+            value, _ = _JSON_DECODER.raw_decode(content, position + len('"table": '))
+        except ValueError:
+            return None
+        return value if isinstance(value, str) else None
+
+    def iter_entries(self, table: Optional[str] = None) -> Iterator[Dict[str, object]]:
+        """Itera registros com HMAC válido em streaming (memória constante).
+
+        Com `table`, linhas de outras tabelas são descartadas antes do HMAC e do
+        `json.loads`, olhando apenas a chave `"table"`.
+        """
+
+        for sig, content in self._iter_rows(table):
+            if sig is None:
+                continue
+            if table is not None:
+                peeked = self._peek_table(content)
+                if peeked is not None and peeked != table:
+                    continue
+            if not hmac.compare_digest(sig, self._generate_hmac(content)):
+                continue
+
+            entry = json.loads(content)
+            if table is not None and entry.get("table") != table:
+                continue
+            yield entry
 
-                if hmac.compare_digest(sig, self._generate_hmac(content)):
-                    valid += 1
+    def _chunk_boundaries(self, chunks: int) -> List[int]:
+        """Divide o vault em `chunks` faixas de bytes alinhadas a quebras de linha."""
+
+        size = self.path.stat().st_size
+        boundaries = [0]
+        with self.path.open("rb") as handle:
+            for index in range(1, chunks):
+                handle.seek(max(size * index // chunks - 1, boundaries[-1]))
+                handle.readline()
+                position = handle.tell()
+                if boundaries[-1] < position < size:
+                    boundaries.append(position)
+        boundaries.append(size)
+        return boundaries
+
+    def verify_integrity_report(
+        self,
+        jobs: int = 1,
+        chunk_bytes: int = DEFAULT_VERIFY_CHUNK_BYTES,
+    ) -> Dict[str, object]:
+        """Verifica todas as assinaturas e lista os offsets das linhas inválidas.
+
+        Com `jobs > 1` o vault é fatiado em faixas alinhadas a `\\n` (no mínimo uma
+        por worker, no máximo `chunk_bytes` cada) e validado em um pool de processos.
+        """
+
+        report: Dict[str, object] = {"total": 0, "valid": 0, "invalid": 0, "invalid_offsets": []}
+        if not self.path.exists():
+            return report
+
+        if self._sqlite is not None:
+            # No SQLite os "offsets" são os ids das linhas inválidas.
+            invalid_ids: List[int] = []
+            for row_id, sig, content in self._sqlite.iter_rows():
+                report["total"] = int(report["total"]) + 1
+                if sig and hmac.compare_digest(sig, self._generate_hmac(content)):
+                    report["valid"] = int(report["valid"]) + 1
                 else:
-                    invalid += 1
+                    invalid_ids.append(row_id)
+            report["invalid"] = len(invalid_ids)
+            report["invalid_offsets"] = invalid_ids
+            return report
+
+        size = self.path.stat().st_size
+        if jobs <= 1 or size == 0:
+            return _verify_range((str(self.path), self.key, 0, size))
+
+        chunks = max(jobs, -(-size // max(chunk_bytes, 1)))
+        boundaries = self._chunk_boundaries(chunks)
+        tasks = [(str(self.path), self.key, start, end) for start, end in zip(boundaries, boundaries[1:])]
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            results = list(pool.map(_verify_range, tasks))
+
+        offsets: List[int] = []
+        for result in results:
+            report["total"] = int(report["total"]) + int(result["total"])
+            report["valid"] = int(report["valid"]) + int(result["valid"])
+            report["invalid"] = int(report["invalid"]) + int(result["invalid"])
+            offsets.extend(result["invalid_offsets"])
+        report["invalid_offsets"] = sorted(offsets)
+        return report
+
+    def verify_integrity(self, jobs: int = 1) -> Dict[str, int]:
+        report = self.verify_integrity_report(jobs=jobs)
+        return {"total": int(report["total"]), "valid": int(report["valid"]), "invalid": int(report["invalid"])}
+
+    # --- cadeia de hashes com checkpoints ---------------------------------------------
+    #
+    # `<vault>.chain` guarda a raiz encadeada `r_i = sha256(r_{i-1} || linha_i)` até o
+    # último byte verificado, os contadores acumulados e checkpoints periódicos
+    # (offset, raiz). O arquivo é assinado com a mesma chave HMAC do vault, então não
+    # pode ser forjado sem a chave. A verificação incremental retoma do último
+    # offset e só lê linhas novas; a verificação completa recalcula a cadeia desde o
+    # byte zero e compara com cada checkpoint, localizando o trecho adulterado.
 
-        return {"total": total, "valid": valid, "invalid": invalid}
+    @staticmethod
+    def _chain_step(root: str, line: bytes) -> str:
+        return hashlib.sha256(bytes.fromhex(root) + line).hexdigest()
+
+    def _load_chain(self) -> Optional[Dict[str, object]]:
+        if not self.chain_path.exists():
+            return None
+        try:
+            raw = json.loads(self.chain_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        signature = str(raw.pop("signature", ""))
+        body = json.dumps(raw, sort_keys=True, ensure_ascii=False)
+        if raw.get("version") != CHAIN_VERSION or not hmac.compare_digest(signature, self._generate_hmac(body)):
+            return None
+        return raw
+
+    def _save_chain(self, state: Dict[str, object]) -> None:
+        body = dict(state, version=CHAIN_VERSION)
+        body["signature"] = self._generate_hmac(json.dumps(body, sort_keys=True, ensure_ascii=False))
+        tmp_path = self.chain_path.with_name(self.chain_path.name + ".tmp")
+        tmp_path.write_text(json.dumps(body, sort_keys=True, ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp_path, self.chain_path)
+
+    def verify_chain(self, full: bool = False) -> Dict[str, object]:
+        """Verificação encadeada: incremental (só registros novos) ou completa.
+
+        Incremental é O(registros novos): confia no prefixo já coberto pelo checkpoint
+        assinado, conferindo apenas que o vault não encolheu e que a última linha
+        encadeada não mudou. A completa (`full=True`) relê tudo e detecta adulteração
+        de qualquer registro antigo comparando a raiz recalculada com cada checkpoint.
+        Se a cadeia quebrar, o checkpoint anterior é preservado como evidência.
+        """
+
+        if self._sqlite is not None:
+            raise ValueError("verify_chain requer o backend de arquivo (use verify_integrity no SQLite).")
+
+        previous = self._load_chain()
+        vault_size = self.path.stat().st_size if self.path.exists() else 0
+        result: Dict[str, object] = {"chain_ok": True, "tampered_segment": None, "resumed_from": 0, "checked": 0}
+        state: Dict[str, object] = {
+            "offset": 0,
+            "root": CHAIN_GENESIS,
+            "total": 0,
+            "valid": 0,
+            "invalid": 0,
+            "tail": None,
+            "checkpoints": [],
+        }
+        expected: Dict[int, str] = {}
+
+        if previous is not None and full:
+            expected = {int(item["offset"]): str(item["root"]) for item in previous.get("checkpoints", [])}
+            expected[int(previous["offset"])] = str(previous["root"])
+        elif previous is not None:
+            state = dict(previous, checkpoints=list(previous.get("checkpoints", [])))
+            result["resumed_from"] = int(previous["offset"])
+            tail = previous.get("tail")
+            if int(previous["offset"]) > vault_size:
+                result["chain_ok"] = False
+                result["tampered_segment"] = [vault_size, int(previous["offset"])]
+            elif tail is not None:
+                with self.path.open("rb") as handle:
+                    handle.seek(int(tail["offset"]))
+                    line = handle.read(int(previous["offset"]) - int(tail["offset"]))
+                if hashlib.sha256(line).hexdigest() != tail["sha256"]:
+                    result["chain_ok"] = False
+                    result["tampered_segment"] = [int(tail["offset"]), int(previous["offset"])]
+
+        root = str(state["root"])
+        offset = int(state["offset"])
+        last_checkpoint = offset
+        since_checkpoint = 0
+        pending = sorted(expected)
+
+        if result["chain_ok"] and self.path.exists():
+            with self.path.open("rb") as handle:
+                handle.seek(offset)
+                for line in handle:
+                    line_offset = offset
+                    offset += len(line)
+                    root = self._chain_step(root, line)
+                    result["checked"] = int(result["checked"]) + 1
+                    state["tail"] = {"offset": line_offset, "sha256": hashlib.sha256(line).hexdigest()}
+
+                    row = line.decode("utf-8", errors="replace").strip()
+                    if row:
+                        state["total"] = int(state["total"]) + 1
+                        sig, sep, content = row.partition("|")
+                        if sep and hmac.compare_digest(sig, self._generate_hmac(content)):
+                            state["valid"] = int(state["valid"]) + 1
+                        else:
+                            state["invalid"] = int(state["invalid"]) + 1
+
+                    if pending and offset >= pending[0]:
+                        # Checkpoint atingido (ou pulado por mudança de tamanho): a raiz tem de bater.
+                        checkpoint = pending.pop(0)
+                        if offset != checkpoint or expected[checkpoint] != root:
+                            result["chain_ok"] = False
+                            result["tampered_segment"] = [last_checkpoint, checkpoint]
+                            break
+                        last_checkpoint = checkpoint
+
+                    since_checkpoint += 1
+                    if since_checkpoint >= CHAIN_CHECKPOINT_EVERY:
+                        state["checkpoints"].append({"offset": offset, "root": root})
+                        since_checkpoint = 0
+
+            if result["chain_ok"] and pending:
+                result["chain_ok"] = False
+                result["tampered_segment"] = [last_checkpoint, pending[-1]]
+
+        if result["chain_ok"]:
+            state["offset"] = offset
+            state["root"] = root
+            self._save_chain(state)
+
+        result.update(
+            {
+                "total": int(state["total"]),
+                "valid": int(state["valid"]),
+                "invalid": int(state["invalid"]),
+                "root": str(state["root"]),
+                "offset": int(state["offset"]),
+            }
+        )
+        return result
 
     def fetch_all(self, table: str) -> List[Dict[str, object]]:
-        valid_records: List[Dict[str, object]] = []
-        for entry in self._iter_verified_entries():
-            if entry.get("table") == table:
-                valid_records.append(entry.get("payload", {}))
-        return valid_records
+        return [entry.get("payload", {}) for entry in self.iter_entries(table)]
 
     def record_snapshot(self, snapshot: Dict[str, object], timestamp: str = "static") -> None:
         """Registra um snapshot versionado com metadados de evolução."""
@@ -100,7 +651,11 @@ class SheerDBEngine:
         self.commit_record("snapshots", snapshot, timestamp=timestamp)
 
     def list_snapshots(self) -> List[Dict[str, object]]:
-        snapshots = self.fetch_all("snapshots")
+        if self._sqlite is not None:
+            snapshots = self.fetch_all("snapshots")
+        else:
+            snapshot_entries, _ = self._load_index()
+            snapshots = [record.get("payload", {}) for record in self._read_indexed(snapshot_entries)]
         return sorted(
             snapshots,
             key=lambda item: (
@@ -110,10 +665,22 @@ class SheerDBEngine:
         )
 
     def get_snapshot(self, snapshot_id: str) -> Dict[str, object] | None:
-        for item in self.list_snapshots():
-            if item.get("snapshot_id") == snapshot_id:
-                return item
-        return None
+        if self._sqlite is not None:
+            candidates = [
+                json.loads(content).get("payload", {})
+                for _, sig, content in self._sqlite.snapshot_rows(str(snapshot_id))
+                if sig and hmac.compare_digest(sig, self._generate_hmac(content))
+            ]
+            candidates = [item for item in candidates if item.get("snapshot_id") == snapshot_id]
+        else:
+            _, by_snapshot = self._load_index()
+            candidates = [
+                record.get("payload", {}) for record in self._read_indexed(by_snapshot.get(snapshot_id, []))
+            ]
+        if not candidates:
+            return None
+        # Mesmo desempate de `list_snapshots` quando o id foi gravado mais de uma vez.
+        return min(candidates, key=lambda item: str(item.get("timestamp", "")))
 
     @staticmethod
     def _component_index(snapshot: Dict[str, object]) -> Dict[str, str]:
@@ -224,14 +791,13 @@ class SheerDBEngine:
         return diff
 
     def export_csv(self, output_path: str) -> int:
-        rows: List[Dict[str, object]] = list(self._iter_verified_entries())
-
         target = Path(output_path)
         target.parent.mkdir(parents=True, exist_ok=True)
+        count = 0
         with target.open("w", newline="", encoding="utf-8") as csvfile:
             writer = csv.writer(csvfile)
             writer.writerow(["version", "timestamp", "table", "payload"])
-            for item in rows:
+            for item in self.iter_entries():
                 writer.writerow(
                     [
                         item.get("version", ""),
@@ -240,9 +806,68 @@ class SheerDBEngine:
                         json.dumps(item.get("payload", {}), ensure_ascii=False, sort_keys=True),
                     ]
                 )
+                count += 1
+
+        return count
 
-        return len(rows)
+    def export_legacy(self, output_path: str) -> int:
+        """Exporta todos os registros (válidos ou não) no formato `SIGNATURE|JSON`."""
+
+        target = Path(output_path)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        count = 0
+        with target.open("wb") as handle:
+            for sig, content in self._iter_rows():
+                row = content if sig is None else f"{sig}|{content}"
+                handle.write(f"{row}\n".encode("utf-8"))
+                count += 1
+        return count
+
+    def import_legacy(self, source_path: str) -> int:
+        """Importa um vault `SIGNATURE|JSON` preservando as assinaturas originais.
+
+        Linhas adulteradas são mantidas como estão (continuam inválidas na verificação).
+        """
+
+        source = SheerDBEngine(vault_path=source_path, backend="file")
+        count = 0
+        if self._sqlite is not None:
+            rows: List[VaultRow] = []
+            for sig, content in source._iter_rows():
+                table: Optional[str] = None
+                timestamp: Optional[str] = None
+                snapshot_id: Optional[str] = None
+                try:
+                    record = json.loads(content) if sig is not None else {}
+                except ValueError:
+                    record = {}
+                if isinstance(record, dict):
+                    table = record.get("table")
+                    timestamp = record.get("timestamp")
+                    if table == "snapshots" and isinstance(record.get("payload"), dict):
+                        raw_id = record["payload"].get("snapshot_id")
+                        snapshot_id = None if raw_id is None else str(raw_id)
+                rows.append((table, timestamp, snapshot_id, sig or "", content))
+            self._sqlite.append(rows)
+            return len(rows)
+
+        self._sync_index()
+        with self.path.open("ab") as handle:
+            for sig, content in source._iter_rows():
+                row = content if sig is None else f"{sig}|{content}"
+                handle.write(f"{row}\n".encode("utf-8"))
+                count += 1
+        self._sync_index()
+        return count
 
     def purge(self) -> None:
+        if self._sqlite is not None:
+            self._sqlite.purge()
+            return
         if self.path.exists():
             self.path.unlink()
+        if self.index_path.exists():
+            self.index_path.unlink()
+        if self.chain_path.exists():
+            self.chain_path.unlink()
+        self._index_cache = None
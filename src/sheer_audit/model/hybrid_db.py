@@ -1,14 +1,52 @@
 from __future__ import annotations
 
+import gzip
 import hashlib
 import json
+import os
+import re
 import sqlite3
 from pathlib import Path
-from typing import Dict, List
+from typing import IO, Dict, Iterable, List, Optional, Sequence, Tuple
+
+BLOB_SUFFIX = ".json.gz"
+DEFAULT_PAGE_SIZE = 100
+_LINEAGE_COLUMNS = "id, component_name, version_tag, nosql_blob_path, complexity_index, integrity_hash, status"
+_VERSION_PART = re.compile(r"\d+|[^\d.\-+]+")
+
+
+def _version_key(version_tag: str) -> str:
+    """Chave ordenável de versão: partes numéricas com zero à esquerda ("2.10" > "2.9")."""
+
+    return ".".join(
+        part.zfill(10) if part.isdigit() else part for part in _VERSION_PART.findall(str(version_tag))
+    )
+
+
+_INSERT_LINEAGE = """
+    INSERT INTO audit_lineage (
+        component_name,
+        version_tag,
+        nosql_blob_path,
+        complexity_index,
+        integrity_hash,
+        status,
+        execution_json,
+        version_key
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+"""
 
 
 class HybridAuditDB:
-    """Persistência híbrida: SQL (linhagem) + blob semântico em arquivo JSON."""
+    """Persistência híbrida: SQL (linhagem) + blob semântico endereçado por conteúdo.
+
+    Mantém uma única conexão SQLite (WAL) aberta durante a vida da instância; o
+    schema é criado apenas na primeira abertura. Use `close()` ou `with`.
+
+    Cada AST é gravada uma única vez, comprimida com gzip, em
+    `blob_root/<hash[:2]>/<hash>.json.gz`, onde `hash` é o `integrity_hash` da
+    linhagem. Versões com AST idêntica apontam para o mesmo blob.
+    """
 
     def __init__(
         self,
@@ -17,74 +55,78 @@ class HybridAuditDB:
     ) -> None:
         self.sql_path = Path(sql_path)
         self.blob_root = Path(blob_root)
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def __enter__(self) -> "HybridAuditDB":
+        self.init()
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def init(self) -> sqlite3.Connection:
+        if self._conn is not None:
+            return self._conn
 
-    def init(self) -> None:
         self.sql_path.parent.mkdir(parents=True, exist_ok=True)
-        self.blob_root.mkdir(parents=True, exist_ok=True)
-        with sqlite3.connect(self.sql_path) as conn:
-            conn.execute(
-                """
-                CREATE TABLE IF NOT EXISTS audit_lineage (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    component_name TEXT NOT NULL,
-                    version_tag TEXT NOT NULL,
-                    nosql_blob_path TEXT NOT NULL,
-                    complexity_index REAL NOT NULL,
-                    integrity_hash TEXT NOT NULL,
-                    status TEXT NOT NULL
-                )
-                """
+        conn = sqlite3.connect(self.sql_path)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS audit_lineage (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                component_name TEXT NOT NULL,
+                version_tag TEXT NOT NULL,
+                nosql_blob_path TEXT NOT NULL,
+                complexity_index REAL NOT NULL,
+                integrity_hash TEXT NOT NULL,
+                status TEXT NOT NULL,
+                execution_json TEXT NOT NULL DEFAULT '{}',
+                version_key TEXT NOT NULL DEFAULT ''
             )
-            conn.commit()
+            """
+        )
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(audit_lineage)")}
+        if "execution_json" not in columns:
+            conn.execute("ALTER TABLE audit_lineage ADD COLUMN execution_json TEXT NOT NULL DEFAULT '{}'")
+        if "version_key" not in columns:
+            conn.execute("ALTER TABLE audit_lineage ADD COLUMN version_key TEXT NOT NULL DEFAULT ''")
+            conn.create_function("sheer_version_key", 1, _version_key, deterministic=True)
+            conn.execute("UPDATE audit_lineage SET version_key = sheer_version_key(version_tag)")
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_lineage_component ON audit_lineage (component_name, version_key)"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_lineage_version ON audit_lineage (version_key)")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_lineage_status ON audit_lineage (status, component_name)")
+        conn.commit()
+        self._conn = conn
+        return conn
 
-    def persist_component_audit(self, component_data: Dict[str, object], version_tag: str) -> Dict[str, object]:
-        self.init()
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def blob_path(self, integrity_hash: str) -> Path:
+        return self.blob_root / integrity_hash[:2] / f"{integrity_hash}{BLOB_SUFFIX}"
+
+    def _write_blob(self, component_data: Dict[str, object], version_tag: str) -> Dict[str, object]:
         component_name = str(component_data.get("component", "unknown"))
         full_ast = component_data.get("ast", {})
         complexity_index = float(len(component_data.get("components", [])))
 
-        digest = hashlib.sha256(
-            json.dumps(full_ast, sort_keys=True, ensure_ascii=False).encode("utf-8")
-        ).hexdigest()
-
-        blob_path = self.blob_root / f"{component_name.replace('/', '_').replace(':', '_')}.json"
-        blob_path.write_text(
-            json.dumps(
-                {
-                    "component": component_name,
-                    "version_tag": version_tag,
-                    "ast": full_ast,
-                    "execution": component_data.get("execution", {}),
-                },
-                ensure_ascii=False,
-                sort_keys=True,
-                indent=2,
-            ),
-            encoding="utf-8",
-        )
+        payload = json.dumps(full_ast, sort_keys=True, ensure_ascii=False).encode("utf-8")
+        digest = hashlib.sha256(payload).hexdigest()
 
-        with sqlite3.connect(self.sql_path) as conn:
-            conn.execute(
-                """
-                INSERT INTO audit_lineage (
-                    component_name,
-                    version_tag,
-                    nosql_blob_path,
-                    complexity_index,
-                    integrity_hash,
-                    status
-                ) VALUES (?, ?, ?, ?, ?, ?)
-                """,
-                (
-                    component_name,
-                    version_tag,
-                    blob_path.as_posix(),
-                    complexity_index,
-                    digest,
-                    "STABLE" if component_data.get("found") else "FAIL",
-                ),
-            )
-            conn.commit()
+        blob_path = self.blob_path(digest)
+        if not blob_path.exists():
+            blob_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = blob_path.with_name(f"{blob_path.name}.{os.getpid()}.tmp")
+            # mtime=0 mantém o arquivo comprimido determinístico para o mesmo conteúdo.
+            with tmp_path.open("wb") as raw, gzip.GzipFile(fileobj=raw, mode="wb", mtime=0) as handle:
+                handle.write(payload)
+            os.replace(tmp_path, blob_path)
 
         return {
             "component_name": component_name,
@@ -92,19 +134,71 @@ class HybridAuditDB:
             "nosql_blob_path": blob_path.as_posix(),
             "complexity_index": complexity_index,
             "integrity_hash": digest,
+            "status": "STABLE" if component_data.get("found") else "FAIL",
+            "execution": component_data.get("execution", {}),
         }
 
+    def open_blob(self, integrity_hash: str) -> IO[bytes]:
+        """Abre o blob como fluxo descomprimido (nada é carregado até ser lido)."""
+
+        return gzip.open(self.blob_path(integrity_hash), "rb")
+
+    def load_blob(self, integrity_hash: str) -> object:
+        with self.open_blob(integrity_hash) as handle:
+            return json.load(handle)
+
+    def verify_blob(self, integrity_hash: str, chunk_size: int = 1 << 20) -> bool:
+        """Recalcula o sha256 do blob em blocos, sem materializá-lo em memória."""
+
+        if not self.blob_path(integrity_hash).exists():
+            return False
+        digest = hashlib.sha256()
+        with self.open_blob(integrity_hash) as handle:
+            for chunk in iter(lambda: handle.read(chunk_size), b""):
+                digest.update(chunk)
+        return digest.hexdigest() == integrity_hash
+
+    def persist_many(
+        self, components: Iterable[Dict[str, object]], version_tag: str
+    ) -> List[Dict[str, object]]:
+        """Grava os blobs e insere todas as linhas de linhagem em uma única transação."""
+
+        conn = self.init()
+        records = [self._write_blob(component_data, version_tag) for component_data in components]
+        with conn:
+            conn.executemany(
+                _INSERT_LINEAGE,
+                [
+                    (
+                        record["component_name"],
+                        record["version_tag"],
+                        record["nosql_blob_path"],
+                        record["complexity_index"],
+                        record["integrity_hash"],
+                        record["status"],
+                        json.dumps(record["execution"], sort_keys=True, ensure_ascii=False),
+                        _version_key(str(record["version_tag"])),
+                    )
+                    for record in records
+                ],
+            )
+        return [
+            {key: value for key, value in record.items() if key not in {"status", "execution"}}
+            for record in records
+        ]
+
+    def persist_component_audit(self, component_data: Dict[str, object], version_tag: str) -> Dict[str, object]:
+        return self.persist_many([component_data], version_tag)[0]
+
     def list_lineage(self) -> List[Dict[str, object]]:
-        self.init()
-        with sqlite3.connect(self.sql_path) as conn:
-            rows = conn.execute(
-                """
-                SELECT component_name, version_tag, nosql_blob_path,
-                       complexity_index, integrity_hash, status
-                FROM audit_lineage
-                ORDER BY component_name, version_tag
-                """
-            ).fetchall()
+        rows = self.init().execute(
+            """
+            SELECT component_name, version_tag, nosql_blob_path,
+                   complexity_index, integrity_hash, status
+            FROM audit_lineage
+            ORDER BY component_name, version_tag
+            """
+        ).fetchall()
 
         return [
             {
@@ -117,3 +211,104 @@ class HybridAuditDB:
             }
             for row in rows
         ]
+
+    @staticmethod
+    def _lineage_row(row: Sequence[object]) -> Dict[str, object]:
+        return {
+            "id": row[0],
+            "component_name": row[1],
+            "version_tag": row[2],
+            "nosql_blob_path": row[3],
+            "complexity_index": row[4],
+            "integrity_hash": row[5],
+            "status": row[6],
+        }
+
+    @staticmethod
+    def _decode_cursor(cursor: Optional[str]) -> Optional[Tuple[str, str, int]]:
+        if not cursor:
+            return None
+        try:
+            component_name, version_key, row_id = json.loads(cursor)
+            return str(component_name), str(version_key), int(row_id)
+        except (TypeError, ValueError) as exc:
+            raise ValueError(f"cursor de paginação inválido: {cursor}") from exc
+
+    def query_lineage(
+        self,
+        component: Optional[str] = None,
+        version_from: Optional[str] = None,
+        version_to: Optional[str] = None,
+        status: Optional[str] = None,
+        latest: bool = False,
+        limit: int = DEFAULT_PAGE_SIZE,
+        cursor: Optional[str] = None,
+    ) -> Dict[str, object]:
+        """Consulta paginada da linhagem usando os índices da tabela.
+
+        Filtros são combinados com AND; o intervalo de versões é inclusivo e usa
+        ordem semântica (`version_key`). Com `latest=True` retorna apenas a
+        versão mais recente de cada componente (após os demais filtros).
+        A paginação é por chave (`component_name`, `version_key`, `id`): passe o
+        `next_cursor` devolvido para obter a próxima página.
+        """
+
+        if limit <= 0:
+            raise ValueError("limit deve ser positivo.")
+
+        clauses: List[str] = []
+        params: List[object] = []
+        if component is not None:
+            clauses.append("component_name = ?")
+            params.append(component)
+        if version_from is not None:
+            clauses.append("version_key >= ?")
+            params.append(_version_key(version_from))
+        if version_to is not None:
+            clauses.append("version_key <= ?")
+            params.append(_version_key(version_to))
+        if status is not None:
+            clauses.append("status = ?")
+            params.append(status)
+
+        if latest:
+            # Mesmos filtros no subselect ("mais recente" dentro do recorte pedido);
+            # colunas sem qualificador resolvem para `inner_l`.
+            inner = " AND ".join(["inner_l.component_name = audit_lineage.component_name"] + clauses)
+            clauses = clauses + [
+                f"""id = (
+                    SELECT inner_l.id FROM audit_lineage AS inner_l
+                    WHERE {inner}
+                    ORDER BY inner_l.version_key DESC, inner_l.id DESC
+                    LIMIT 1
+                )"""
+            ]
+            params = params + params
+
+        after = self._decode_cursor(cursor)
+        if after is not None:
+            clauses.append("(component_name, version_key, id) > (?, ?, ?)")
+            params.extend(after)
+
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        rows = (
+            self.init()
+            .execute(
+                f"""
+                SELECT {_LINEAGE_COLUMNS}, version_key FROM audit_lineage
+                {where}
+                ORDER BY component_name, version_key, id
+                LIMIT ?
+                """,
+                (*params, limit + 1),
+            )
+            .fetchall()
+        )
+
+        page = rows[:limit]
+        next_cursor = None
+        if len(rows) > limit:
+            last = page[-1]
+            next_cursor = json.dumps([last[1], last[7], last[0]], ensure_ascii=False)
+        return {"rows": [self._lineage_row(row) for row in page], "next_cursor": next_cursor}
+
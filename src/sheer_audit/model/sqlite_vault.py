@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import sqlite3
+from pathlib import Path
+from typing import Dict, Iterator, Optional, Sequence, Tuple
+
+SQLITE_SUFFIXES = {".sqlite", ".sqlite3"}
+
+VaultRow = Tuple[Optional[str], Optional[str], Optional[str], str, str]
+
+
+class SQLiteVault:
+    """Backend SQLite (WAL) do SheerDB: uma linha por registro com HMAC próprio.
+
+    Guarda exatamente o par `assinatura|json` do formato legado, mais colunas
+    indexadas (tabela, timestamp, snapshot_id) derivadas do registro.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.path)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS vault_records (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    table_name TEXT,
+                    timestamp TEXT,
+                    snapshot_id TEXT,
+                    signature TEXT NOT NULL,
+                    raw_json TEXT NOT NULL
+                )
+                """
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_vault_table ON vault_records (table_name, id)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_vault_timestamp ON vault_records (timestamp)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_vault_snapshot ON vault_records (snapshot_id)")
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def append(self, rows: Sequence[VaultRow], fsync: bool = False) -> None:
+        """Insere `(tabela, timestamp, snapshot_id, assinatura, json)` em uma transação."""
+
+        conn = self.connect()
+        if fsync:
+            conn.execute("PRAGMA synchronous=FULL")
+        with conn:
+            conn.executemany(
+                """
+                INSERT INTO vault_records (table_name, timestamp, snapshot_id, signature, raw_json)
+                VALUES (?, ?, ?, ?, ?)
+                """,
+                rows,
+            )
+        if fsync:
+            conn.execute("PRAGMA synchronous=NORMAL")
+
+    def iter_rows(self, table: Optional[str] = None) -> Iterator[Tuple[int, str, str]]:
+        """Gera `(id, assinatura, json)` em ordem de inserção, sem materializar a tabela."""
+
+        if not self.path.exists():
+            return
+        conn = self.connect()
+        if table is None:
+            cursor = conn.execute("SELECT id, signature, raw_json FROM vault_records ORDER BY id")
+        else:
+            cursor = conn.execute(
+                "SELECT id, signature, raw_json FROM vault_records WHERE table_name = ? ORDER BY id",
+                (table,),
+            )
+        yield from cursor
+
+    def snapshot_rows(self, snapshot_id: str) -> Iterator[Tuple[int, str, str]]:
+        if not self.path.exists():
+            return
+        cursor = self.connect().execute(
+            """
+            SELECT id, signature, raw_json FROM vault_records
+            WHERE table_name = 'snapshots' AND snapshot_id = ?
+            ORDER BY id
+            """,
+            (snapshot_id,),
+        )
+        yield from cursor
+
+    def reindex(self) -> int:
+        conn = self.connect()
+        conn.execute("REINDEX vault_records")
+        return int(conn.execute("SELECT COUNT(*) FROM vault_records").fetchone()[0])
+
+    def check(self) -> Dict[str, int]:
+        conn = self.connect()
+        result = conn.execute("PRAGMA integrity_check").fetchone()[0]
+        entries = int(conn.execute("SELECT COUNT(*) FROM vault_records").fetchone()[0])
+        ok = result == "ok"
+        return {"entries": entries, "consistent": entries if ok else 0, "inconsistent": 0 if ok else entries}
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def purge(self) -> None:
+        self.close()
+        for suffix in ("", "-wal", "-shm"):
+            candidate = self.path.with_name(self.path.name + suffix)
+            if candidate.exists():
+                candidate.unlink()
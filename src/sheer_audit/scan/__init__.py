@@ -1,4 +1,6 @@
 from .advanced import SheerAdvancedEngine
-from .repo import collect_python_files
+from .index import AnalysisIndex
+from .repo import collect_python_files, discover_python_files
+from .symbols import SymbolIndex
 
-__all__ = ["SheerAdvancedEngine", "collect_python_files"]
+__all__ = ["AnalysisIndex", "SheerAdvancedEngine", "SymbolIndex", "collect_python_files", "discover_python_files"]
@@ -3,12 +3,30 @@ from __future__ import annotations
 import ast
 import hashlib
 import json
+import os
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, Iterable, List, Set
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Set, Tuple, TypeVar
 
-from ..config import ScanConfig
-from .repo import collect_python_files
+from ..config import ArchitectureConfig, ScanConfig
+from ..model.schema import Edge
+from .calls import MODULE_CALLER, Bindings, CallEntry, build_call_graph, call_chain, call_edges, call_reference
+from .gitindex import changed_files, tracked_files
+from .graph import CompactGraph, GraphLike, cycle_groups
+from .index import DEFAULT_INDEX_PATH, AnalysisIndex, user_cache_index_path
+from .layers import LayerRulesEngine
+from .repo import DiscoveredFile, discover_python_files, filter_python_files
+from .resolver import ModuleResolver, module_name
+from .symbols import SymbolEntry, SymbolIndex
+
+# Árvores de AST mantidas em memória (LRU). Fases posteriores usam só os resumos;
+# o cache serve releituras próximas (ex.: `analyze_component` logo após a varredura).
+PARSED_CACHE_SIZE = 16
+
+T = TypeVar("T")
 
 
 @dataclass(frozen=True)
@@ -20,63 +38,478 @@ class StructuralError:
     fix: str
 
 
-class SheerAdvancedEngine:
-    """Motor determinístico para engenharia avançada de auditoria estática."""
+@dataclass(frozen=True)
+class ParsedModule:
+    """Arquivo parseado, invalidado por mtime/tamanho."""
+
+    relative: str
+    tree: Optional[ast.Module]
+    syntax_error: Optional[SyntaxError]
+    mtime_ns: int
+    size: int
+
+
+_COMPONENT_NODES = (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)
+_LOOP_NODES = (ast.For, ast.AsyncFor, ast.While)
+
+
+def _complexity_from_counts(stage_counts: Dict[str, int], depth: int) -> Dict[str, object]:
+    stage_impact = (
+        stage_counts["decorators"] * 1.5
+        + stage_counts["conditionals"] * 1.2
+        + stage_counts["loops"] * 1.7
+    )
+    depth_weight = float(2 ** max(depth - 5, 0))
+    partial_derivative = round(stage_impact * depth_weight, 6)
+
+    return {
+        "stage_impact": round(stage_impact, 6),
+        "depth_weight": depth_weight,
+        "partial_derivative": partial_derivative,
+    }
+
+
+def _summarize_tree(
+    relative: str,
+    tree: Optional[ast.Module],
+    syntax_error: Optional[SyntaxError],
+) -> Dict[str, object]:
+    """Extrai componentes, vetor de complexidade, imports e chamadas de um módulo parseado.
+
+    Chamadas viram `[posição do chamador, nível, módulo, nome]` (ver
+    `calls.call_reference`); alvos que não podem ser símbolos do repositório já
+    são descartados aqui. O resumo é composto só de tipos JSON/pickle simples
+    para poder ser persistido no índice incremental e devolvido por workers de
+    processo.
+    """
+
+    coordinates: List[Dict[str, object]] = []
+    complexity_vector: List[Dict[str, object]] = []
+    symbol_lines: List[int] = []
+    imports: Set[Tuple[int, str, Tuple[str, ...]]] = set()
+    max_depth = 0
+    bindings: Bindings = {}
+    module_defs: Set[str] = set()
+    nested_defs: Set[str] = set()
+    methods_of: Dict[str, Set[str]] = {}
+    # (posição do chamador, cadeia pontuada, classe do método envolvente).
+    raw_calls: Set[Tuple[int, Tuple[str, ...], Optional[str]]] = set()
+
+    if tree is not None:
+        # Um frame de contagem por componente aberto. Condicionais/laços incrementam
+        # o frame mais interno; ao fechar, o frame é somado ao pai. Assim cada
+        # componente acumula toda a sua subárvore (inclusive definições aninhadas)
+        # numa única travessia, sem re-percorrer corpos aninhados: O(nós).
+        stack: List[Dict[str, int]] = []
+        # Componentes abertos: (posição em `coordinates`, nome, é classe).
+        owners: List[Tuple[int, str, bool]] = []
+
+        def walk(node: ast.AST) -> None:
+            nonlocal max_depth
+            if isinstance(node, _COMPONENT_NODES):
+                depth = len(stack)
+                max_depth = max(max_depth, depth)
+                name = getattr(node, "name", "<anonymous>")
+                component_id = f"{relative}:{name}"
+                is_class = isinstance(node, ast.ClassDef)
+                if not owners:
+                    module_defs.add(name)
+                elif owners[-1][2]:
+                    methods_of.setdefault(owners[-1][1], set()).add(name)
+                elif not is_class:
+                    nested_defs.add(name)
+                coordinates.append({"x": component_id, "y": depth, "kind": type(node).__name__})
+                symbol_lines.append(node.lineno)
+                entry: Dict[str, object] = {"x": component_id, "y": depth}
+                complexity_vector.append(entry)
+
+                counts = {"decorators": len(node.decorator_list), "conditionals": 0, "loops": 0}
+                stack.append(counts)
+                owners.append((len(coordinates) - 1, name, is_class))
+                for child in ast.iter_child_nodes(node):
+                    walk(child)
+                owners.pop()
+                stack.pop()
+                if stack:
+                    stack[-1]["conditionals"] += counts["conditionals"]
+                    stack[-1]["loops"] += counts["loops"]
+                entry.update(_complexity_from_counts(counts, depth))
+                return
+
+            if isinstance(node, ast.Import):
+                for alias in node.names:
+                    imports.add((0, alias.name, ()))
+                    if alias.asname:
+                        bindings[alias.asname] = (0, alias.name, None)
+                    else:
+                        head = alias.name.split(".", 1)[0]
+                        bindings[head] = (0, head, None)
+            elif isinstance(node, ast.ImportFrom):
+                # Nível e nomes são mantidos para o resolvedor tratar imports relativos
+                # e `from pacote import submódulo`.
+                imports.add((node.level or 0, node.module or "", tuple(sorted(alias.name for alias in node.names))))
+                for alias in node.names:
+                    if alias.name != "*":
+                        bindings[alias.asname or alias.name] = (node.level or 0, node.module or "", alias.name)
+            elif isinstance(node, ast.Call):
+                chain = call_chain(node.func)
+                if chain is not None:
+                    caller = owners[-1][0] if owners else MODULE_CALLER
+                    # `self.m()`/`cls.m()` só faz sentido dentro de método de classe.
+                    in_method = len(owners) > 1 and owners[-2][2] and not owners[-1][2]
+                    raw_calls.add((caller, chain, owners[-2][1] if in_method else None))
+            elif stack:
+                if isinstance(node, ast.If):
+                    stack[-1]["conditionals"] += 1
+                elif isinstance(node, _LOOP_NODES):
+                    stack[-1]["loops"] += 1
+
+            for child in ast.iter_child_nodes(node):
+                walk(child)
+
+        walk(tree)
+
+    calls: Set[CallEntry] = set()
+    for caller, chain, enclosing in raw_calls:
+        reference = call_reference(chain, enclosing, bindings, module_defs, nested_defs, methods_of)
+        if reference is not None:
+            calls.add((caller,) + reference)
+
+    syntax_line: Optional[int] = None
+    if syntax_error is not None:
+        syntax_line = syntax_error.lineno or 1
+
+    return {
+        "coordinates": coordinates,
+        "complexity_vector": complexity_vector,
+        "symbol_lines": symbol_lines,
+        "max_depth": max_depth,
+        "imports": [[level, module, list(names)] for level, module, names in sorted(imports)],
+        "calls": [list(call) for call in sorted(calls)],
+        "syntax_error_line": syntax_line,
+    }
+
+
+def _summarize_file(task: Tuple[str, str, Optional[str]]) -> Optional[Dict[str, object]]:
+    """Worker de processo: lê, hasheia e resume um arquivo.
+
+    Retorna None quando o hash coincide com `known_hash` (resumo indexado ainda válido).
+    """
+
+    repo_path, relative, known_hash = task
+    source = (Path(repo_path) / relative).read_bytes()
+    digest = hashlib.sha256(source).hexdigest()
+    if digest == known_hash:
+        return None
+
+    tree: Optional[ast.Module] = None
+    syntax_error: Optional[SyntaxError] = None
+    try:
+        tree = ast.parse(source.decode("utf-8", errors="replace"), filename=relative)
+    except SyntaxError as exc:
+        syntax_error = exc
+
+    summary = _summarize_tree(relative, tree, syntax_error)
+    summary["hash"] = digest
+    return summary
+
+
+class _StageTimer:
+    """Cronometra estágios de um pipeline: `timed(estágio, função)` devolve o valor calculado."""
+
+    def __init__(self) -> None:
+        self.timings: Dict[str, float] = {}
+
+    def __call__(self, stage: str, compute: Callable[[], T]) -> T:
+        started = time.perf_counter()
+        value = compute()
+        self.timings[stage] = round(time.perf_counter() - started, 6)
+        return value
+
+    def finish(self) -> Dict[str, float]:
+        self.timings["total"] = round(sum(self.timings.values()), 6)
+        return self.timings
+
+
+@dataclass(frozen=True)
+class FullAnalysis:
+    """Resultado do pipeline fundido consumido por todos os comandos da CLI."""
 
-    def __init__(self, repo_path: str):
+    cartesian: Dict[str, object]
+    inventory: List[Dict[str, object]]
+    execution_tree: Dict[str, List[str]]
+    import_graph: Dict[str, Set[str]]
+    structural_errors: List[Dict[str, object]]
+    timings: Dict[str, float]
+
+
+class SheerAdvancedEngine:
+    """Motor determinístico para engenharia avançada de auditoria estática.
+
+    `discovery="git"` lista apenas arquivos rastreados (lendo `.git/index`);
+    `since=<ref>` reporta só arquivos alterados desde a ref (o grafo usa o fecho de imports deles);
+    `architecture` (seção `[architecture]` do sheer.toml) define camadas e regras.
+    """
+
+    def __init__(
+        self,
+        repo_path: str,
+        index_path: Optional[str] = None,
+        jobs: int = 1,
+        discovery: str = "fs",
+        since: Optional[str] = None,
+        architecture: Optional[ArchitectureConfig] = None,
+    ):
+        if discovery not in {"fs", "git"}:
+            raise ValueError(f"modo de descoberta desconhecido: {discovery}")
         self.repo_path = Path(repo_path).resolve()
+        self.jobs = jobs if jobs > 0 else (os.cpu_count() or 1)
+        self.discovery = discovery
+        self.since = since
+        self.layer_rules = LayerRulesEngine.from_config(architecture)
+        self._changed: Optional[Set[str]] = None
+        self._resolver: Optional[ModuleResolver] = None
         self.hotspots: List[Dict[str, str]] = []
-
-    def _iter_python_files(self) -> Iterable[Path]:
+        self._parsed: "OrderedDict[str, ParsedModule]" = OrderedDict()
+        resolved_index: Optional[Path] = None
+        if index_path == DEFAULT_INDEX_PATH:
+            resolved_index = user_cache_index_path(self.repo_path)
+        elif index_path:
+            resolved_index = Path(index_path)
+            if not resolved_index.is_absolute():
+                resolved_index = self.repo_path / resolved_index
+        self.index = AnalysisIndex(resolved_index, self.repo_path)
+        # Listagens de diretório persistem ao lado do índice (`<índice>.dirs`).
+        self._dir_cache_path = f"{resolved_index}.dirs" if resolved_index else None
+
+    def _discover_files(self) -> List[DiscoveredFile]:
         cfg = ScanConfig(include_dirs=["."], exclude_dirs=[".git", ".venv", "venv"], include_tests=True)
-        for rel in collect_python_files(str(self.repo_path), cfg):
-            yield self.repo_path / rel
+        if self.discovery == "git":
+            files = filter_python_files(str(self.repo_path), cfg, tracked_files(self.repo_path))
+        else:
+            files = discover_python_files(str(self.repo_path), cfg, cache_path=self._dir_cache_path)
+        return files
+
+    def _since_files(self, files: List[DiscoveredFile]) -> List[DiscoveredFile]:
+        """Com `since`, só os arquivos alterados desde a ref; sem `since`, todos."""
+
+        if self.since is None:
+            return files
+        if self._changed is None:
+            self._changed = set(changed_files(self.repo_path, self.since))
+        return [item for item in files if item[0] in self._changed]
+
+    def _parse_module(self, file_path: Path, source: Optional[bytes] = None) -> ParsedModule:
+        """Retorna o módulo do cache LRU, relendo o arquivo apenas se o stat mudou."""
+
+        relative = file_path.relative_to(self.repo_path).as_posix()
+        stat = file_path.stat()
+        cached = self._parsed.get(relative)
+        if cached is not None and cached.mtime_ns == stat.st_mtime_ns and cached.size == stat.st_size:
+            self._parsed.move_to_end(relative)
+            return cached
+
+        if source is None:
+            source = file_path.read_bytes()
+        tree: Optional[ast.Module] = None
+        syntax_error: Optional[SyntaxError] = None
+        try:
+            tree = ast.parse(source.decode("utf-8", errors="replace"), filename=relative)
+        except SyntaxError as exc:
+            syntax_error = exc
+
+        parsed = ParsedModule(
+            relative=relative,
+            tree=tree,
+            syntax_error=syntax_error,
+            mtime_ns=stat.st_mtime_ns,
+            size=stat.st_size,
+        )
+        self._parsed[relative] = parsed
+        self._parsed.move_to_end(relative)
+        while len(self._parsed) > PARSED_CACHE_SIZE:
+            self._parsed.popitem(last=False)
+        return parsed
+
+    def _summarize_discovered(self, files: List[DiscoveredFile]) -> Dict[str, Dict[str, object]]:
+        """Resumos dos arquivos dados, reparseando apenas arquivos cujo hash mudou.
+
+        Com `jobs > 1` os arquivos pendentes são resumidos em um pool de processos.
+        """
+
+        entries: Dict[str, Dict[str, object]] = {}
+        pending: List[DiscoveredFile] = []
+        for relative, mtime_ns, size in files:
+            summary = self.index.get(relative, mtime_ns, size)
+            if summary is None:
+                pending.append((relative, mtime_ns, size))
+            else:
+                entries[relative] = summary
+
+        if self.jobs > 1 and len(pending) > 1:
+            tasks = [
+                (self.repo_path.as_posix(), relative, self._indexed_hash(relative)) for relative, _, _ in pending
+            ]
+            chunksize = max(1, len(tasks) // (self.jobs * 4))
+            with ProcessPoolExecutor(max_workers=self.jobs) as pool:
+                results = list(pool.map(_summarize_file, tasks, chunksize=chunksize))
+        else:
+            results = [self._summarize_local(relative) for relative, _, _ in pending]
+
+        now_ns = time.time_ns()
+        for (relative, mtime_ns, size), summary in zip(pending, results):
+            if summary is None:
+                summary = self.index.files[relative]
+            entries[relative] = self.index.put(relative, summary, mtime_ns, size, now_ns)
+        return entries
+
+    def _file_summaries(self) -> List[Dict[str, object]]:
+        """Resumos dos arquivos descobertos (com `since`, só os alterados), em ordem de caminho."""
+
+        files = self._since_files(self._discover_files())
+        entries = self._summarize_discovered(files)
+        relatives = [relative for relative, _, _ in files]
+
+        current = set(relatives)
+        for stale in set(self._parsed) - current:
+            del self._parsed[stale]
+        if self.since is None:
+            # Com `since` o escopo é parcial: entradas dos demais arquivos continuam válidas.
+            self.index.retain(current)
+        self.index.save()
+        return [dict(entries[relative], file=relative) for relative in relatives]
+
+    def _import_closure(
+        self, files: List[DiscoveredFile], seeds: List[DiscoveredFile]
+    ) -> List[Dict[str, object]]:
+        """Resumos de `seeds` mais o fecho dos imports alcançáveis a partir deles.
+
+        Só o conjunto alcançável é parseado (em ondas de BFS, cada onda em lote):
+        qualquer ciclo ou caminho proibido que parta das sementes fica inteiramente
+        dentro dele, então `detect_structural_errors` sobre esse recorte dá o mesmo
+        resultado que a varredura completa para os arquivos-semente.
+        """
+
+        by_file = {item[0]: item for item in files}
+        resolver = self._module_resolver(by_file)
+        frontier = list(seeds)
+        queued = {item[0] for item in frontier}
+        entries: Dict[str, Dict[str, object]] = {}
+        while frontier:
+            wave = self._summarize_discovered(frontier)
+            entries.update(wave)
+            frontier = []
+            for relative in sorted(wave):
+                summary = wave[relative]
+                for node in sorted(resolver.resolve(relative, summary["imports"], summary.get("hash"))):
+                    target = by_file[resolver.file_of[node]]
+                    if target[0] not in queued:
+                        queued.add(target[0])
+                        frontier.append(target)
+
+        self.index.save()
+        return [dict(entries[relative], file=relative) for relative in sorted(entries)]
+
+    def scoped_summaries(self, scope: str) -> List[Dict[str, object]]:
+        """Resumos dos arquivos sob o prefixo `scope` mais o fecho dos imports alcançáveis."""
+
+        prefix = scope.strip()
+        while prefix.startswith("./"):
+            prefix = prefix[2:]
+        prefix = prefix.rstrip("/")
+
+        files = self._discover_files()
+        seeds = self._since_files([item for item in files if item[0].startswith(prefix)])
+        return self._import_closure(files, seeds)
+
+    def _graph_summaries(self, summaries: List[Dict[str, object]]) -> List[Dict[str, object]]:
+        """Resumos necessários para o grafo de imports de `summaries`.
+
+        Com `since` os resumos cobrem só arquivos alterados; ciclos e caminhos
+        proibidos podem passar por módulos inalterados, então o grafo usa o fecho
+        de imports a partir deles (como em `scoped_summaries`).
+        """
+
+        if self.since is None:
+            return summaries
+        files = self._discover_files()
+        scope = {str(summary["file"]) for summary in summaries}
+        return self._import_closure(files, [item for item in files if item[0] in scope])
+
+    def _candidate_files(
+        self, files: List[DiscoveredFile], tokens: Sequence[str], ignore_case: bool
+    ) -> List[DiscoveredFile]:
+        """Pré-filtro por arquivo: quais arquivos podem ter componente cujo id contém um token.
+
+        O id é `arquivo.py:símbolo`. Arquivos com entrada válida no índice são
+        decididos pelos ids indexados (sem leitura); os demais por busca textual
+        no fonte, já que o nome do símbolo aparece literalmente nele.
+        """
+
+        def fold(value: str) -> str:
+            return value.lower() if ignore_case else value
+
+        needles = [fold(token) for token in tokens]
+        candidates: List[DiscoveredFile] = []
+        for item in files:
+            relative, mtime_ns, size = item
+            path_key = fold(relative)
+            if any(needle in path_key for needle in needles):
+                candidates.append(item)
+                continue
+
+            entry = self.index.get(relative, mtime_ns, size)
+            if entry is not None:
+                ids = [fold(str(coordinate["x"])) for coordinate in entry["coordinates"]]
+                if any(needle in component_id for component_id in ids for needle in needles):
+                    candidates.append(item)
+                continue
 
-    def generate_cartesian_map(self) -> Dict[str, object]:
+            try:
+                source = fold((self.repo_path / relative).read_bytes().decode("utf-8", errors="replace"))
+            except OSError:
+                continue
+            for needle in needles:
+                # Token que cruza o ":" exige arquivo terminando no trecho anterior.
+                head, colon, tail = needle.partition(":")
+                if colon and not path_key.endswith(head):
+                    continue
+                if (tail if colon else needle) in source:
+                    candidates.append(item)
+                    break
+        return candidates
+
+    def _indexed_hash(self, relative: str) -> Optional[str]:
+        digest = self.index.files.get(relative, {}).get("hash")
+        return str(digest) if digest else None
+
+    def _summarize_local(self, relative: str) -> Optional[Dict[str, object]]:
+        """Variante serial de `_summarize_file` que também alimenta o cache LRU de AST."""
+
+        file_path = self.repo_path / relative
+        source = file_path.read_bytes()
+        digest = hashlib.sha256(source).hexdigest()
+        if self.index.get_by_hash(relative, digest) is not None:
+            return None
+
+        module = self._parse_module(file_path, source=source)
+        summary = _summarize_tree(module.relative, module.tree, module.syntax_error)
+        summary["hash"] = digest
+        return summary
+
+    def generate_cartesian_map(self, summaries: Optional[List[Dict[str, object]]] = None) -> Dict[str, object]:
         """Mapeia componentes X (arquivo:símbolo) e Y (profundidade de chamada lexical)."""
 
         coordinates: List[Dict[str, object]] = []
         complexity_vector: List[Dict[str, object]] = []
         max_depth = 0
 
-        for file_path in self._iter_python_files():
-            relative = file_path.relative_to(self.repo_path).as_posix()
-            source = file_path.read_text(encoding="utf-8", errors="replace")
-            try:
-                tree = ast.parse(source, filename=relative)
-            except SyntaxError:
-                continue
-
-            stack: List[ast.AST] = []
-
-            def walk(node: ast.AST) -> None:
-                nonlocal max_depth
-                if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
-                    depth = len(stack)
-                    max_depth = max(max_depth, depth)
-                    name = getattr(node, "name", "<anonymous>")
-                    component_id = f"{relative}:{name}"
-                    coordinates.append({"x": component_id, "y": depth, "kind": type(node).__name__})
-                    complexity = self._calculate_component_complexity(node=node, depth=depth)
-                    complexity_vector.append(
-                        {
-                            "x": component_id,
-                            "y": depth,
-                            "stage_impact": complexity["stage_impact"],
-                            "depth_weight": complexity["depth_weight"],
-                            "partial_derivative": complexity["partial_derivative"],
-                        }
-                    )
-                    stack.append(node)
-                    for child in ast.iter_child_nodes(node):
-                        walk(child)
-                    stack.pop()
-                    return
-
-                for child in ast.iter_child_nodes(node):
-                    walk(child)
-
-            walk(tree)
+        if summaries is None:
+            summaries = self._file_summaries()
+        for summary in summaries:
+            coordinates.extend(summary["coordinates"])
+            complexity_vector.extend(summary["complexity_vector"])
+            max_depth = max(max_depth, int(summary["max_depth"]))
 
         return {
             "model": "R subset CxFxE",
@@ -87,135 +520,82 @@ class SheerAdvancedEngine:
             "max_depth": max_depth,
         }
 
-    def _calculate_component_complexity(self, node: ast.AST, depth: int) -> Dict[str, object]:
-        stage_counts = {"decorators": 0, "conditionals": 0, "loops": 0}
+    def _collect_import_graph(self, summaries: Optional[List[Dict[str, object]]] = None) -> Dict[str, Set[str]]:
+        graph: Dict[str, Set[str]] = {}
+        if summaries is None:
+            summaries = self._graph_summaries(self._file_summaries())
+        resolver = self._module_resolver(str(item["file"]) for item in summaries)
 
-        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
-            stage_counts["decorators"] = len(getattr(node, "decorator_list", []))
+        for summary in summaries:
+            relative = str(summary["file"])
+            graph[resolver.node_of[relative]] = resolver.resolve(relative, summary["imports"], summary.get("hash"))
 
-        for child in ast.walk(node):
-            if child is not node and isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
-                continue
-            if isinstance(child, ast.If):
-                stage_counts["conditionals"] += 1
-            elif isinstance(child, (ast.For, ast.AsyncFor, ast.While)):
-                stage_counts["loops"] += 1
-
-        stage_impact = (
-            stage_counts["decorators"] * 1.5
-            + stage_counts["conditionals"] * 1.2
-            + stage_counts["loops"] * 1.7
-        )
-        depth_weight = float(2 ** max(depth - 5, 0))
-        partial_derivative = round(stage_impact * depth_weight, 6)
-
-        return {
-            "stage_counts": stage_counts,
-            "stage_impact": round(stage_impact, 6),
-            "depth_weight": depth_weight,
-            "partial_derivative": partial_derivative,
-        }
+        return graph
 
-    def _collect_import_graph(self) -> Dict[str, Set[str]]:
-        graph: Dict[str, Set[str]] = {}
-        repo_modules: Set[str] = set()
-
-        for file_path in self._iter_python_files():
-            rel = file_path.relative_to(self.repo_path)
-            module_name = self._module_name_from_path(rel)
-            repo_modules.add(module_name)
-
-        for file_path in self._iter_python_files():
-            rel = file_path.relative_to(self.repo_path)
-            module_name = self._module_name_from_path(rel)
-            imports: Set[str] = set()
-            source = file_path.read_text(encoding="utf-8", errors="replace")
-            try:
-                tree = ast.parse(source, filename=rel.as_posix())
-            except SyntaxError:
-                graph[module_name] = imports
-                continue
+    def _module_resolver(self, relatives: Iterable[str]) -> ModuleResolver:
+        """Resolvedor reaproveitado (com seu cache por arquivo) enquanto o conjunto de arquivos não muda."""
 
-            for node in ast.walk(tree):
-                if isinstance(node, ast.Import):
-                    for alias in node.names:
-                        imports.add(alias.name)
-                elif isinstance(node, ast.ImportFrom) and node.module:
-                    imports.add(node.module)
+        files = frozenset(relatives)
+        if self._resolver is None or self._resolver.files != files:
+            self._resolver = ModuleResolver(files)
+        return self._resolver
 
-            graph[module_name] = {imp for imp in imports if imp in repo_modules}
 
-        return graph
+    def _file_for_module(self, module: str) -> str:
+        """Arquivo real do módulo (ex.: `pkg/__init__.py` para `pkg`) quando conhecido."""
 
+        if self._resolver is not None and module in self._resolver.file_of:
+            return self._resolver.file_of[module]
+        return f"{module.replace('.', '/')}.py"
 
     def _module_name_from_path(self, relative_path: Path) -> str:
-        module_name = ".".join(relative_path.with_suffix("").parts)
-        if module_name.endswith(".__init__"):
-            return module_name[: -len(".__init__")]
-        return module_name
+        return module_name(relative_path.as_posix())
 
-    def detect_structural_errors(self) -> List[Dict[str, object]]:
+    def detect_structural_errors(
+        self,
+        summaries: Optional[List[Dict[str, object]]] = None,
+        graph: Optional[Dict[str, Set[str]]] = None,
+    ) -> List[Dict[str, object]]:
         """Detecta erros estruturais determinísticos (syntax + dependência circular)."""
 
         errors: List[StructuralError] = []
 
-        for file_path in self._iter_python_files():
-            rel = file_path.relative_to(self.repo_path).as_posix()
-            source = file_path.read_text(encoding="utf-8", errors="replace")
-            try:
-                ast.parse(source, filename=rel)
-            except SyntaxError as exc:
+        if summaries is None:
+            summaries = self._file_summaries()
+        for summary in summaries:
+            if summary["syntax_error_line"] is not None:
                 errors.append(
                     StructuralError(
-                        file=rel,
-                        line=exc.lineno or 1,
+                        file=str(summary["file"]),
+                        line=int(summary["syntax_error_line"]),
                         error_type="SyntaxError",
                         impact="CRITICAL",
                         fix="Corrigir sintaxe para restaurar parse estático.",
                     )
                 )
 
-        graph = self._collect_import_graph()
-
-        def find_cycles() -> Set[str]:
-            cycles: Set[str] = set()
-            visiting: Set[str] = set()
-            visited: Set[str] = set()
-
-            def dfs(node: str, ancestry: List[str]) -> None:
-                if node in visiting:
-                    start = ancestry.index(node)
-                    for item in ancestry[start:]:
-                        cycles.add(item)
-                    return
-                if node in visited:
-                    return
-
-                visiting.add(node)
-                ancestry.append(node)
-                for nxt in sorted(graph.get(node, set())):
-                    dfs(nxt, ancestry)
-                ancestry.pop()
-                visiting.remove(node)
-                visited.add(node)
-
-            for item in sorted(graph):
-                dfs(item, [])
-
-            return cycles
-
-        for module in sorted(find_cycles()):
-            errors.append(
-                StructuralError(
-                    file=f"{module.replace('.', '/')}.py",
-                    line=1,
-                    error_type="CircularDependency",
-                    impact="HIGH",
-                    fix="Quebrar ciclo com inversão de dependência ou extração de interface.",
+        if graph is None:
+            graph = self._collect_import_graph(self._graph_summaries(summaries))
+        # Um único grafo compacto (ids + CSR) serve ciclos e alcançabilidade.
+        compact = CompactGraph.from_mapping(graph)
+
+        for group in cycle_groups(compact):
+            path = " -> ".join(str(module) for module in group["cycle"])
+            for module in group["modules"]:
+                errors.append(
+                    StructuralError(
+                        file=self._file_for_module(str(module)),
+                        line=1,
+                        error_type="CircularDependency",
+                        impact="HIGH",
+                        fix=f"Quebrar ciclo com inversão de dependência ou extração de interface. Ciclo: {path}",
+                    )
                 )
-            )
 
-        errors.extend(self.detect_prohibited_reachability())
+        errors.extend(self.detect_prohibited_reachability(compact))
+        if self._changed is not None:
+            # Com `since` o grafo inclui módulos inalterados, mas só os alterados são reportados.
+            errors = [error for error in errors if error.file in self._changed]
 
         return [
             {
@@ -228,65 +608,42 @@ class SheerAdvancedEngine:
             for e in sorted(errors, key=lambda item: (item.file, item.line, item.error_type))
         ]
 
-    def detect_prohibited_reachability(self) -> List[StructuralError]:
-        """Detecta caminhos proibidos entre camadas (ADR-0012) por busca em largura."""
-
-        graph = self._collect_import_graph()
-        layer_of: Dict[str, str] = {module: self._infer_layer(module) for module in graph}
-        rules = [{"from": "core", "to": "io", "impact": "HIGH"}]
-
-        violations: List[StructuralError] = []
-
-        for rule in rules:
-            start_nodes = sorted(module for module, layer in layer_of.items() if layer == rule["from"])
-            target_nodes = {module for module, layer in layer_of.items() if layer == rule["to"]}
-            for start in start_nodes:
-                queue: List[List[str]] = [[start]]
-                visited: Set[str] = set()
-                while queue:
-                    path = queue.pop(0)
-                    node = path[-1]
-                    if node in visited:
-                        continue
-                    visited.add(node)
-                    if node in target_nodes and len(path) > 1:
-                        violations.append(
-                            StructuralError(
-                                file=f"{start.replace('.', '/')}.py",
-                                line=1,
-                                error_type="ForbiddenReachability",
-                                impact=str(rule["impact"]),
-                                fix=(
-                                    "Eliminar caminho proibido entre camadas: "
-                                    + " -> ".join(path)
-                                ),
-                            )
-                        )
-                        break
-
-                    for nxt in sorted(graph.get(node, set())):
-                        if nxt not in visited:
-                            queue.append(path + [nxt])
-
-        return violations
+    def detect_cycle_groups(self, graph: Optional[GraphLike] = None) -> List[Dict[str, object]]:
+        """Grupos de dependência circular (SCCs) com um ciclo representativo cada."""
 
-    def _infer_layer(self, module_name: str) -> str:
-        tokens = set(module_name.split("."))
-        if "core" in tokens:
-            return "core"
-        if tokens.intersection({"scan", "stages", "db", "cli", "model"}):
-            return "io"
-        if "governance" in tokens:
-            return "policy"
-        return "unknown"
+        if graph is None:
+            graph = self._collect_import_graph()
+        return cycle_groups(graph)
+
+    def detect_prohibited_reachability(self, graph: Optional[GraphLike] = None) -> List[StructuralError]:
+        """Detecta caminhos proibidos entre camadas (ADR-0012).
 
+        Todas as regras de `self.layer_rules` são avaliadas numa passada sobre a
+        condensação por SCC; o caminho é reconstruído só para as violações.
+        """
 
+        if graph is None:
+            graph = self._collect_import_graph()
+        return [
+            StructuralError(
+                file=self._file_for_module(violation.start),
+                line=1,
+                error_type="ForbiddenReachability",
+                impact=violation.rule.impact,
+                fix="Eliminar caminho proibido entre camadas: " + " -> ".join(violation.path),
+            )
+            for violation in self.layer_rules.evaluate(graph)
+        ]
 
-    def build_component_inventory(self) -> List[Dict[str, object]]:
+    def _infer_layer(self, module_name: str) -> str:
+        return self.layer_rules.layer_of(module_name)
+
+    def build_component_inventory(self, cartesian: Optional[Dict[str, object]] = None) -> List[Dict[str, object]]:
         """Inventário determinístico de componentes com hash por arquivo/símbolo."""
 
         inventory: List[Dict[str, object]] = []
-        cartesian = self.generate_cartesian_map()
+        if cartesian is None:
+            cartesian = self.generate_cartesian_map()
         for item in cartesian["coordinates"]:
             component_id = str(item["x"])
             digest = hashlib.sha256(component_id.encode("utf-8")).hexdigest()
@@ -301,11 +658,13 @@ class SheerAdvancedEngine:
 
         return sorted(inventory, key=lambda value: value["id"])
 
-    def build_execution_tree(self) -> Dict[str, List[str]]:
+    def build_execution_tree(self, inventory: Optional[List[Dict[str, object]]] = None) -> Dict[str, List[str]]:
         """Mapa de execução lexical (arquivo -> símbolos)."""
 
+        if inventory is None:
+            inventory = self.build_component_inventory()
         tree: Dict[str, List[str]] = {}
-        for component in self.build_component_inventory():
+        for component in inventory:
             file_part, symbol = str(component["id"]).split(":", 1)
             tree.setdefault(file_part, []).append(symbol)
 
@@ -314,13 +673,143 @@ class SheerAdvancedEngine:
 
         return {key: tree[key] for key in sorted(tree)}
 
-    def analyze_component(self, component_name: str) -> Dict[str, object]:
-        """Analisa componente único por id `arquivo.py:simbolo` ou por nome de módulo."""
+    def run_full_analysis(self) -> FullAnalysis:
+        """Pipeline fundido: cada estágio é calculado uma única vez e cronometrado."""
+
+        timed = _StageTimer()
 
-        inventory = self.build_component_inventory()
-        execution_tree = self.build_execution_tree()
+        summaries = timed("summaries", self._file_summaries)
+        cartesian = timed("cartesian_map", lambda: self.generate_cartesian_map(summaries))
+        inventory = timed("component_inventory", lambda: self.build_component_inventory(cartesian))
+        execution_tree = timed("execution_tree", lambda: self.build_execution_tree(inventory))
+        import_graph = timed("import_graph", lambda: self._collect_import_graph(self._graph_summaries(summaries)))
+        structural_errors = timed(
+            "structural_errors", lambda: self.detect_structural_errors(summaries, import_graph)
+        )
+        timings = timed.finish()
+
+        return FullAnalysis(
+            cartesian=cartesian,
+            inventory=inventory,
+            execution_tree=execution_tree,
+            import_graph=import_graph,
+            structural_errors=structural_errors,
+            timings=timings,
+        )
+
+    def run_filtered_analysis(self, filters: Sequence[str]) -> FullAnalysis:
+        """Variante de `run_full_analysis` restrita a componentes cujo id contém um filtro.
+
+        Filtros são substrings sem diferenciar maiúsculas. Só arquivos candidatos
+        (ver `_candidate_files`) são resumidos; os achados estruturais cobrem os
+        arquivos cujo caminho contém um filtro, via fecho de imports.
+        """
+
+        timed = _StageTimer()
+
+        tokens = [token.lower() for token in filters]
+        files = timed("discovery", self._discover_files)
+        scoped = self._since_files(files)
+        candidates = timed("prefilter", lambda: self._candidate_files(scoped, tokens, ignore_case=True))
+        summaries = timed(
+            "summaries",
+            lambda: [
+                dict(summary, file=relative)
+                for relative, summary in sorted(self._summarize_discovered(candidates).items())
+            ],
+        )
+        cartesian = timed("cartesian_map", lambda: self.generate_cartesian_map(summaries))
+        inventory = timed(
+            "component_inventory",
+            lambda: [
+                item
+                for item in self.build_component_inventory(cartesian)
+                if any(token in str(item["id"]).lower() for token in tokens)
+            ],
+        )
+        execution_tree = timed("execution_tree", lambda: self.build_execution_tree(inventory))
+        seeds = [item for item in scoped if any(token in item[0].lower() for token in tokens)]
+        closure = timed("import_closure", lambda: self._import_closure(files, seeds))
+        import_graph = timed("import_graph", lambda: self._collect_import_graph(closure))
+        structural_errors = timed(
+            "structural_errors",
+            lambda: [
+                error
+                for error in self.detect_structural_errors(closure, import_graph)
+                if any(token in str(error["file"]).lower() for token in tokens)
+            ],
+        )
+        timings = timed.finish()
+
+        return FullAnalysis(
+            cartesian=cartesian,
+            inventory=inventory,
+            execution_tree=execution_tree,
+            import_graph=import_graph,
+            structural_errors=structural_errors,
+            timings=timings,
+        )
+
+    def build_symbol_index(self, summaries: Optional[List[Dict[str, object]]] = None) -> SymbolIndex:
+        """Índice de símbolos (exato/prefixo/substring) e mapa módulo -> arquivo."""
+
+        if summaries is None:
+            summaries = self._file_summaries()
+        return SymbolIndex.from_summaries(
+            summaries, lambda relative: self._module_name_from_path(Path(relative))
+        )
+
+    def build_call_graph(self, summaries: Optional[List[Dict[str, object]]] = None) -> CompactGraph:
+        """Grafo de chamadas (CSR) entre símbolos, a partir das chamadas gravadas nos resumos."""
+
+        if summaries is None:
+            summaries = self._file_summaries()
+        resolver = self._module_resolver(str(item["file"]) for item in summaries)
+        return build_call_graph(summaries, resolver)
+
+    def build_call_edges(self, summaries: Optional[List[Dict[str, object]]] = None) -> List[Edge]:
+        """Arestas `CALLS` para `RepoModel.edges` (chamador -> símbolo chamado)."""
+
+        return list(call_edges(self.build_call_graph(summaries)))
 
-        matched = [item for item in inventory if component_name in str(item["id"]) or component_name == str(item["id"]).split(":", 1)[0]]
+    def _symbol_node(self, entry: SymbolEntry) -> Optional[ast.AST]:
+        tree = self._parse_module(self.repo_path / entry.file).tree
+        if tree is None:
+            return None
+        for node in ast.walk(tree):
+            if isinstance(node, _COMPONENT_NODES) and node.lineno == entry.line and node.name == entry.name:
+                return node
+        return None
+
+    def analyze_component(self, component_name: str) -> Dict[str, object]:
+        """Analisa componente único por id `arquivo.py:simbolo` ou por nome de módulo.
+
+        Só os arquivos que podem conter o componente são resumidos/parseados. O
+        campo `ast` traz o dump apenas do nó de cada símbolo casado (chave = id;
+        ids repetidos no mesmo arquivo recebem `@linha`); quando o alvo é o
+        próprio módulo, o dump é do módulo inteiro (chave = arquivo).
+        """
+
+        files = self._discover_files()
+        by_module = {self._module_name_from_path(Path(item[0])): item[0] for item in files}
+        module_file = by_module.get(component_name)
+        target_file = module_file or component_name
+
+        candidates = self._candidate_files(files, [component_name, target_file], ignore_case=False)
+        summaries = [
+            dict(summary, file=relative)
+            for relative, summary in sorted(self._summarize_discovered(candidates).items())
+        ]
+        self.index.save()
+        symbols = self.build_symbol_index(summaries)
+        inventory = self.build_component_inventory(self.generate_cartesian_map(summaries))
+        execution_tree = self.build_execution_tree(inventory)
+
+        by_symbol = {entry.id: entry for entry in symbols.substring(component_name)}
+        whole_module = bool(symbols.in_file(target_file))
+        if whole_module:
+            by_symbol.update({entry.id: entry for entry in symbols.in_file(target_file)})
+        matched = [item for item in inventory if str(item["id"]) in by_symbol]
         if not matched:
             return {
                 "component": component_name,
@@ -329,14 +818,20 @@ class SheerAdvancedEngine:
                 "execution": [],
             }
 
-        files = sorted({str(item["id"]).split(":", 1)[0] for item in matched})
-        execution: Dict[str, List[str]] = {item: execution_tree.get(item, []) for item in files}
-        ast_blobs: Dict[str, Dict[str, object]] = {}
-        for file_path in files:
-            absolute = self.repo_path / file_path
-            source = absolute.read_text(encoding="utf-8", errors="replace")
-            tree = ast.parse(source, filename=file_path)
-            ast_blobs[file_path] = ast.dump(tree, annotate_fields=True, include_attributes=False)
+        files_matched = sorted({str(item["id"]).split(":", 1)[0] for item in matched})
+        execution: Dict[str, List[str]] = {item: execution_tree.get(item, []) for item in files_matched}
+        ast_blobs: Dict[str, str] = {}
+        if whole_module:
+            tree = self._parse_module(self.repo_path / target_file).tree
+            ast_blobs[target_file] = ast.dump(tree, annotate_fields=True, include_attributes=False)
+        else:
+            for component_id in sorted(by_symbol):
+                for entry in symbols.exact(component_id):
+                    node = self._symbol_node(entry)
+                    if node is None:
+                        continue
+                    key = component_id if component_id not in ast_blobs else f"{component_id}@{entry.line}"
+                    ast_blobs[key] = ast.dump(node, annotate_fields=True, include_attributes=False)
 
         return {
             "component": component_name,
@@ -346,7 +841,7 @@ class SheerAdvancedEngine:
             "ast": ast_blobs,
         }
 
-    def export_ieee_pack(self, output_dir: str) -> Dict[str, object]:
+    def export_ieee_pack(self, output_dir: str, analysis: Optional[FullAnalysis] = None) -> Dict[str, object]:
         """Gera pacote IEEE (docs + manifest JSON) com métricas determinísticas."""
 
         out = Path(output_dir)
@@ -354,8 +849,10 @@ class SheerAdvancedEngine:
         ieee_dir = out / "ieee"
         ieee_dir.mkdir(parents=True, exist_ok=True)
 
-        cartesian = self.generate_cartesian_map()
-        errors = self.detect_structural_errors()
+        if analysis is None:
+            analysis = self.run_full_analysis()
+        cartesian = analysis.cartesian
+        errors = analysis.structural_errors
 
         architecture_md = out / "IEEE_1016_Architecture.md"
         testplan_md = out / "IEEE_1028_AuditPlan.md"
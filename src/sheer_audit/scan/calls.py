@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+import ast
+from array import array
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from ..model.schema import Edge
+from .graph import CompactGraph
+from .resolver import ModuleResolver
+
+# Posição de chamador para chamadas no nível do módulo (fora de qualquer componente).
+MODULE_CALLER = -1
+# Nível de referência para alvos definidos no próprio arquivo (módulo vazio).
+LOCAL_CALL = -1
+
+# Nome local -> (nível, módulo, nome importado ou None para `import módulo`).
+Bindings = Dict[str, Tuple[int, str, Optional[str]]]
+# `[posição do chamador, nível, módulo, nome]`, como gravado no resumo do arquivo.
+CallEntry = Tuple[int, int, str, str]
+
+
+def call_chain(func: ast.expr) -> Optional[Tuple[str, ...]]:
+    """`a.b.c` -> `("a", "b", "c")`; None para alvos que não são nome pontuado."""
+
+    parts: List[str] = []
+    while isinstance(func, ast.Attribute):
+        parts.append(func.attr)
+        func = func.value
+    if not isinstance(func, ast.Name):
+        return None
+    parts.append(func.id)
+    return tuple(reversed(parts))
+
+
+def call_reference(
+    chain: Tuple[str, ...],
+    enclosing: Optional[str],
+    bindings: Bindings,
+    module_defs: Set[str],
+    nested_defs: Set[str],
+    methods_of: Dict[str, Set[str]],
+) -> Optional[Tuple[int, str, str]]:
+    """Referência `(nível, módulo, nome)` do alvo de uma chamada; None se externa ou dinâmica.
+
+    Cobre funções do próprio arquivo, `self.m()`/`cls.m()` (métodos da classe
+    envolvente), `Classe.m()` e nomes importados (`f()`, `mod.f()`, `pkg.mod.f()`).
+    """
+
+    head, rest = chain[0], chain[1:]
+    if enclosing is not None and head in ("self", "cls") and len(rest) == 1:
+        return (LOCAL_CALL, "", rest[0]) if rest[0] in methods_of.get(enclosing, ()) else None
+    if not rest:
+        if head in module_defs or head in nested_defs:
+            return (LOCAL_CALL, "", head)
+        binding = bindings.get(head)
+        if binding is None or binding[2] is None:
+            return None
+        return binding[0], binding[1], binding[2]
+    if head in module_defs:
+        if len(rest) == 1 and rest[0] in methods_of.get(head, ()):
+            return (LOCAL_CALL, "", rest[0])
+        return None
+
+    binding = bindings.get(head)
+    if binding is None:
+        return None
+    level, module, imported = binding
+    parts = [module] if module else []
+    if imported is not None:
+        parts.append(imported)
+    parts.extend(rest[:-1])
+    return level, ".".join(parts), rest[-1]
+
+
+def _target_symbol(resolver: ModuleResolver, relative: str, level: int, module: str, name: str) -> Optional[str]:
+    if level == LOCAL_CALL:
+        return f"{relative}:{name}"
+    base = resolver.absolute_name(relative, level, module)
+    if not base:
+        return None
+    node = resolver.lookup(base)
+    if node is None and "." in base:
+        # `modulo.Classe.metodo()`: o símbolo do método vive no arquivo do módulo.
+        node = resolver.lookup(base.rsplit(".", 1)[0])
+    if node is None:
+        return None
+    return f"{resolver.file_of[node]}:{name}"
+
+
+def build_call_graph(summaries: Iterable[Dict[str, object]], resolver: ModuleResolver) -> CompactGraph:
+    """Grafo de chamadas entre símbolos do repositório, em CSR.
+
+    Nós são os ids `arquivo.py:nome` de todos os componentes (mais o próprio
+    arquivo quando há chamadas no nível do módulo). Arestas vão de chamador a
+    símbolo chamado; alvos fora do repositório são descartados. As arestas são
+    acumuladas em arrays de inteiros e compactadas por `CompactGraph.from_edges`.
+    Reexportações (`from .impl import f` em `__init__`) não são seguidas.
+    """
+
+    summaries = list(summaries)
+    symbols: Set[str] = set()
+    for summary in summaries:
+        symbols.update(str(coordinate["x"]) for coordinate in summary["coordinates"])
+        if any(int(call[0]) == MODULE_CALLER for call in summary.get("calls", ())):
+            symbols.add(str(summary["file"]))
+    names = sorted(symbols)
+    id_of = {name: position for position, name in enumerate(names)}
+
+    sources = array("l")
+    targets = array("l")
+    for summary in summaries:
+        relative = str(summary["file"])
+        coordinates = summary["coordinates"]
+        for caller, level, module, name in summary.get("calls", ()):
+            target = _target_symbol(resolver, relative, int(level), str(module), str(name))
+            target_id = id_of.get(target) if target is not None else None
+            if target_id is None:
+                continue
+            source = relative if caller == MODULE_CALLER else str(coordinates[caller]["x"])
+            sources.append(id_of[source])
+            targets.append(target_id)
+    return CompactGraph.from_edges(names, sources, targets)
+
+
+def call_edges(graph: CompactGraph) -> Iterator[Edge]:
+    """`Edge(type="CALLS")` por aresta, em ordem de (chamador, chamado)."""
+
+    names = graph.names
+    for node, source in enumerate(names):
+        for target in graph.neighbors(node):
+            yield Edge(type="CALLS", src=source, dst=names[target])
@@ -0,0 +1,158 @@
+from __future__ import annotations
+
+import struct
+import subprocess
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+# Cabeçalho fixo de cada entrada do índice: ctime, mtime, dev, ino, mode, uid,
+# gid, size (10 x uint32), sha1 (20 bytes) e flags (uint16).
+_ENTRY_HEADER = struct.Struct(">10I20sH")
+_FLAG_EXTENDED = 0x4000
+_NAME_MASK = 0x0FFF
+_MODE_TYPE_MASK = 0o170000
+_MODE_DIRECTORY = 0o040000
+
+
+def git_dir(repo_root: Path) -> Optional[Path]:
+    """Resolve `.git` (diretório ou arquivo `gitdir:` de worktrees/submódulos)."""
+
+    dot_git = repo_root / ".git"
+    if dot_git.is_dir():
+        return dot_git
+    if dot_git.is_file():
+        content = dot_git.read_text(encoding="utf-8").strip()
+        if content.startswith("gitdir:"):
+            target = Path(content[len("gitdir:") :].strip())
+            return target if target.is_absolute() else (repo_root / target).resolve()
+    return None
+
+
+def _read_varint(data: bytes, pos: int) -> Tuple[int, int]:
+    """Inteiro de tamanho variável do índice v4 (mesma codificação do offset de packs)."""
+
+    byte = data[pos]
+    pos += 1
+    value = byte & 0x7F
+    while byte & 0x80:
+        byte = data[pos]
+        pos += 1
+        value = ((value + 1) << 7) | (byte & 0x7F)
+    return value, pos
+
+
+def read_index_paths(index_path: Path) -> List[str]:
+    """Lê os caminhos rastreados direto de `.git/index` (versões 2, 3 e 4).
+
+    Levanta ValueError para índices corrompidos ou recursos não suportados
+    (split index); o chamador pode recorrer ao `git ls-files`.
+    """
+
+    data = index_path.read_bytes()
+    if len(data) < 12 or data[:4] != b"DIRC":
+        raise ValueError(f"índice git inválido: {index_path}")
+    version, count = struct.unpack(">II", data[4:12])
+    if version not in (2, 3, 4):
+        raise ValueError(f"versão de índice git não suportada: {version}")
+
+    paths: List[str] = []
+    previous = b""
+    pos = 12
+    for _ in range(count):
+        entry_start = pos
+        fields = _ENTRY_HEADER.unpack_from(data, pos)
+        mode, flags = fields[6], fields[11]
+        pos += _ENTRY_HEADER.size
+        if flags & _FLAG_EXTENDED:
+            pos += 2
+
+        if version == 4:
+            strip, pos = _read_varint(data, pos)
+            end = data.index(b"\0", pos)
+            name = previous[: len(previous) - strip] + data[pos:end]
+            pos = end + 1
+        else:
+            name_length = flags & _NAME_MASK
+            end = pos + name_length if name_length < _NAME_MASK else data.index(b"\0", pos)
+            name = data[pos:end]
+            # Entradas v2/v3 são preenchidas com NULs até múltiplo de 8 bytes.
+            pos = entry_start + ((end - entry_start + 8) & ~7)
+        previous = name
+
+        # Índice esparso: diretórios colapsados não são arquivos.
+        if mode & _MODE_TYPE_MASK != _MODE_DIRECTORY:
+            paths.append(name.decode("utf-8", errors="surrogateescape"))
+
+    # Extensões: assinatura de 4 bytes + tamanho; "link" indica split index.
+    while pos + 8 <= len(data) - 20:
+        signature = data[pos : pos + 4]
+        (size,) = struct.unpack(">I", data[pos + 4 : pos + 8])
+        if signature == b"link":
+            raise ValueError("split index não suportado pela leitura direta.")
+        pos += 8 + size
+
+    return sorted(set(paths))
+
+
+def _git_output(repo_root: Path, *args: str) -> str:
+    try:
+        completed = subprocess.run(
+            ["git", "-C", str(repo_root), *args],
+            check=True,
+            capture_output=True,
+        )
+    except (OSError, subprocess.CalledProcessError) as exc:
+        detail = getattr(exc, "stderr", b"") or b""
+        raise ValueError(f"git {' '.join(args)} falhou: {detail.decode('utf-8', 'replace').strip()}") from exc
+    return completed.stdout.decode("utf-8", "surrogateescape")
+
+
+def _git_lines(repo_root: Path, *args: str) -> List[str]:
+    return [item for item in _git_output(repo_root, *args).split("\0") if item]
+
+
+def _worktree(repo_root: Path) -> Tuple[Path, str]:
+    """`(raiz da worktree, prefixo de repo_root)`; o prefixo é "" ou termina em "/"."""
+
+    try:
+        lines = _git_output(repo_root, "rev-parse", "--show-toplevel", "--show-prefix").splitlines()
+    except ValueError as exc:
+        raise ValueError(f"{repo_root} não é um repositório git.") from exc
+    return Path(lines[0]), lines[1] if len(lines) > 1 else ""
+
+
+def tracked_files(repo_root: Path) -> List[str]:
+    """Arquivos rastreados pelo git, relativos a `repo_root`.
+
+    Lê o índice direto e usa `git ls-files` como fallback. Se `repo_root` é um
+    subdiretório da worktree, o índice da raiz é filtrado pelo prefixo.
+    """
+
+    directory = git_dir(repo_root)
+    prefix = ""
+    if directory is None:
+        toplevel, prefix = _worktree(repo_root)
+        directory = git_dir(toplevel)
+    if directory is not None:
+        try:
+            paths = read_index_paths(directory / "index")
+        except (OSError, ValueError, struct.error):
+            pass
+        else:
+            return [path[len(prefix) :] for path in paths if path.startswith(prefix)]
+    # `ls-files` já lista só `repo_root`, com caminhos relativos a ele.
+    return sorted(set(_git_lines(repo_root, "ls-files", "-z")))
+
+
+def changed_files(repo_root: Path, since: str) -> List[str]:
+    """Arquivos alterados em relação a `since` (commits, stage e working tree) mais não rastreados.
+
+    Resolver refs e comparar árvores exige ler objetos do git; aqui usamos o
+    binário `git` (sem rede). Arquivos removidos não aparecem. Com `--relative`
+    o diff fica restrito a `repo_root` e usa a mesma base de caminhos que o
+    `ls-files` e a descoberta, mesmo quando `repo_root` é um subdiretório.
+    """
+
+    changed = _git_lines(repo_root, "diff", "--name-only", "--relative", "-z", "--diff-filter=d", since, "--")
+    untracked = _git_lines(repo_root, "ls-files", "--others", "--exclude-standard", "-z")
+    return sorted(set(changed) | set(untracked))
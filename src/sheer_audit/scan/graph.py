@@ -0,0 +1,337 @@
+from __future__ import annotations
+
+from array import array
+from bisect import bisect_left
+from collections import deque
+from typing import Callable, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Set, Tuple, Union
+
+
+class CompactGraph:
+    """Grafo dirigido compacto: nomes internados em ids inteiros e adjacência CSR.
+
+    Os ids seguem a ordem ordenada dos nomes e os vizinhos de cada nó ficam
+    pré-ordenados em `targets[offsets[i]:offsets[i + 1]]`, então percorrer ids
+    em ordem equivale a percorrer nomes em ordem — sem `sorted()` por passo.
+    Todo nó citado só como destino também recebe id (com lista vazia).
+    """
+
+    __slots__ = ("names", "id_of", "offsets", "targets")
+
+    def __init__(self, names: Sequence[str], offsets: array, targets: array) -> None:
+        self.names: List[str] = list(names)
+        self.id_of: Dict[str, int] = {name: position for position, name in enumerate(self.names)}
+        self.offsets = offsets
+        self.targets = targets
+
+    @classmethod
+    def from_mapping(cls, graph: Mapping[str, Iterable[str]]) -> "CompactGraph":
+        nodes: Set[str] = set(graph)
+        for targets in graph.values():
+            nodes.update(targets)
+        names = sorted(nodes)
+        id_of = {name: position for position, name in enumerate(names)}
+
+        offsets = array("l", [0])
+        targets_array = array("l")
+        for name in names:
+            targets_array.extend(sorted({id_of[target] for target in graph.get(name, ())}))
+            offsets.append(len(targets_array))
+        return cls(names, offsets, targets_array)
+
+    @classmethod
+    def from_edges(cls, names: Sequence[str], sources: array, targets: array) -> "CompactGraph":
+        """CSR direto de arestas por id (`names` já ordenados), sem dicionário de conjuntos.
+
+        Ordenação por contagem pela origem; cada linha é ordenada e deduplicada.
+        A memória fica em arrays de inteiros, proporcional ao número de arestas.
+        """
+
+        count = len(names)
+        starts = array("l", [0]) * (count + 1)
+        for source in sources:
+            starts[source + 1] += 1
+        for node in range(count):
+            starts[node + 1] += starts[node]
+
+        cursor = array("l", starts)
+        packed = array("l", [0]) * len(sources)
+        for source, target in zip(sources, targets):
+            packed[cursor[source]] = target
+            cursor[source] += 1
+
+        offsets = array("l", [0])
+        row_targets = array("l")
+        for node in range(count):
+            row_targets.extend(sorted(set(packed[starts[node] : starts[node + 1]])))
+            offsets.append(len(row_targets))
+        return cls(names, offsets, row_targets)
+
+    def to_mapping(self) -> Dict[str, Set[str]]:
+        """Forma textual `{módulo: {módulos importados}}` usada em relatórios."""
+
+        names = self.names
+        return {name: {names[target] for target in self.neighbors(node)} for node, name in enumerate(names)}
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.names)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self.id_of
+
+    @property
+    def edge_count(self) -> int:
+        return len(self.targets)
+
+    def neighbors(self, node: int) -> array:
+        return self.targets[self.offsets[node] : self.offsets[node + 1]]
+
+    def has_edge(self, source: int, target: int) -> bool:
+        low, high = self.offsets[source], self.offsets[source + 1]
+        position = bisect_left(self.targets, target, low, high)
+        return position < high and self.targets[position] == target
+
+    def path_names(self, path: Iterable[int]) -> List[str]:
+        return [self.names[node] for node in path]
+
+
+GraphLike = Union[Mapping[str, Iterable[str]], CompactGraph]
+
+
+def as_compact(graph: GraphLike) -> CompactGraph:
+    return graph if isinstance(graph, CompactGraph) else CompactGraph.from_mapping(graph)
+
+
+def _tarjan(compact: CompactGraph) -> List[List[int]]:
+    """Tarjan iterativo sobre ids; componentes em ordem topológica reversa."""
+
+    count = len(compact)
+    offsets, targets = compact.offsets, compact.targets
+    index_of = array("l", [-1]) * count
+    lowlink = array("l", [0]) * count
+    on_stack = bytearray(count)
+    stack: List[int] = []
+    components: List[List[int]] = []
+    counter = 0
+
+    for root in range(count):
+        if index_of[root] >= 0:
+            continue
+        # Pilha de trabalho explícita: nó + posição (no CSR) do próximo vizinho.
+        work_nodes: List[int] = [root]
+        work_positions: List[int] = [offsets[root]]
+        index_of[root] = lowlink[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack[root] = 1
+
+        while work_nodes:
+            node = work_nodes[-1]
+            position = work_positions[-1]
+            if position < offsets[node + 1]:
+                work_positions[-1] = position + 1
+                target = targets[position]
+                if index_of[target] < 0:
+                    index_of[target] = lowlink[target] = counter
+                    counter += 1
+                    stack.append(target)
+                    on_stack[target] = 1
+                    work_nodes.append(target)
+                    work_positions.append(offsets[target])
+                elif on_stack[target] and index_of[target] < lowlink[node]:
+                    lowlink[node] = index_of[target]
+                continue
+
+            work_nodes.pop()
+            work_positions.pop()
+            if work_nodes:
+                parent = work_nodes[-1]
+                if lowlink[node] < lowlink[parent]:
+                    lowlink[parent] = lowlink[node]
+            if lowlink[node] == index_of[node]:
+                component: List[int] = []
+                while True:
+                    member = stack.pop()
+                    on_stack[member] = 0
+                    component.append(member)
+                    if member == node:
+                        break
+                component.sort()
+                components.append(component)
+
+    return components
+
+
+def strongly_connected_components(graph: GraphLike) -> List[List[str]]:
+    """Componentes fortemente conexas (Tarjan iterativo), O(V + E) e sem recursão.
+
+    Nós e vizinhos são visitados em ordem ordenada, então o resultado é
+    determinístico. As componentes saem em ordem topológica reversa (uma SCC
+    só é emitida depois de todas as que ela alcança), cada uma com nós ordenados.
+    """
+
+    compact = as_compact(graph)
+    return [compact.path_names(component) for component in _tarjan(compact)]
+
+
+def _shortest_cycle(compact: CompactGraph, start: int, component_of: array) -> List[int]:
+    """Menor ciclo `start -> ... -> start` dentro da SCC (BFS restrita aos membros)."""
+
+    offsets, targets = compact.offsets, compact.targets
+    home = component_of[start]
+    parents: Dict[int, int] = {start: -1}
+    queue = deque([start])
+    while queue:
+        node = queue.popleft()
+        for position in range(offsets[node], offsets[node + 1]):
+            target = targets[position]
+            if target == start:
+                path = [node]
+                parent = parents[node]
+                while parent >= 0:
+                    path.append(parent)
+                    parent = parents[parent]
+                path.reverse()
+                path.append(start)
+                return path
+            if component_of[target] == home and target not in parents:
+                parents[target] = node
+                queue.append(target)
+    return [start]
+
+
+def _component_index(compact: CompactGraph, components: List[List[int]]) -> array:
+    component_of = array("l", [0]) * len(compact)
+    for position, component in enumerate(components):
+        for node in component:
+            component_of[node] = position
+    return component_of
+
+
+def cycle_groups(graph: GraphLike) -> List[Dict[str, object]]:
+    """Grupos de dependência circular: SCCs com mais de um nó ou com auto-import.
+
+    Cada grupo traz os módulos ordenados e um caminho representativo (o menor
+    ciclo que passa pelo menor módulo do grupo), ex.: `["a", "b", "a"]`.
+    """
+
+    compact = as_compact(graph)
+    components = _tarjan(compact)
+    component_of = _component_index(compact, components)
+
+    groups: List[Dict[str, object]] = []
+    # Ids seguem a ordem dos nomes: ordenar listas de ids = ordenar listas de nomes.
+    for component in sorted(components):
+        head = component[0]
+        if len(component) == 1 and not compact.has_edge(head, head):
+            continue
+        groups.append(
+            {
+                "modules": compact.path_names(component),
+                "cycle": compact.path_names(_shortest_cycle(compact, head, component_of)),
+            }
+        )
+    return groups
+
+
+def _witness_path(
+    compact: CompactGraph,
+    start: int,
+    is_target: Callable[[int], bool],
+    can_reach: Callable[[int], bool],
+) -> Optional[List[int]]:
+    """BFS com `deque` e ponteiros de pai até o alvo mais próximo (exceto o próprio início).
+
+    `can_reach` poda nós que não alcançam alvo algum; o desempate segue a ordem
+    ordenada dos vizinhos, como numa BFS simples a partir de `start`.
+    """
+
+    offsets, targets = compact.offsets, compact.targets
+    parents: Dict[int, int] = {start: -1}
+    queue = deque([start])
+    while queue:
+        node = queue.popleft()
+        if node != start and is_target(node):
+            path = [node]
+            parent = parents[node]
+            while parent >= 0:
+                path.append(parent)
+                parent = parents[parent]
+            path.reverse()
+            return path
+        for position in range(offsets[node], offsets[node + 1]):
+            target = targets[position]
+            if target not in parents and can_reach(target):
+                parents[target] = node
+                queue.append(target)
+    return None
+
+
+def _condensed_reach(compact: CompactGraph, node_mask: Sequence[int]) -> Tuple[array, List[int], List[int]]:
+    """Máscaras de alcançabilidade por SCC, numa passada em ordem topológica reversa.
+
+    `node_mask[i]` é a máscara do nó de id i. Retorna `(componente de cada nó,
+    reach, reach_strict)`: `reach[c]` é o OU das máscaras alcançáveis a partir de
+    c contando os próprios membros; `reach_strict[c]` exige pelo menos uma aresta.
+    """
+
+    offsets, targets = compact.offsets, compact.targets
+    components = _tarjan(compact)
+    component_of = _component_index(compact, components)
+
+    reach: List[int] = []
+    reach_strict: List[int] = []
+    for position, component in enumerate(components):
+        own = 0
+        downstream = 0
+        for node in component:
+            own |= node_mask[node]
+            for edge in range(offsets[node], offsets[node + 1]):
+                other = component_of[targets[edge]]
+                if other != position:
+                    downstream |= reach[other]
+        cyclic = len(component) > 1 or compact.has_edge(component[0], component[0])
+        strict = downstream | (own if cyclic else 0)
+        reach_strict.append(strict)
+        reach.append(strict | own)
+    return component_of, reach, reach_strict
+
+
+def layer_violations(
+    graph: GraphLike,
+    layer_of: Mapping[str, str],
+    rules: Sequence[Tuple[str, str]],
+) -> List[Tuple[int, str, List[str]]]:
+    """Avalia todas as regras `(camada origem, camada proibida)` numa única passada.
+
+    Cada camada-alvo vira um bit; a condensação propaga o OU dos bits, então
+    saber se um módulo alcança qualquer camada proibida custa O(1) por regra.
+    Caminhos só são reconstruídos para violações. Retorna
+    `(índice da regra, módulo de origem, caminho)` por regra e origem ordenada.
+    """
+
+    compact = as_compact(graph)
+    bits: Dict[str, int] = {}
+    for _, target_layer in rules:
+        bits.setdefault(target_layer, 1 << len(bits))
+    layers = [layer_of.get(name) for name in compact.names]
+    node_mask = [bits.get(layer, 0) if layer is not None else 0 for layer in layers]
+    component_of, reach, reach_strict = _condensed_reach(compact, node_mask)
+
+    found: List[Tuple[int, str, List[str]]] = []
+    for position, (source_layer, target_layer) in enumerate(rules):
+        bit = bits[target_layer]
+        for start, layer in enumerate(layers):
+            if layer != source_layer or not reach_strict[component_of[start]] & bit:
+                continue
+            path = _witness_path(
+                compact,
+                start,
+                lambda node: layers[node] == target_layer,
+                lambda node: bool(reach[component_of[node]] & bit),
+            )
+            if path is not None:
+                found.append((position, compact.names[start], compact.path_names(path)))
+    return found
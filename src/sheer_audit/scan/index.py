@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+
+from .repo import _RACY_WINDOW_NS
+
+INDEX_VERSION = 4
+# Valor padrão da CLI: índice no cache do usuário, nunca dentro do repositório analisado.
+DEFAULT_INDEX_PATH = "auto"
+
+
+def user_cache_index_path(repo_root: Path) -> Path:
+    """`$XDG_CACHE_HOME/sheer-audit/<hash da raiz>.analysis_index.json` (padrão `~/.cache`)."""
+
+    base = os.environ.get("XDG_CACHE_HOME") or str(Path.home() / ".cache")
+    digest = hashlib.sha256(repo_root.resolve().as_posix().encode("utf-8")).hexdigest()[:16]
+    return Path(base) / "sheer-audit" / f"{digest}.analysis_index.json"
+
+
+class AnalysisIndex:
+    """Índice incremental de análise: resumo por arquivo chaveado por hash de conteúdo.
+
+    Invariantes:
+    - uma entrada só é reutilizada se o stat (mtime/tamanho) ou o hash sha256 batem
+    - arquivos indexados dentro da janela "racy" do mtime só valem pelo hash
+    - índice de outra raiz ou de outra versão de formato é descartado por inteiro
+    - sem `path` o índice vive apenas em memória (nada é gravado em disco)
+    """
+
+    def __init__(self, path: Optional[Path], repo_root: Path) -> None:
+        self.path = path
+        self.repo_root = repo_root.as_posix()
+        self.files: Dict[str, Dict[str, object]] = {}
+        self._dirty = False
+        self._load()
+
+    def _load(self) -> None:
+        if self.path is None or not self.path.exists():
+            return
+        try:
+            raw = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return
+        if raw.get("version") != INDEX_VERSION or raw.get("repo") != self.repo_root:
+            return
+        self.files = dict(raw.get("files", {}))
+
+    def get(self, relative: str, mtime_ns: int, size: int) -> Optional[Dict[str, object]]:
+        """Retorna o resumo se o stat do arquivo não mudou desde a indexação."""
+
+        entry = self.files.get(relative)
+        if entry is not None and entry.get("mtime_ns") == mtime_ns and entry.get("size") == size:
+            return entry
+        return None
+
+    def get_by_hash(self, relative: str, digest: str) -> Optional[Dict[str, object]]:
+        """Retorna o resumo se o conteúdo é idêntico (ex.: checkout que só tocou o mtime)."""
+
+        entry = self.files.get(relative)
+        if entry is not None and entry.get("hash") == digest:
+            return entry
+        return None
+
+    def put(
+        self, relative: str, summary: Dict[str, object], mtime_ns: int, size: int, now_ns: Optional[int] = None
+    ) -> Dict[str, object]:
+        """Grava o resumo; perto demais do mtime, o stat não é gravado e `get` sempre falha.
+
+        Em sistemas de arquivos com mtime grosseiro, uma edição de mesmo tamanho
+        no mesmo "tick" manteria o stat; essas entradas caem em `get_by_hash`.
+        """
+
+        if now_ns is None:
+            now_ns = time.time_ns()
+        entry = dict(summary)
+        entry["mtime_ns"] = mtime_ns if now_ns - mtime_ns >= _RACY_WINDOW_NS else None
+        entry["size"] = size
+        self.files[relative] = entry
+        self._dirty = True
+        return entry
+
+    def retain(self, relatives: Iterable[str]) -> None:
+        """Remove entradas de arquivos que não existem mais no escopo."""
+
+        keep = set(relatives)
+        for stale in [name for name in self.files if name not in keep]:
+            del self.files[stale]
+            self._dirty = True
+
+    def save(self) -> None:
+        if self.path is None or not self._dirty:
+            return
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        payload = {
+            "version": INDEX_VERSION,
+            "repo": self.repo_root,
+            "files": {name: self.files[name] for name in sorted(self.files)},
+        }
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        tmp_path.write_text(json.dumps(payload, ensure_ascii=False, separators=(",", ":")), encoding="utf-8")
+        os.replace(tmp_path, self.path)
+        self._dirty = False
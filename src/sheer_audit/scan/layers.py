@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from ..config import ArchitectureConfig
+from .graph import GraphLike, as_compact, layer_violations
+
+UNKNOWN_LAYER = "unknown"
+
+
+@dataclass(frozen=True)
+class LayerRule:
+    source: str
+    target: str
+    impact: str = "HIGH"
+
+
+@dataclass(frozen=True)
+class LayerViolation:
+    rule: LayerRule
+    start: str
+    path: List[str]
+
+
+def _glob_to_regex(pattern: str) -> str:
+    """Traduz glob de caminho para regex: `**` cruza diretórios, `*`/`?` não.
+
+    O glob é casado contra o caminho do módulo sem extensão (`pkg/core/rules`);
+    `.py` final no padrão é ignorado e `dir/**` também casa o próprio `dir`.
+    """
+
+    pattern = pattern.strip().strip("/")
+    if pattern.endswith(".py"):
+        pattern = pattern[: -len(".py")]
+    parts: List[str] = []
+    index = 0
+    while index < len(pattern):
+        if pattern.startswith("/**", index) and index + 3 == len(pattern):
+            parts.append("(?:/.*)?")
+            index += 3
+        elif pattern.startswith("**/", index):
+            parts.append("(?:.*/)?")
+            index += 3
+        elif pattern.startswith("**", index):
+            parts.append(".*")
+            index += 2
+        elif pattern[index] == "*":
+            parts.append("[^/]*")
+            index += 1
+        elif pattern[index] == "?":
+            parts.append("[^/]")
+            index += 1
+        else:
+            parts.append(re.escape(pattern[index]))
+            index += 1
+    return "".join(parts)
+
+
+def _parse_layer_paths(layers: Sequence[str], layer_paths: Sequence[str]) -> List[Tuple[str, str]]:
+    """Aceita `"camada=glob"` ou, sem `=`, o glob posicional da camada de mesmo índice."""
+
+    pairs: List[Tuple[str, str]] = []
+    for position, raw in enumerate(layer_paths):
+        layer, sep, pattern = str(raw).partition("=")
+        if sep:
+            pairs.append((layer.strip(), pattern.strip()))
+        elif position < len(layers):
+            pairs.append((layers[position], str(raw).strip()))
+        else:
+            raise ValueError(f"layer_paths[{position}] sem camada: use 'camada=glob'.")
+    return pairs
+
+
+def _legacy_layer(module_name: str) -> str:
+    tokens = set(module_name.split("."))
+    if "core" in tokens:
+        return "core"
+    if tokens.intersection({"scan", "stages", "db", "cli", "model"}):
+        return "io"
+    if "governance" in tokens:
+        return "policy"
+    return UNKNOWN_LAYER
+
+
+class LayerRulesEngine:
+    """Regras de camadas compiladas: um único regex para todos os globs de camada.
+
+    A camada de um módulo é a do primeiro glob que casa (ordem de `layer_paths`),
+    atribuída uma vez por módulo. Todas as regras proibidas são avaliadas numa
+    única passada sobre o grafo condensado (ver `layer_violations`).
+    """
+
+    def __init__(
+        self,
+        rules: Sequence[LayerRule],
+        layer_paths: Sequence[Tuple[str, str]] = (),
+        classifier: Optional[Callable[[str], str]] = None,
+    ) -> None:
+        self.rules = list(rules)
+        self._group_layers: Dict[str, str] = {}
+        alternatives: List[str] = []
+        for position, (layer, pattern) in enumerate(layer_paths):
+            group = f"g{position}"
+            self._group_layers[group] = layer
+            alternatives.append(f"(?P<{group}>{_glob_to_regex(pattern)})")
+        self._matcher = re.compile("|".join(alternatives)) if alternatives else None
+        self._classifier = classifier
+
+    @classmethod
+    def default(cls) -> "LayerRulesEngine":
+        """Comportamento histórico: camadas por token do nome e regra `core -> io`."""
+
+        return cls([LayerRule("core", "io", "HIGH")], classifier=_legacy_layer)
+
+    @classmethod
+    def from_config(cls, config: Optional[ArchitectureConfig]) -> "LayerRulesEngine":
+        """Compila `ArchitectureConfig`; sem camadas nem regras, usa `default()`."""
+
+        if config is None or not (config.layer_paths or config.forbidden_imports):
+            return cls.default()
+
+        rules: List[LayerRule] = []
+        for position, raw in enumerate(config.forbidden_imports):
+            source = raw.get("from") or raw.get("source")
+            target = raw.get("to") or raw.get("target")
+            if not source or not target:
+                raise ValueError(f"forbidden_imports[{position}] precisa de 'from' e 'to'.")
+            rules.append(LayerRule(str(source), str(target), str(raw.get("impact", "HIGH"))))
+
+        pairs = _parse_layer_paths(config.layers, config.layer_paths)
+        known = set(config.layers) | {layer for layer, _ in pairs}
+        for rule in rules:
+            for layer in (rule.source, rule.target):
+                if config.layers and layer not in known:
+                    raise ValueError(f"camada desconhecida em forbidden_imports: {layer}")
+        return cls(rules, layer_paths=pairs, classifier=None if pairs else _legacy_layer)
+
+    def layer_of(self, module_name: str) -> str:
+        if self._matcher is not None:
+            match = self._matcher.fullmatch(module_name.replace(".", "/"))
+            if match is not None and match.lastgroup is not None:
+                return self._group_layers[match.lastgroup]
+        if self._classifier is not None:
+            return self._classifier(module_name)
+        return UNKNOWN_LAYER
+
+    def assign(self, modules: Iterable[str]) -> Dict[str, str]:
+        return {module: self.layer_of(module) for module in modules}
+
+    def evaluate(self, graph: GraphLike) -> List[LayerViolation]:
+        compact = as_compact(graph)
+        layers = self.assign(compact)
+        found = layer_violations(compact, layers, [(rule.source, rule.target) for rule in self.rules])
+        return [
+            LayerViolation(rule=self.rules[position], start=start, path=path)
+            for position, start, path in found
+        ]
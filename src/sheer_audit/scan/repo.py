@@ -1,11 +1,20 @@
 from __future__ import annotations
 
+import json
 import os
+import time
 from pathlib import Path
-from typing import List
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
 
 from ..config import ScanConfig
 
+DIR_CACHE_VERSION = 1
+# Diretórios modificados há menos que isso não são cacheados: o mtime pode não
+# refletir uma escrita que aconteça no mesmo "tick" do sistema de arquivos.
+_RACY_WINDOW_NS = 2_000_000_000
+
+DiscoveredFile = Tuple[str, int, int]
+
 
 def _is_test_path(relative_path: Path) -> bool:
     """Return True when path clearly belongs to test code.
@@ -22,20 +31,155 @@ def _is_test_path(relative_path: Path) -> bool:
     return relative_path.name.startswith("test_") or relative_path.name.endswith("_test.py")
 
 
-def collect_python_files(root: str, cfg: ScanConfig) -> List[str]:
-    """Coleta arquivos Python no repositório respeitando filtros.
+class DirectoryCache:
+    """Listagens por diretório (subdiretórios + arquivos .py) validadas pelo mtime.
 
     Invariantes:
-    - determinístico (ordenação final + caminhos relativos canônicos)
-    - read-only (somente metadata via stat)
-    - respeita include_dirs/exclude_dirs da configuração
+    - uma listagem só é reutilizada se o mtime do diretório não mudou
+    - o conteúdo é independente do ScanConfig (filtros são aplicados depois)
+    - sem `path` o cache vive apenas em memória
+    """
+
+    def __init__(self, path: Optional[Path], root: Path) -> None:
+        self.path = path
+        self.root = root.as_posix()
+        self.dirs: Dict[str, Dict[str, Any]] = {}
+        self._dirty = False
+        self._load()
+
+    def _load(self) -> None:
+        if self.path is None or not self.path.exists():
+            return
+        try:
+            raw = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return
+        if raw.get("version") != DIR_CACHE_VERSION or raw.get("root") != self.root:
+            return
+        self.dirs = dict(raw.get("dirs", {}))
+
+    def lookup(self, rel_dir: str, mtime_ns: int) -> Optional[Tuple[List[str], List[str]]]:
+        entry = self.dirs.get(rel_dir)
+        if entry is None or entry.get("mtime_ns") != mtime_ns:
+            return None
+        return list(entry["dirs"]), list(entry["files"])
+
+    def store(self, rel_dir: str, mtime_ns: int, subdirs: List[str], files: List[str], now_ns: int) -> None:
+        if now_ns - mtime_ns < _RACY_WINDOW_NS:
+            if self.dirs.pop(rel_dir, None) is not None:
+                self._dirty = True
+            return
+        self.dirs[rel_dir] = {"mtime_ns": mtime_ns, "dirs": sorted(subdirs), "files": sorted(files)}
+        self._dirty = True
+
+    def retain(self, rel_dirs: Set[str]) -> None:
+        for stale in [name for name in self.dirs if name not in rel_dirs]:
+            del self.dirs[stale]
+            self._dirty = True
+
+    def save(self) -> None:
+        if self.path is None or not self._dirty:
+            return
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        payload = {
+            "version": DIR_CACHE_VERSION,
+            "root": self.root,
+            "dirs": {name: self.dirs[name] for name in sorted(self.dirs)},
+        }
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        tmp_path.write_text(json.dumps(payload, ensure_ascii=False, separators=(",", ":")), encoding="utf-8")
+        os.replace(tmp_path, self.path)
+        self._dirty = False
+
+
+# Memo por processo: (raiz, arquivo de cache) -> listagens já validadas nesta execução.
+_DIR_CACHES: Dict[Tuple[str, Optional[str]], DirectoryCache] = {}
+
+
+def _directory_cache(rootp: Path, cache_path: Optional[str]) -> DirectoryCache:
+    resolved = Path(cache_path).resolve() if cache_path else None
+    key = (rootp.as_posix(), resolved.as_posix() if resolved else None)
+    cache = _DIR_CACHES.get(key)
+    if cache is None:
+        cache = _DIR_CACHES[key] = DirectoryCache(resolved, rootp)
+    return cache
+
+
+def _walk_python_files(
+    rootp: Path, rel_base: str, exclude: Set[str], cache: DirectoryCache, visited: Set[str]
+) -> Iterator[Tuple[str, os.stat_result]]:
+    """Percorre `rel_base` com `os.scandir`, reaproveitando listagens cujo mtime não mudou.
+
+    Diretórios inalterados custam um `stat` do diretório e um por arquivo .py;
+    o `scandir` só roda onde houve mudança.
+    """
+
+    root = rootp.as_posix()
+    now_ns = time.time_ns()
+    stack = [rel_base]
+    while stack:
+        rel_dir = stack.pop()
+        abs_dir = root if rel_dir == "." else f"{root}/{rel_dir}"
+        try:
+            dir_mtime = os.stat(abs_dir).st_mtime_ns
+        except OSError:
+            continue
+        visited.add(rel_dir)
+
+        stats: Dict[str, os.stat_result] = {}
+        cached = cache.lookup(rel_dir, dir_mtime)
+        if cached is None:
+            subdirs: List[str] = []
+            files: List[str] = []
+            try:
+                with os.scandir(abs_dir) as entries:
+                    for entry in entries:
+                        try:
+                            if entry.is_dir(follow_symlinks=False):
+                                subdirs.append(entry.name)
+                            elif entry.name.endswith(".py") and entry.is_file():
+                                files.append(entry.name)
+                                stats[entry.name] = entry.stat()
+                        except OSError:
+                            continue
+            except OSError:
+                continue
+            cache.store(rel_dir, dir_mtime, subdirs, files, now_ns)
+        else:
+            subdirs, files = cached
+
+        prefix = "" if rel_dir == "." else f"{rel_dir}/"
+        for name in files:
+            stat = stats.get(name)
+            if stat is None:
+                try:
+                    stat = os.stat(f"{abs_dir}/{name}")
+                except OSError:
+                    continue
+            yield prefix + name, stat
+
+        for name in reversed(sorted(subdirs)):
+            if name.lower() not in exclude:
+                stack.append(prefix + name)
+
+
+def discover_python_files(root: str, cfg: ScanConfig, cache_path: Optional[str] = None) -> List[DiscoveredFile]:
+    """Como `collect_python_files`, mas devolve `(relativo, mtime_ns, tamanho)` por arquivo.
+
+    O stat obtido na descoberta é reaproveitado pelo chamador (nada de segundo
+    `stat`). Com `cache_path`, as listagens de diretório persistem entre execuções.
     """
 
     rootp = Path(root).resolve()
     exclude = {d.lower() for d in (cfg.exclude_dirs or [])}
     include_dirs = cfg.include_dirs or ["."]
+    cache = _directory_cache(rootp, cache_path)
+    max_bytes = cfg.max_file_kb * 1024
 
-    files: List[str] = []
+    files: Dict[str, DiscoveredFile] = {}
+    visited: Set[str] = set()
+    walked_root = False
 
     for include_dir in include_dirs:
         base_dir = (rootp / include_dir).resolve()
@@ -49,24 +193,69 @@ def collect_python_files(root: str, cfg: ScanConfig) -> List[str]:
         rel_base = base_dir.relative_to(rootp) if base_dir != rootp else Path(".")
         if rel_base != Path(".") and any(part.lower() in exclude for part in rel_base.parts):
             continue
+        walked_root = walked_root or rel_base == Path(".")
 
-        for dirpath, dirnames, filenames in os.walk(base_dir):
-            dirnames[:] = [d for d in dirnames if d.lower() not in exclude]
+        for relative, stat in _walk_python_files(rootp, rel_base.as_posix(), exclude, cache, visited):
+            if not cfg.include_tests and _is_test_path(Path(relative)):
+                continue
+            if stat.st_size > max_bytes:
+                continue
+            files[relative] = (relative, stat.st_mtime_ns, stat.st_size)
 
-            for fn in filenames:
-                if not fn.endswith(".py"):
-                    continue
+    if walked_root:
+        cache.retain(visited)
+    cache.save()
+    return [files[relative] for relative in sorted(files)]
 
-                full = Path(dirpath) / fn
-                rel_path = full.relative_to(rootp)
 
-                if not cfg.include_tests and _is_test_path(rel_path):
-                    continue
+def filter_python_files(root: str, cfg: ScanConfig, relatives: Iterable[str]) -> List[DiscoveredFile]:
+    """Aplica os filtros do ScanConfig a uma lista pronta de caminhos (ex.: índice do git).
 
-                size_kb = full.stat().st_size / 1024
-                if size_kb > cfg.max_file_kb:
-                    continue
+    Mesma semântica de `discover_python_files`: arquivo `.py` dentro de algum
+    include_dir, sem diretório excluído no caminho, filtro de testes e de tamanho.
+    Caminhos que não existem mais no disco são ignorados.
+    """
 
-                files.append(rel_path.as_posix())
+    rootp = Path(root).resolve()
+    exclude = {d.lower() for d in (cfg.exclude_dirs or [])}
+    max_bytes = cfg.max_file_kb * 1024
+
+    bases: List[Tuple[str, ...]] = []
+    for include_dir in cfg.include_dirs or ["."]:
+        base_dir = (rootp / include_dir).resolve()
+        if base_dir.is_dir() and rootp in {base_dir, *base_dir.parents}:
+            bases.append(base_dir.relative_to(rootp).parts)
+
+    files: Dict[str, DiscoveredFile] = {}
+    for relative in relatives:
+        if not relative.endswith(".py"):
+            continue
+        rel_path = Path(relative)
+        dir_parts = rel_path.parts[:-1]
+        if not any(dir_parts[: len(base)] == base for base in bases):
+            continue
+        if any(part.lower() in exclude for part in dir_parts):
+            continue
+        if not cfg.include_tests and _is_test_path(rel_path):
+            continue
+        try:
+            stat = (rootp / rel_path).stat()
+        except OSError:
+            continue
+        if stat.st_size > max_bytes:
+            continue
+        files[rel_path.as_posix()] = (rel_path.as_posix(), stat.st_mtime_ns, stat.st_size)
+
+    return [files[relative] for relative in sorted(files)]
+
+
+def collect_python_files(root: str, cfg: ScanConfig, cache_path: Optional[str] = None) -> List[str]:
+    """Coleta arquivos Python no repositório respeitando filtros.
+
+    Invariantes:
+    - determinístico (ordenação final + caminhos relativos canônicos)
+    - read-only (somente metadata via stat), exceto o cache opcional em `cache_path`
+    - respeita include_dirs/exclude_dirs da configuração
+    """
 
-    return sorted(set(files))
+    return [relative for relative, _, _ in discover_python_files(root, cfg, cache_path)]
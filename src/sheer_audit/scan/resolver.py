@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+# Raízes de código no estilo src-layout: `src/pkg/mod.py` também é importável como `pkg.mod`.
+DEFAULT_SOURCE_ROOTS = ("src",)
+
+# `[nível, módulo, nomes]`: `import a.b` -> `[0, "a.b", []]`; `from . import x` -> `[1, "", ["x"]]`.
+ImportEntry = Sequence[Any]
+
+
+def module_name(relative: str) -> str:
+    """Nome de módulo canônico (nó do grafo) a partir do caminho relativo."""
+
+    stem = relative[: -len(".py")] if relative.endswith(".py") else relative
+    name = stem.replace("/", ".")
+    if name.endswith(".__init__"):
+        return name[: -len(".__init__")]
+    return name
+
+
+class ModuleResolver:
+    """Resolve imports (absolutos, relativos e `from pkg import submódulo`) para nós do grafo.
+
+    Invariantes:
+    - nós são os nomes canônicos de `module_name` (caminho completo a partir da raiz)
+    - nomes sob uma raiz src-layout também resolvem pelo nome sem a raiz; o nome
+      canônico tem precedência em caso de colisão
+    - `import a.b.c` e `from a.b.c import x` caem no prefixo mais longo que existe
+    - resultados são memorizados por (arquivo, hash do conteúdo)
+    """
+
+    def __init__(self, relatives: Iterable[str], source_roots: Sequence[str] = DEFAULT_SOURCE_ROOTS) -> None:
+        self.files = frozenset(relatives)
+        self.node_of: Dict[str, str] = {}
+        self.file_of: Dict[str, str] = {}
+        aliases: Dict[str, str] = {}
+        for relative in sorted(self.files):
+            node = module_name(relative)
+            self.node_of[relative] = node
+            self.file_of.setdefault(node, relative)
+            for root in source_roots:
+                prefix = f"{root.strip('/')}/"
+                if relative.startswith(prefix):
+                    aliases.setdefault(module_name(relative[len(prefix) :]), node)
+        self._names: Dict[str, str] = {**aliases, **{node: node for node in self.file_of}}
+        self._cache: Dict[Tuple[str, str], Set[str]] = {}
+
+    def lookup(self, name: str) -> Optional[str]:
+        return self._names.get(name)
+
+    def _longest(self, name: str) -> Optional[str]:
+        parts = name.split(".")
+        while parts:
+            node = self._names.get(".".join(parts))
+            if node is not None:
+                return node
+            parts.pop()
+        return None
+
+    def _package_parts(self, relative: str) -> List[str]:
+        node = self.node_of.get(relative, module_name(relative))
+        parts = node.split(".") if node else []
+        return parts if relative.endswith("__init__.py") else parts[:-1]
+
+    def absolute_name(self, relative: str, level: int, module: str) -> Optional[str]:
+        """Nome absoluto de `from <ponto * level><module>` visto de `relative` (None se sair da raiz)."""
+
+        if not level:
+            return module
+        package = self._package_parts(relative)
+        if level - 1 > len(package):
+            return None
+        base_parts = package[: len(package) - (level - 1)]
+        return ".".join(base_parts + ([module] if module else []))
+
+    def _resolve_entry(self, relative: str, entry: ImportEntry) -> Set[str]:
+        level, module, names = int(entry[0]), str(entry[1]), [str(name) for name in entry[2]]
+        base = self.absolute_name(relative, level, module)
+        if base is None:
+            return set()
+
+        if not names:
+            node = self._longest(base)
+            return {node} if node is not None else set()
+
+        targets: Set[str] = set()
+        base_node = self.lookup(base) if base else None
+        if base_node is not None:
+            targets.add(base_node)
+        for name in names:
+            if name == "*":
+                continue
+            submodule = self.lookup(f"{base}.{name}" if base else name)
+            if submodule is not None:
+                targets.add(submodule)
+        if not targets and base:
+            fallback = self._longest(base)
+            if fallback is not None:
+                targets.add(fallback)
+        return targets
+
+    def resolve(self, relative: str, imports: Iterable[ImportEntry], digest: Optional[str] = None) -> Set[str]:
+        """Nós importados por `relative`; com `digest`, o resultado fica em cache."""
+
+        key = (relative, digest) if digest else None
+        if key is not None and key in self._cache:
+            return set(self._cache[key])
+        targets: Set[str] = set()
+        for entry in imports:
+            targets |= self._resolve_entry(relative, entry)
+        if key is not None:
+            self._cache[key] = targets
+        return set(targets)
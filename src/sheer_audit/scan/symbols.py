@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import json
+import os
+from bisect import bisect_left, bisect_right
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional
+
+SYMBOL_INDEX_VERSION = 1
+# Separador do texto concatenado usado na busca por substring; não ocorre em ids.
+_SEPARATOR = "\n"
+
+
+@dataclass(frozen=True)
+class SymbolEntry:
+    id: str
+    file: str
+    name: str
+    kind: str
+    depth: int
+    line: int
+
+
+class SymbolIndex:
+    """Índice de símbolos (`arquivo.py:nome`) para busca exata, por prefixo e por substring.
+
+    Invariantes:
+    - `ids` é ordenado: prefixo resolve com duas buscas binárias
+    - substring usa `str.find` sobre os ids concatenados e mapeia o offset de volta
+      ao id por busca binária (sem laço Python por entrada)
+    - `modules` mapeia nome de módulo -> arquivo relativo
+    """
+
+    def __init__(self, entries: Iterable[SymbolEntry], modules: Dict[str, str]) -> None:
+        self.entries = sorted(entries, key=lambda entry: (entry.id, entry.line))
+        self.modules = dict(modules)
+        self._by_id: Dict[str, List[SymbolEntry]] = {}
+        for entry in self.entries:
+            self._by_id.setdefault(entry.id, []).append(entry)
+        self.ids = sorted(self._by_id)
+
+        self._blob = _SEPARATOR.join(self.ids)
+        self._starts: List[int] = []
+        offset = 0
+        for component_id in self.ids:
+            self._starts.append(offset)
+            offset += len(component_id) + len(_SEPARATOR)
+
+    @classmethod
+    def from_summaries(
+        cls, summaries: Iterable[Dict[str, object]], module_name: Callable[[str], str]
+    ) -> "SymbolIndex":
+        entries: List[SymbolEntry] = []
+        modules: Dict[str, str] = {}
+        for summary in summaries:
+            relative = str(summary["file"])
+            modules[module_name(relative)] = relative
+            lines = list(summary.get("symbol_lines", []))
+            for position, coordinate in enumerate(summary["coordinates"]):
+                component_id = str(coordinate["x"])
+                entries.append(
+                    SymbolEntry(
+                        id=component_id,
+                        file=relative,
+                        name=component_id.split(":", 1)[1],
+                        kind=str(coordinate["kind"]),
+                        depth=int(coordinate["y"]),
+                        line=int(lines[position]) if position < len(lines) else 0,
+                    )
+                )
+        return cls(entries, modules)
+
+    def exact(self, component_id: str) -> List[SymbolEntry]:
+        return list(self._by_id.get(component_id, []))
+
+    def prefix(self, value: str) -> List[SymbolEntry]:
+        start = bisect_left(self.ids, value)
+        # Todo id com o prefixo fica antes de `value + U+10FFFF` na ordem lexical.
+        end = bisect_right(self.ids, value + "\U0010ffff", lo=start)
+        return [entry for component_id in self.ids[start:end] for entry in self._by_id[component_id]]
+
+    def substring(self, value: str) -> List[SymbolEntry]:
+        if not value or _SEPARATOR in value:
+            return []
+        matched: List[str] = []
+        position = self._blob.find(value)
+        while position != -1:
+            slot = bisect_right(self._starts, position) - 1
+            matched.append(self.ids[slot])
+            # Pula para o próximo id: um id entra uma única vez no resultado.
+            next_start = self._starts[slot + 1] if slot + 1 < len(self._starts) else len(self._blob)
+            position = self._blob.find(value, next_start)
+        return [entry for component_id in matched for entry in self._by_id[component_id]]
+
+    def in_file(self, relative: str) -> List[SymbolEntry]:
+        return self.prefix(f"{relative}:")
+
+    def module_file(self, module: str) -> Optional[str]:
+        return self.modules.get(module)
+
+    def save(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        payload = {
+            "version": SYMBOL_INDEX_VERSION,
+            "entries": [asdict(entry) for entry in self.entries],
+            "modules": {name: self.modules[name] for name in sorted(self.modules)},
+        }
+        tmp_path = path.with_name(path.name + ".tmp")
+        tmp_path.write_text(json.dumps(payload, ensure_ascii=False, separators=(",", ":")), encoding="utf-8")
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: Path) -> Optional["SymbolIndex"]:
+        try:
+            raw = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        if raw.get("version") != SYMBOL_INDEX_VERSION:
+            return None
+        return cls((SymbolEntry(**entry) for entry in raw.get("entries", [])), raw.get("modules", {}))
@@ -27,3 +27,96 @@ def test_detect_structural_syntax_error(tmp_path: Path) -> None:
 
     assert len(errors) == 1
     assert errors[0]["type"] == "SyntaxError"
+
+
+def test_engine_parses_each_file_once_and_invalidates_by_stat(tmp_path: Path, monkeypatch) -> None:
+    import ast
+
+    (tmp_path / "a.py").write_text("def alpha():\n    return 1\n")
+    (tmp_path / "b.py").write_text("import a\n")
+
+    parsed: list[str] = []
+    original_parse = ast.parse
+
+    def counting_parse(source, filename="<unknown>", *args, **kwargs):
+        parsed.append(filename)
+        return original_parse(source, filename, *args, **kwargs)
+
+    monkeypatch.setattr(ast, "parse", counting_parse)
+
+    engine = SheerAdvancedEngine(str(tmp_path))
+    engine.detect_structural_errors()
+    engine.build_component_inventory()
+    engine.build_execution_tree()
+    engine.analyze_component("a.py:alpha")
+
+    assert sorted(parsed) == ["a.py", "b.py"]
+
+    (tmp_path / "a.py").write_text("def alpha():\n    return 1\n\ndef beta():\n    return 2\n")
+    inventory = engine.build_component_inventory()
+
+    assert sorted(parsed) == ["a.py", "a.py", "b.py"]
+    assert [item["id"] for item in inventory] == ["a.py:alpha", "a.py:beta"]
+
+
+def test_run_full_analysis_matches_individual_methods(tmp_path: Path) -> None:
+    pkg = tmp_path / "pkg"
+    pkg.mkdir()
+    (pkg / "a.py").write_text("import pkg.b\n\ndef alpha():\n    return 1\n")
+    (pkg / "b.py").write_text("import pkg.a\n\nclass Beta:\n    def run(self):\n        return 2\n")
+
+    engine = SheerAdvancedEngine(str(tmp_path))
+    analysis = engine.run_full_analysis()
+
+    assert analysis.cartesian == engine.generate_cartesian_map()
+    assert analysis.inventory == engine.build_component_inventory()
+    assert analysis.execution_tree == engine.build_execution_tree()
+    assert analysis.structural_errors == engine.detect_structural_errors()
+    assert analysis.import_graph == {"pkg.a": {"pkg.b"}, "pkg.b": {"pkg.a"}}
+    assert set(analysis.timings) == {
+        "summaries",
+        "cartesian_map",
+        "component_inventory",
+        "execution_tree",
+        "import_graph",
+        "structural_errors",
+        "total",
+    }
+
+
+def test_filtered_analysis_and_component_lookup_touch_only_candidates(tmp_path: Path) -> None:
+    pkg = tmp_path / "pkg"
+    pkg.mkdir()
+    (pkg / "payments.py").write_text("import pkg.ledger\n\ndef charge():\n    pass\n")
+    (pkg / "ledger.py").write_text("import pkg.payments\n\nclass Ledger:\n    pass\n")
+    (pkg / "other.py").write_text("def ChargeBack():\n    pass\n\ndef unrelated():\n    pass\n")
+    (pkg / "noise.py").write_text("def noise():\n    pass\n")
+
+    engine = SheerAdvancedEngine(str(tmp_path))
+    full = engine.run_full_analysis()
+    expected_components = [item for item in full.inventory if "charge" in str(item["id"]).lower()]
+    expected_findings = [item for item in full.structural_errors if "payments" in str(item["file"]).lower()]
+
+    filtered_engine = SheerAdvancedEngine(str(tmp_path))
+    assert filtered_engine.run_filtered_analysis(["CHARGE"]).inventory == expected_components
+    assert "pkg/noise.py" not in filtered_engine._parsed
+    assert filtered_engine.run_filtered_analysis(["payments"]).structural_errors == expected_findings
+
+    component_engine = SheerAdvancedEngine(str(tmp_path))
+    result = component_engine.analyze_component("pkg/ledger.py:Ledger")
+    assert [item["id"] for item in result["components"]] == ["pkg/ledger.py:Ledger"]
+    assert sorted(component_engine._parsed) == ["pkg/ledger.py"]
+
+
+def test_parsed_module_cache_is_bounded(tmp_path: Path) -> None:
+    from sheer_audit.scan.advanced import PARSED_CACHE_SIZE
+
+    for index in range(PARSED_CACHE_SIZE + 5):
+        (tmp_path / f"m{index}.py").write_text(f"def f{index}():\n    return {index}\n")
+
+    engine = SheerAdvancedEngine(str(tmp_path))
+    inventory = engine.build_component_inventory()
+
+    assert len(inventory) == PARSED_CACHE_SIZE + 5
+    assert len(engine._parsed) == PARSED_CACHE_SIZE
+    assert engine.analyze_component("m0.py:f0")["found"] is True
@@ -149,7 +149,7 @@ def test_new_granular_commands_and_hybrid_persistence(tmp_path: Path) -> None:
     )
     assert analyze_component.exit_code == 0
     assert lineage_sql.exists()
-    assert any(blob_root.glob("*.json"))
+    assert any(blob_root.rglob("*.json.gz"))
 
     blueprint_generate = runner.invoke(
         app,
@@ -1,3 +1,4 @@
+import json
 from pathlib import Path
 
 from sheer_audit.model.db_engine import SheerDBEngine
@@ -66,3 +67,190 @@ def test_db_purge(tmp_path: Path) -> None:
     db.commit_record("errors", {"x": 1})
     db.purge()
     assert not db_file.exists()
+
+
+def test_snapshot_lookup_uses_offset_index_and_catches_up_legacy_appends(tmp_path: Path) -> None:
+    db_file = tmp_path / "audit.sheerdb"
+    db = SheerDBEngine(vault_path=str(db_file))
+    db.commit_record("errors", {"file": "a.py"})
+    db.record_snapshot({"snapshot_id": "s1", "components": []})
+
+    assert db.index_path.exists()
+    assert db.get_snapshot("s1") == {"snapshot_id": "s1", "components": []}
+    assert db.get_snapshot("missing") is None
+
+    # Escritor legado: anexa direto no vault sem atualizar o índice.
+    legacy = SheerDBEngine(vault_path=str(db_file))
+    entry = {"version": "2.1.0", "timestamp": "static", "table": "snapshots", "payload": {"snapshot_id": "s2"}}
+    raw_json = json.dumps(entry, sort_keys=True, ensure_ascii=False)
+    with db_file.open("ab") as handle:
+        handle.write(f"{legacy._generate_hmac(raw_json)}|{raw_json}\n".encode("utf-8"))
+
+    assert db.get_snapshot("s2") == {"snapshot_id": "s2"}
+    assert [item["snapshot_id"] for item in db.list_snapshots()] == ["s1", "s2"]
+
+    stats = db.verify_index()
+    assert stats["entries"] == 3
+    assert stats["inconsistent"] == 0
+    assert stats["covered_bytes"] == stats["vault_bytes"]
+
+    db.index_path.write_text("garbage\n", encoding="utf-8")
+    assert db.verify_index()["inconsistent"] == 1
+    assert db.rebuild_index() == 3
+    assert db.get_snapshot("s1") == {"snapshot_id": "s1", "components": []}
+
+
+def test_iter_entries_streams_and_filters_table_before_decoding(tmp_path: Path, monkeypatch) -> None:
+    import types
+
+    db = SheerDBEngine(vault_path=str(tmp_path / "audit.sheerdb"))
+    db.commit_record("errors", {"file": "a.py"})
+    db.commit_record("cartesian", {"note": '"table": "errors"', "table": "errors"}, timestamp='"table": "errors"')
+    db.commit_record("errors", {"file": "b.py"})
+
+    entries = db.iter_entries("errors")
+    assert isinstance(entries, types.GeneratorType)
+
+    signed: list = []
+    original = db._generate_hmac
+    monkeypatch.setattr(db, "_generate_hmac", lambda payload: signed.append(payload) or original(payload))
+
+    assert [entry["payload"] for entry in entries] == [{"file": "a.py"}, {"file": "b.py"}]
+    assert len(signed) == 2
+    assert db.fetch_all("cartesian") == [{"note": '"table": "errors"', "table": "errors"}]
+
+
+def test_parallel_verify_matches_serial_and_reports_offsets(tmp_path: Path) -> None:
+    db_file = tmp_path / "audit.sheerdb"
+    db = SheerDBEngine(vault_path=str(db_file))
+    for index in range(40):
+        db.commit_record("errors", {"index": index})
+
+    lines = db_file.read_bytes().splitlines(keepends=True)
+    tampered_offset = sum(len(line) for line in lines[:7])
+    lines[7] = lines[7].replace(b'"index": 7', b'"index": 8')
+    lines.insert(20, b"not-a-signed-line\n")
+    db_file.write_bytes(b"".join(lines))
+    malformed_offset = sum(len(line) for line in lines[:20])
+
+    serial = db.verify_integrity_report()
+    parallel = db.verify_integrity_report(jobs=3, chunk_bytes=512)
+
+    assert serial == parallel
+    assert serial["total"] == 41
+    assert serial["invalid"] == 2
+    assert serial["invalid_offsets"] == [tampered_offset, malformed_offset]
+    assert db.verify_integrity(jobs=2) == {"total": 41, "valid": 39, "invalid": 2}
+
+
+def test_verify_chain_resumes_and_full_mode_detects_resigned_old_record(tmp_path: Path) -> None:
+    db_file = tmp_path / "audit.sheerdb"
+    db = SheerDBEngine(vault_path=str(db_file))
+    for index in range(5):
+        db.commit_record("errors", {"index": index})
+
+    first = db.verify_chain()
+    assert first["chain_ok"] is True
+    assert (first["total"], first["checked"], first["resumed_from"]) == (5, 5, 0)
+
+    db.commit_record("errors", {"index": 5})
+    second = db.verify_chain()
+    assert second["chain_ok"] is True
+    assert second["checked"] == 1
+    assert second["resumed_from"] == first["offset"]
+    assert second["total"] == 6
+
+    # Reescreve um registro antigo com assinatura válida (quem tem a chave).
+    lines = db_file.read_bytes().splitlines(keepends=True)
+    entry = {"version": "2.1.0", "timestamp": "static", "table": "errors", "payload": {"index": 99}}
+    raw_json = json.dumps(entry, sort_keys=True, ensure_ascii=False)
+    lines[1] = f"{db._generate_hmac(raw_json)}|{raw_json}\n".encode("utf-8")
+    db_file.write_bytes(b"".join(lines))
+
+    assert db.verify_integrity()["invalid"] == 0
+    full = db.verify_chain(full=True)
+    assert full["chain_ok"] is False
+    assert full["tampered_segment"] is not None
+
+    db_file.write_bytes(b"".join(lines[:2]))
+    truncated = db.verify_chain()
+    assert truncated["chain_ok"] is False
+
+
+def test_commit_many_and_batch_write_in_bulk(tmp_path: Path) -> None:
+    db = SheerDBEngine(vault_path=str(tmp_path / "audit.sheerdb"))
+
+    assert db.commit_many("errors", [{"line": index} for index in range(3)], fsync=True) == 3
+    with db.batch() as batch:
+        batch.commit_record("errors", {"line": 3})
+        batch.commit_record("snapshots", {"snapshot_id": "s1"})
+        assert db.verify_integrity()["total"] == 3
+
+    try:
+        with db.batch() as batch:
+            batch.commit_record("errors", {"line": 4})
+            raise RuntimeError("abort")
+    except RuntimeError:
+        pass
+
+    assert [row["line"] for row in db.fetch_all("errors")] == [0, 1, 2, 3]
+    assert db.get_snapshot("s1") == {"snapshot_id": "s1"}
+    assert db.verify_index()["inconsistent"] == 0
+
+
+def test_sqlite_backend_and_legacy_round_trip(tmp_path: Path) -> None:
+    legacy = SheerDBEngine(vault_path=str(tmp_path / "audit.sheerdb"))
+    legacy.commit_many("errors", [{"line": index} for index in range(3)])
+    legacy.record_snapshot({"snapshot_id": "s1", "files": 1})
+    with legacy.path.open("ab") as handle:
+        handle.write(b"malformed-line\n")
+
+    db = SheerDBEngine(vault_path=str(tmp_path / "audit.sqlite"))
+    assert db.backend == "sqlite"
+    assert db.import_legacy(str(legacy.path)) == 5
+
+    assert [row["line"] for row in db.fetch_all("errors")] == [0, 1, 2]
+    assert db.get_snapshot("s1")["files"] == 1
+    assert [item["snapshot_id"] for item in db.list_snapshots()] == ["s1"]
+    report = db.verify_integrity_report()
+    assert (report["total"], report["valid"], report["invalid"]) == (5, 4, 1)
+    assert db.verify_index()["inconsistent"] == 0
+
+    exported = tmp_path / "exported.sheerdb"
+    assert db.export_legacy(str(exported)) == 5
+    assert exported.read_bytes() == legacy.path.read_bytes()
+
+    db.purge()
+    assert not db.path.exists()
+
+
+def test_cli_verify_chain_reports_unsupported_sqlite_backend(tmp_path: Path) -> None:
+    from typer.testing import CliRunner
+
+    from sheer_audit.cli import app
+
+    result = CliRunner().invoke(app, ["db", "--verify-chain", "--vault-path", str(tmp_path / "audit.sqlite")])
+
+    assert result.exit_code == 2
+    assert not isinstance(result.exception, ValueError)
+    assert "❌" in result.output
+
+
+def test_snapshot_index_is_key_independent_and_caches_only_snapshots(tmp_path: Path, monkeypatch) -> None:
+    db_file = tmp_path / "audit.sheerdb"
+    monkeypatch.setenv("SHEER_DB_SECRET", "key-a")
+    writer = SheerDBEngine(vault_path=str(db_file))
+    writer.commit_many("errors", [{"file": f"m{index}.py"} for index in range(5)])
+    writer.record_snapshot({"snapshot_id": "s1"})
+
+    # Índice reconstruído sob outra chave: as entradas continuam apontando a tabela.
+    monkeypatch.setenv("SHEER_DB_SECRET", "key-b")
+    SheerDBEngine(vault_path=str(db_file)).rebuild_index()
+    assert SheerDBEngine(vault_path=str(db_file)).get_snapshot("s1") is None
+
+    monkeypatch.setenv("SHEER_DB_SECRET", "key-a")
+    reader = SheerDBEngine(vault_path=str(db_file))
+    assert reader.get_snapshot("s1") == {"snapshot_id": "s1"}
+    entries, by_snapshot = reader._load_index()
+    assert [entry["table"] for entry in entries] == ["snapshots"]
+    assert list(by_snapshot) == ["s1"]
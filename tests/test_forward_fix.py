@@ -70,3 +70,25 @@ def test_cli_scan_generates_snapshot_and_db_record(tmp_path: Path) -> None:
     snapshot = json.loads(output_json.read_text(encoding="utf-8"))
     assert snapshot["audit_version"] == "2.0.0"
     assert snapshot["db_user"] == "USER_IA_SERVICE"
+
+
+def test_semantic_scan_only_parses_scope_and_reachable_imports(tmp_path: Path) -> None:
+    from sheer_audit.db.triggers import perform_semantic_scan
+    from sheer_audit.scan.advanced import SheerAdvancedEngine
+
+    (tmp_path / "payments").mkdir()
+    (tmp_path / "shared").mkdir()
+    (tmp_path / "other").mkdir()
+    (tmp_path / "payments" / "api.py").write_text("import shared.util\n", encoding="utf-8")
+    (tmp_path / "shared" / "util.py").write_text("import payments.api\n", encoding="utf-8")
+    (tmp_path / "shared" / "unused.py").write_text("VALUE = 1\n", encoding="utf-8")
+    (tmp_path / "other" / "broken.py").write_text("def oops(:\n", encoding="utf-8")
+
+    engine = SheerAdvancedEngine(str(tmp_path))
+    summaries = engine.scoped_summaries("payments/")
+    assert [item["file"] for item in summaries] == ["payments/api.py", "shared/util.py"]
+    assert sorted(engine._parsed) == ["payments/api.py", "shared/util.py"]
+
+    findings = perform_semantic_scan("payments/", repo_path=str(tmp_path))
+    assert findings["affected_files"] == ["payments/api.py"]
+    assert [error["type"] for error in findings["error_details"]] == ["CircularDependency"]
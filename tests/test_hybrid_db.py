@@ -0,0 +1,96 @@
+import json
+from pathlib import Path
+
+from typer.testing import CliRunner
+
+from sheer_audit.cli import app
+from sheer_audit.model.hybrid_db import HybridAuditDB
+
+runner = CliRunner()
+
+
+def _component(name: str) -> dict:
+    return {"component": name, "ast": {"body": name}, "components": [name], "found": True}
+
+
+def test_persist_many_reuses_connection_and_single_schema(tmp_path: Path) -> None:
+    with HybridAuditDB(sql_path=str(tmp_path / "lineage.db"), blob_root=str(tmp_path / "blobs")) as hybrid:
+        conn = hybrid.init()
+        records = hybrid.persist_many([_component(f"pkg/m{index}.py") for index in range(50)], "1.0.0")
+        single = hybrid.persist_component_audit(_component("pkg/solo.py"), "1.0.1")
+
+        assert hybrid.init() is conn
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        assert len(records) == 50
+        assert single["version_tag"] == "1.0.1"
+        lineage = hybrid.list_lineage()
+
+    assert len(lineage) == 51
+    assert {row["status"] for row in lineage} == {"STABLE"}
+    assert hybrid._conn is None
+
+
+def test_blobs_are_content_addressed_compressed_and_deduplicated(tmp_path: Path) -> None:
+    blob_root = tmp_path / "blobs"
+    with HybridAuditDB(sql_path=str(tmp_path / "lineage.db"), blob_root=str(blob_root)) as hybrid:
+        first = hybrid.persist_component_audit(_component("pkg/a.py"), "1.0.0")
+        second = hybrid.persist_component_audit(_component("pkg/a.py"), "2.0.0")
+        other = hybrid.persist_component_audit(_component("pkg/b.py"), "2.0.0")
+
+        assert first["integrity_hash"] == second["integrity_hash"]
+        assert first["nosql_blob_path"] == second["nosql_blob_path"]
+        assert other["integrity_hash"] != first["integrity_hash"]
+        assert len(list(blob_root.rglob("*.json.gz"))) == 2
+
+        assert hybrid.load_blob(first["integrity_hash"]) == {"body": "pkg/a.py"}
+        assert hybrid.verify_blob(first["integrity_hash"])
+
+        Path(other["nosql_blob_path"]).write_bytes(b"")
+        assert not hybrid.verify_blob(other["integrity_hash"])
+
+
+def test_query_lineage_filters_latest_and_pagination(tmp_path: Path) -> None:
+    sql_path = tmp_path / "lineage.db"
+    with HybridAuditDB(sql_path=str(sql_path), blob_root=str(tmp_path / "blobs")) as hybrid:
+        for version in ("2.9.0", "2.10.0", "1.0.0"):
+            hybrid.persist_many([_component("a.py"), _component("b.py")], version)
+        hybrid.persist_component_audit({"component": "c.py", "found": False}, "3.0.0")
+
+        by_component = hybrid.query_lineage(component="a.py")
+        assert [row["version_tag"] for row in by_component["rows"]] == ["1.0.0", "2.9.0", "2.10.0"]
+
+        ranged = hybrid.query_lineage(version_from="2.9.0", version_to="2.10.0")
+        assert len(ranged["rows"]) == 4
+
+        latest = hybrid.query_lineage(latest=True)
+        assert [(row["component_name"], row["version_tag"]) for row in latest["rows"]] == [
+            ("a.py", "2.10.0"),
+            ("b.py", "2.10.0"),
+            ("c.py", "3.0.0"),
+        ]
+        assert [row["component_name"] for row in hybrid.query_lineage(status="FAIL")["rows"]] == ["c.py"]
+
+        seen = []
+        cursor = None
+        while True:
+            page = hybrid.query_lineage(limit=2, cursor=cursor)
+            seen.extend(row["id"] for row in page["rows"])
+            cursor = page["next_cursor"]
+            if cursor is None:
+                break
+        assert sorted(seen) == sorted(row["id"] for row in hybrid.query_lineage(limit=100)["rows"])
+        assert len(seen) == 7
+
+        plan = " ".join(
+            str(row[-1])
+            for row in hybrid.init().execute(
+                "EXPLAIN QUERY PLAN SELECT id FROM audit_lineage WHERE component_name = ?", ("a.py",)
+            )
+        )
+        assert "idx_lineage_component" in plan
+
+    result = runner.invoke(
+        app, ["analyze", "lineage", "--sql-path", str(sql_path), "--latest", "--status", "STABLE"]
+    )
+    assert result.exit_code == 0
+    assert json.loads(result.stdout)["rows"][0]["version_tag"] == "2.10.0"
@@ -45,3 +45,41 @@ def test_detect_prohibited_reachability_from_core_to_io(tmp_path: Path) -> None:
     errors = engine.detect_structural_errors()
 
     assert any(err["type"] == "ForbiddenReachability" for err in errors)
+
+
+def test_parallel_jobs_match_serial_results(tmp_path: Path) -> None:
+    pkg = tmp_path / "pkg"
+    pkg.mkdir()
+    (pkg / "__init__.py").write_text("\n")
+    for index in range(6):
+        (pkg / f"m{index}.py").write_text(
+            f"from pkg import m{(index + 1) % 6}\n\nclass C{index}:\n    def run(self):\n        if True:\n            return {index}\n"
+        )
+    (tmp_path / "broken.py").write_text("def oops(:\n")
+
+    serial = SheerAdvancedEngine(str(tmp_path))
+    parallel = SheerAdvancedEngine(str(tmp_path), jobs=2)
+
+    assert parallel.generate_cartesian_map() == serial.generate_cartesian_map()
+    assert parallel.detect_structural_errors() == serial.detect_structural_errors()
+
+
+def test_complexity_accumulates_nested_bodies_in_single_pass(tmp_path: Path) -> None:
+    (tmp_path / "nested.py").write_text(
+        """
+def outer():
+    if True:
+        pass
+    def inner():
+        for item in []:
+            if item:
+                pass
+""".strip()
+        + "\n"
+    )
+
+    engine = SheerAdvancedEngine(str(tmp_path))
+    vector = {item["x"]: item for item in engine.generate_cartesian_map()["complexity_vector"]}
+
+    assert vector["nested.py:inner"]["stage_impact"] == 2.9
+    assert vector["nested.py:outer"]["stage_impact"] == 4.1
@@ -0,0 +1,75 @@
+from array import array
+from pathlib import Path
+
+from sheer_audit.scan.advanced import SheerAdvancedEngine
+from sheer_audit.scan.graph import CompactGraph
+
+
+def test_call_graph_resolves_local_self_and_imported_targets(tmp_path: Path) -> None:
+    pkg = tmp_path / "pkg"
+    pkg.mkdir()
+    (pkg / "__init__.py").write_text("def helper():\n    pass\n")
+    (pkg / "util.py").write_text("import os\n\ndef clean(value):\n    return os.path.basename(value)\n")
+    (pkg / "app.py").write_text(
+        "from . import helper\n"
+        "from .util import clean as tidy\n"
+        "import pkg.util\n"
+        "\n"
+        "class Service:\n"
+        "    def run(self):\n"
+        "        self.step()\n"
+        "        return tidy('x')\n"
+        "\n"
+        "    def step(self):\n"
+        "        return helper()\n"
+        "\n"
+        "def main():\n"
+        "    Service()\n"
+        "    pkg.util.clean('a')\n"
+        "    print('done')\n"
+        "\n"
+        "main()\n"
+    )
+
+    engine = SheerAdvancedEngine(str(tmp_path))
+    edges = engine.build_call_edges()
+
+    assert {edge.type for edge in edges} == {"CALLS"}
+    assert [(edge.src, edge.dst) for edge in edges] == [
+        ("pkg/app.py", "pkg/app.py:main"),
+        ("pkg/app.py:main", "pkg/app.py:Service"),
+        ("pkg/app.py:main", "pkg/util.py:clean"),
+        ("pkg/app.py:run", "pkg/app.py:step"),
+        ("pkg/app.py:run", "pkg/util.py:clean"),
+        ("pkg/app.py:step", "pkg/__init__.py:helper"),
+    ]
+    graph = engine.build_call_graph()
+    assert "pkg/util.py:clean" in graph and graph.edge_count == len(edges)
+
+
+def test_compact_graph_from_edges_sorts_and_deduplicates_rows() -> None:
+    graph = CompactGraph.from_edges(["a", "b", "c"], array("l", [2, 0, 0, 0]), array("l", [0, 2, 1, 2]))
+
+    assert list(graph.offsets) == [0, 2, 2, 3]
+    assert graph.to_mapping() == {"a": {"b", "c"}, "b": set(), "c": {"a"}}
+
+
+def test_cli_exports_call_edges_in_repo_model(tmp_path: Path) -> None:
+    import json
+
+    from typer.testing import CliRunner
+
+    from sheer_audit.cli import app
+    from sheer_audit.model.schema import RepoModel
+
+    (tmp_path / "a.py").write_text("def helper():\n    pass\n\ndef main():\n    helper()\n")
+    output = tmp_path / "out" / "call_graph.json"
+
+    result = CliRunner().invoke(
+        app, ["analyze", "calls", "--repo-path", str(tmp_path), "--output", str(output), "--index-path", ""]
+    )
+    assert result.exit_code == 0, result.output
+
+    report = RepoModel.model_validate(json.loads(output.read_text(encoding="utf-8")))
+    assert [(edge.type, edge.src, edge.dst) for edge in report.edges] == [("CALLS", "a.py:main", "a.py:helper")]
+    assert report.metrics == {"call_edges": 1}
@@ -0,0 +1,111 @@
+import shutil
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from sheer_audit.scan.advanced import SheerAdvancedEngine
+from sheer_audit.scan.gitindex import changed_files, read_index_paths, tracked_files
+
+pytestmark = pytest.mark.skipif(shutil.which("git") is None, reason="git indisponível")
+
+
+def _git(repo: Path, *args: str) -> str:
+    completed = subprocess.run(
+        ["git", "-C", str(repo), "-c", "user.name=t", "-c", "user.email=t@t", *args],
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    return completed.stdout
+
+
+def _repo(tmp_path: Path) -> Path:
+    repo = tmp_path / "repo"
+    (repo / "pkg" / "deep" / ("x" * 40)).mkdir(parents=True)
+    (repo / "pkg" / "a.py").write_text("import pkg.b\n", encoding="utf-8")
+    (repo / "pkg" / "b.py").write_text("VALUE = 1\n", encoding="utf-8")
+    (repo / "pkg" / "deep" / ("x" * 40) / "long_module_name.py").write_text("pass\n", encoding="utf-8")
+    (repo / "README.md").write_text("doc\n", encoding="utf-8")
+    _git(repo, "init", "-q")
+    _git(repo, "add", ".")
+    _git(repo, "commit", "-q", "-m", "base")
+    return repo
+
+
+@pytest.mark.parametrize("version", ["2", "3", "4"])
+def test_read_index_paths_matches_ls_files(tmp_path: Path, version: str) -> None:
+    repo = _repo(tmp_path)
+    _git(repo, "update-index", "--index-version", version)
+
+    expected = sorted(_git(repo, "ls-files", "-z").split("\0")[:-1])
+    assert read_index_paths(repo / ".git" / "index") == expected
+    assert tracked_files(repo) == expected
+
+
+def test_git_discovery_and_since_mode(tmp_path: Path) -> None:
+    repo = _repo(tmp_path)
+    (repo / "junk.py").write_text("def broken(:\n", encoding="utf-8")
+
+    engine = SheerAdvancedEngine(str(repo), discovery="git")
+    files = [item["file"] for item in engine.generate_cartesian_map()["coordinates"]]
+    assert "junk.py" not in {item.split(":", 1)[0] for item in files}
+
+    (repo / "pkg" / "b.py").write_text("VALUE = 2\n", encoding="utf-8")
+    assert changed_files(repo, "HEAD") == ["junk.py", "pkg/b.py"]
+
+    scoped = SheerAdvancedEngine(str(repo), since="HEAD")
+    assert [item["file"] for item in scoped._file_summaries()] == ["junk.py", "pkg/b.py"]
+    assert scoped.detect_structural_errors()[0]["file"] == "junk.py"
+
+    with pytest.raises(ValueError):
+        SheerAdvancedEngine(str(repo), since="no-such-ref")._file_summaries()
+
+
+def test_since_mode_keeps_cycles_through_unchanged_files(tmp_path: Path) -> None:
+    from sheer_audit.db.triggers import perform_semantic_scan
+
+    repo = tmp_path / "repo"
+    (repo / "pkg").mkdir(parents=True)
+    (repo / "pkg" / "a.py").write_text("VALUE = 1\n", encoding="utf-8")
+    (repo / "pkg" / "b.py").write_text("import pkg.a\n", encoding="utf-8")
+    _git(repo, "init", "-q")
+    _git(repo, "add", ".")
+    _git(repo, "commit", "-q", "-m", "base")
+    (repo / "pkg" / "a.py").write_text("import pkg.b\n", encoding="utf-8")
+
+    full = SheerAdvancedEngine(str(repo)).detect_structural_errors()
+    assert [error["file"] for error in full] == ["pkg/a.py", "pkg/b.py"]
+
+    since = SheerAdvancedEngine(str(repo), since="HEAD")
+    assert [item["file"] for item in since._file_summaries()] == ["pkg/a.py"]
+    assert since.detect_structural_errors() == full[:1]
+    assert since.run_full_analysis().structural_errors == full[:1]
+
+    findings = perform_semantic_scan("pkg/", repo_path=str(repo), since="HEAD")
+    assert [error["type"] for error in findings["error_details"]] == ["CircularDependency"]
+    assert findings["affected_files"] == ["pkg/a.py"]
+
+
+def test_since_and_git_discovery_from_a_worktree_subdirectory(tmp_path: Path) -> None:
+    repo = tmp_path / "repo"
+    (repo / "sub" / "pkg").mkdir(parents=True)
+    (repo / "top.py").write_text("VALUE = 0\n", encoding="utf-8")
+    (repo / "sub" / "pkg" / "m1.py").write_text("VALUE = 1\n", encoding="utf-8")
+    (repo / "sub" / "pkg" / "m2.py").write_text("VALUE = 2\n", encoding="utf-8")
+    _git(repo, "init", "-q")
+    _git(repo, "add", ".")
+    _git(repo, "commit", "-q", "-m", "base")
+    (repo / "top.py").write_text("VALUE = 10\n", encoding="utf-8")
+    (repo / "sub" / "pkg" / "m2.py").write_text("def two():\n    return 2\n", encoding="utf-8")
+    (repo / "sub" / "pkg" / "new.py").write_text("def new():\n    return 3\n", encoding="utf-8")
+
+    sub = repo / "sub"
+    assert changed_files(sub, "HEAD") == ["pkg/m2.py", "pkg/new.py"]
+    assert tracked_files(sub) == ["pkg/m1.py", "pkg/m2.py"]
+
+    engine = SheerAdvancedEngine(str(sub), since="HEAD")
+    assert [item["x"] for item in engine.generate_cartesian_map()["coordinates"]] == ["pkg/m2.py:two", "pkg/new.py:new"]
+
+    tracked = SheerAdvancedEngine(str(sub), discovery="git", since="HEAD")
+    assert [item["file"] for item in tracked._file_summaries()] == ["pkg/m2.py"]
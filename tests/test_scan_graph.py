@@ -0,0 +1,123 @@
+from pathlib import Path
+
+from sheer_audit.scan.advanced import SheerAdvancedEngine
+from sheer_audit.scan.graph import cycle_groups, strongly_connected_components
+
+
+def test_tarjan_components_and_cycle_groups() -> None:
+    graph = {
+        "a": {"b"},
+        "b": {"c"},
+        "c": {"a", "d"},
+        "d": {"e"},
+        "e": {"d"},
+        "f": {"f"},
+        "g": {"a"},
+    }
+
+    components = strongly_connected_components(graph)
+    assert sorted(components) == [["a", "b", "c"], ["d", "e"], ["f"], ["g"]]
+    # Ordem topológica reversa: {d, e} é alcançado por {a, b, c}, que é alcançado por g.
+    assert components.index(["d", "e"]) < components.index(["a", "b", "c"]) < components.index(["g"])
+
+    assert cycle_groups(graph) == [
+        {"modules": ["a", "b", "c"], "cycle": ["a", "b", "c", "a"]},
+        {"modules": ["d", "e"], "cycle": ["d", "e", "d"]},
+        {"modules": ["f"], "cycle": ["f", "f"]},
+    ]
+
+
+def test_cycle_groups_handle_deep_graphs_without_recursion() -> None:
+    size = 20000
+    graph = {f"m{index}": {f"m{index + 1}"} for index in range(size)}
+    graph[f"m{size}"] = {"m0"}
+
+    groups = cycle_groups(graph)
+    assert len(groups) == 1
+    assert len(groups[0]["modules"]) == size + 1
+    assert groups[0]["cycle"][0] == groups[0]["cycle"][-1] == "m0"
+
+
+def test_engine_reports_every_member_of_cycle_group(tmp_path: Path) -> None:
+    pkg = tmp_path / "pkg"
+    pkg.mkdir()
+    (pkg / "a.py").write_text("import pkg.b\n")
+    (pkg / "b.py").write_text("import pkg.c\n")
+    (pkg / "c.py").write_text("import pkg.a\n")
+
+    engine = SheerAdvancedEngine(str(tmp_path))
+    assert engine.detect_cycle_groups() == [
+        {"modules": ["pkg.a", "pkg.b", "pkg.c"], "cycle": ["pkg.a", "pkg.b", "pkg.c", "pkg.a"]}
+    ]
+    errors = engine.detect_structural_errors()
+    assert [error["file"] for error in errors] == ["pkg/a.py", "pkg/b.py", "pkg/c.py"]
+    assert all("pkg.a -> pkg.b -> pkg.c -> pkg.a" in error["fix"] for error in errors)
+
+
+def _legacy_witnesses(graph, starts, targets):
+    witnesses = {}
+    for start in sorted(starts):
+        queue = [[start]]
+        visited = set()
+        while queue:
+            path = queue.pop(0)
+            node = path[-1]
+            if node in visited:
+                continue
+            visited.add(node)
+            if node in targets and len(path) > 1:
+                witnesses[start] = path
+                break
+            for nxt in sorted(graph.get(node, set())):
+                if nxt not in visited:
+                    queue.append(path + [nxt])
+    return witnesses
+
+
+def test_layer_violations_match_per_start_bfs() -> None:
+    import random
+
+    from sheer_audit.scan.graph import layer_violations
+
+    rng = random.Random(7)
+    nodes = [f"n{index}" for index in range(60)]
+    for _ in range(20):
+        graph = {node: set(rng.sample(nodes, rng.randint(0, 3))) for node in nodes}
+        starts = set(rng.sample(nodes, 10))
+        targets = set(rng.sample([node for node in nodes if node not in starts], 5))
+        layers = {node: "core" if node in starts else "io" if node in targets else "other" for node in nodes}
+        found = {start: path for _, start, path in layer_violations(graph, layers, [("core", "io")])}
+        assert found == _legacy_witnesses(graph, starts, targets)
+
+
+def test_engine_reports_forbidden_core_to_io_path(tmp_path: Path) -> None:
+    (tmp_path / "core").mkdir()
+    (tmp_path / "scan").mkdir()
+    (tmp_path / "core" / "rules.py").write_text("import core.helpers\n")
+    (tmp_path / "core" / "helpers.py").write_text("import scan.reader\n")
+    (tmp_path / "scan" / "reader.py").write_text("VALUE = 1\n")
+
+    errors = SheerAdvancedEngine(str(tmp_path)).detect_prohibited_reachability()
+    assert [(error.file, error.fix.rsplit(": ", 1)[1]) for error in errors] == [
+        ("core/helpers.py", "core.helpers -> scan.reader"),
+        ("core/rules.py", "core.rules -> core.helpers -> scan.reader"),
+    ]
+
+
+def test_compact_graph_round_trip_and_shared_analyses() -> None:
+    from sheer_audit.scan.graph import CompactGraph, layer_violations
+
+    graph = {"b": {"c", "a"}, "a": {"b"}, "c": set(), "d": {"x"}}
+    compact = CompactGraph.from_mapping(graph)
+
+    assert compact.names == ["a", "b", "c", "d", "x"]
+    assert list(compact.offsets) == [0, 1, 3, 3, 4, 4]
+    assert list(compact.neighbors(compact.id_of["b"])) == [0, 2]
+    assert compact.has_edge(0, 1) and not compact.has_edge(1, 3)
+    assert compact.to_mapping() == {"a": {"b"}, "b": {"a", "c"}, "c": set(), "d": {"x"}, "x": set()}
+    assert CompactGraph.from_mapping(compact.to_mapping()).to_mapping() == compact.to_mapping()
+
+    assert strongly_connected_components(compact) == strongly_connected_components(graph)
+    assert cycle_groups(compact) == cycle_groups(graph) == [{"modules": ["a", "b"], "cycle": ["a", "b", "a"]}]
+    layers = {"a": "core", "d": "core", "c": "io", "x": "io"}
+    assert layer_violations(compact, layers, [("core", "io")]) == [(0, "a", ["a", "b", "c"]), (0, "d", ["d", "x"])]
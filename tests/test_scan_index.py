@@ -0,0 +1,87 @@
+import ast
+from pathlib import Path
+
+from sheer_audit.scan.advanced import SheerAdvancedEngine
+from sheer_audit.scan.index import AnalysisIndex
+
+
+def _count_parses(monkeypatch) -> list:
+    parsed: list = []
+    original_parse = ast.parse
+
+    def counting_parse(source, filename="<unknown>", *args, **kwargs):
+        parsed.append(filename)
+        return original_parse(source, filename, *args, **kwargs)
+
+    monkeypatch.setattr(ast, "parse", counting_parse)
+    return parsed
+
+
+def test_index_reuses_unchanged_files_across_engines(tmp_path: Path, monkeypatch) -> None:
+    (tmp_path / "a.py").write_text("def alpha():\n    return 1\n")
+    (tmp_path / "b.py").write_text("import a\n\nclass Beta:\n    pass\n")
+    index_file = tmp_path / "cache" / "analysis_index.json"
+
+    first = SheerAdvancedEngine(str(tmp_path), index_path=str(index_file))
+    baseline = first.generate_cartesian_map()
+    assert index_file.exists()
+
+    parsed = _count_parses(monkeypatch)
+    (tmp_path / "a.py").write_text("def alpha():\n    return 1\n\ndef gamma():\n    return 3\n")
+
+    second = SheerAdvancedEngine(str(tmp_path), index_path=str(index_file))
+    mapping = second.generate_cartesian_map()
+
+    assert parsed == ["a.py"]
+    assert len(mapping["coordinates"]) == len(baseline["coordinates"]) + 1
+    assert second.detect_structural_errors() == []
+
+
+def test_index_ignores_entries_from_other_repo(tmp_path: Path) -> None:
+    index_file = tmp_path / "index.json"
+    index = AnalysisIndex(index_file, tmp_path / "one")
+    index.put("a.py", {"hash": "x"}, mtime_ns=1, size=1)
+    index.save()
+
+    assert AnalysisIndex(index_file, tmp_path / "one").get("a.py", 1, 1) is not None
+    assert AnalysisIndex(index_file, tmp_path / "two").files == {}
+
+
+def test_default_index_lives_in_user_cache_not_in_repo(tmp_path: Path, monkeypatch) -> None:
+    from sheer_audit.scan.index import DEFAULT_INDEX_PATH, user_cache_index_path
+
+    repo = tmp_path / "repo"
+    repo.mkdir()
+    (repo / "a.py").write_text("def alpha():\n    return 1\n")
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+
+    engine = SheerAdvancedEngine(str(repo), index_path=DEFAULT_INDEX_PATH)
+    engine.build_component_inventory()
+
+    assert sorted(path.name for path in repo.rglob("*")) == ["a.py"]
+    assert engine.index.path == user_cache_index_path(repo)
+    assert engine.index.path.exists() and engine.index.path.is_relative_to(tmp_path / "cache")
+
+
+def test_index_rehashes_files_written_within_the_racy_window(tmp_path: Path) -> None:
+    import os
+
+    target = tmp_path / "a.py"
+    target.write_text("def alpha():\n    return 1\n")
+    stat = target.stat()
+    index_file = tmp_path / "cache" / "analysis_index.json"
+
+    first = SheerAdvancedEngine(str(tmp_path), index_path=str(index_file))
+    assert [item["x"] for item in first.generate_cartesian_map()["coordinates"]] == ["a.py:alpha"]
+    assert first.index.files["a.py"]["mtime_ns"] is None
+
+    # Mesmo tamanho e mesmo mtime: só o hash revela a edição.
+    target.write_text("def omega():\n    return 1\n")
+    os.utime(target, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+    second = SheerAdvancedEngine(str(tmp_path), index_path=str(index_file))
+    assert [item["x"] for item in second.generate_cartesian_map()["coordinates"]] == ["a.py:omega"]
+
+    index = AnalysisIndex(None, tmp_path)
+    index.put("b.py", {"hash": "x"}, mtime_ns=10, size=1, now_ns=10 + 3_000_000_000)
+    assert index.get("b.py", 10, 1) is not None
@@ -0,0 +1,98 @@
+from pathlib import Path
+
+import pytest
+
+from sheer_audit.config import ArchitectureConfig, load_config
+from sheer_audit.scan.advanced import SheerAdvancedEngine
+from sheer_audit.scan.layers import LayerRulesEngine
+
+
+def test_layer_globs_compile_into_single_first_match_matcher() -> None:
+    engine = LayerRulesEngine.from_config(
+        ArchitectureConfig(
+            layers=["domain", "adapters", "api"],
+            layer_paths=["domain=src/app/domain/**", "adapters=src/app/**/adapters/*.py", "api=src/app/**"],
+            forbidden_imports=[{"from": "domain", "to": "adapters"}],
+        )
+    )
+
+    assert engine.layer_of("src.app.domain") == "domain"
+    assert engine.layer_of("src.app.domain.orders.model") == "domain"
+    assert engine.layer_of("src.app.payments.adapters.db") == "adapters"
+    assert engine.layer_of("src.app.payments.adapters.db.extra") == "api"
+    assert engine.layer_of("tools.script") == "unknown"
+
+
+def test_invalid_rules_are_rejected() -> None:
+    with pytest.raises(ValueError):
+        LayerRulesEngine.from_config(ArchitectureConfig(layer_paths=["x=a/**"], forbidden_imports=[{"from": "x"}]))
+    with pytest.raises(ValueError):
+        LayerRulesEngine.from_config(
+            ArchitectureConfig(layers=["x"], layer_paths=["a/**"], forbidden_imports=[{"from": "x", "to": "y"}])
+        )
+
+
+def _layered_repo(tmp_path: Path) -> None:
+    for package in ("domain", "adapters", "api"):
+        (tmp_path / package).mkdir()
+    (tmp_path / "domain" / "orders.py").write_text("import domain.pricing\n")
+    (tmp_path / "domain" / "pricing.py").write_text("import adapters.db\n")
+    (tmp_path / "adapters" / "db.py").write_text("import api.routes\n")
+    (tmp_path / "api" / "routes.py").write_text("VALUE = 1\n")
+    (tmp_path / "sheer.toml").write_text(
+        """
+[architecture]
+layers = ["domain", "adapters", "api"]
+layer_paths = ["domain/**", "adapters/**", "api/**"]
+forbidden_imports = [
+    { from = "domain", to = "adapters", impact = "HIGH" },
+    { from = "domain", to = "api", impact = "CRITICAL" },
+    { from = "adapters", to = "domain" },
+]
+"""
+    )
+
+
+def test_engine_evaluates_all_configured_rules(tmp_path: Path) -> None:
+    _layered_repo(tmp_path)
+    architecture = load_config(str(tmp_path / "sheer.toml")).architecture
+
+    errors = SheerAdvancedEngine(str(tmp_path), architecture=architecture).detect_prohibited_reachability()
+    assert sorted((error.file, error.impact, error.fix.rsplit(": ", 1)[1]) for error in errors) == [
+        ("domain/orders.py", "CRITICAL", "domain.orders -> domain.pricing -> adapters.db -> api.routes"),
+        ("domain/orders.py", "HIGH", "domain.orders -> domain.pricing -> adapters.db"),
+        ("domain/pricing.py", "CRITICAL", "domain.pricing -> adapters.db -> api.routes"),
+        ("domain/pricing.py", "HIGH", "domain.pricing -> adapters.db"),
+    ]
+
+
+def test_without_architecture_section_legacy_core_to_io_rule_applies() -> None:
+    engine = LayerRulesEngine.from_config(ArchitectureConfig())
+    assert engine.layer_of("pkg.core.rules") == "core"
+    assert engine.layer_of("pkg.scan.reader") == "io"
+    assert [rule.source + "->" + rule.target for rule in engine.rules] == ["core->io"]
+
+
+def test_every_entry_point_uses_the_repo_architecture(tmp_path: Path) -> None:
+    from typer.testing import CliRunner
+
+    from sheer_audit.cli import app
+    from sheer_audit.config import load_architecture
+    from sheer_audit.db.triggers import perform_semantic_scan
+    from sheer_audit.model.db_engine import SheerDBEngine
+
+    _layered_repo(tmp_path)
+    assert load_architecture(str(tmp_path)) == load_config(str(tmp_path / "sheer.toml")).architecture
+    expected = {
+        ("domain/orders.py", "ForbiddenReachability"),
+        ("domain/pricing.py", "ForbiddenReachability"),
+    }
+
+    findings = perform_semantic_scan("domain/", repo_path=str(tmp_path))
+    assert {(error["file"], error["type"]) for error in findings["error_details"]} == expected
+
+    vault = tmp_path / "out" / "audit.sheerdb"
+    result = CliRunner().invoke(app, ["audit-secure", "--repo-path", str(tmp_path), "--vault-path", str(vault)])
+    assert result.exit_code == 0, result.output
+    recorded = SheerDBEngine(vault_path=str(vault)).fetch_all("system_errors")
+    assert {(entry["file"], entry["type"]) for entry in recorded} == expected
@@ -31,3 +31,40 @@ def test_collect_python_files_ignores_include_dir_outside_root(tmp_path: Path) -
     files = collect_python_files(str(tmp_path), cfg)
 
     assert files == ["safe.py"]
+
+
+def test_discover_python_files_reuses_unchanged_directory_listings(tmp_path: Path, monkeypatch) -> None:
+    import os
+
+    from sheer_audit.scan import repo as repo_module
+
+    pkg = tmp_path / "pkg"
+    pkg.mkdir()
+    (pkg / "a.py").write_text("pass\n")
+    (tmp_path / "notes.txt").write_text("x\n")
+    old = 1_000_000_000
+    for directory in (tmp_path, pkg):
+        os.utime(directory, ns=(old, old))
+
+    cache_path = tmp_path / "cache" / "dirs.json"
+    cfg = ScanConfig(include_dirs=["."], exclude_dirs=["cache"])
+    first = repo_module.discover_python_files(str(tmp_path), cfg, cache_path=str(cache_path))
+    assert [item[0] for item in first] == ["pkg/a.py"]
+    assert first[0][2] == (pkg / "a.py").stat().st_size
+    assert cache_path.exists()
+
+    # Novo processo: cache só em disco; nenhum scandir para diretórios inalterados.
+    repo_module._DIR_CACHES.clear()
+    os.utime(tmp_path, ns=(old, old))
+    scanned = []
+    real_scandir = os.scandir
+    monkeypatch.setattr(repo_module.os, "scandir", lambda path: scanned.append(path) or real_scandir(path))
+    assert repo_module.collect_python_files(str(tmp_path), cfg, cache_path=str(cache_path)) == ["pkg/a.py"]
+    assert scanned == []
+
+    (pkg / "b.py").write_text("pass\n")
+    assert repo_module.collect_python_files(str(tmp_path), cfg, cache_path=str(cache_path)) == [
+        "pkg/a.py",
+        "pkg/b.py",
+    ]
+    assert scanned == [pkg.as_posix()]
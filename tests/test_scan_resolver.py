@@ -0,0 +1,46 @@
+from pathlib import Path
+
+from sheer_audit.scan.advanced import SheerAdvancedEngine
+from sheer_audit.scan.resolver import ModuleResolver
+
+
+def test_resolver_handles_relative_submodule_and_src_layout_imports() -> None:
+    resolver = ModuleResolver(
+        [
+            "src/app/__init__.py",
+            "src/app/config.py",
+            "src/app/scan/__init__.py",
+            "src/app/scan/repo.py",
+            "src/app/scan/index.py",
+            "tools/run.py",
+        ]
+    )
+
+    repo = "src/app/scan/repo.py"
+    assert resolver.resolve(repo, [[2, "config", ["ScanConfig"]]]) == {"src.app.config"}
+    assert resolver.resolve(repo, [[1, "index", ["AnalysisIndex"]]]) == {"src.app.scan.index"}
+    assert resolver.resolve(repo, [[1, "", ["index"]]]) == {"src.app.scan", "src.app.scan.index"}
+    assert resolver.resolve("src/app/scan/__init__.py", [[1, "repo", ["x"]]]) == {"src.app.scan.repo"}
+    assert resolver.resolve(repo, [[5, "", ["x"]]]) == set()
+
+    tool = "tools/run.py"
+    assert resolver.resolve(tool, [[0, "app.scan.repo", []]]) == {"src.app.scan.repo"}
+    assert resolver.resolve(tool, [[0, "app.scan", ["repo", "missing"]]]) == {"src.app.scan", "src.app.scan.repo"}
+    assert resolver.resolve(tool, [[0, "app.config.ScanConfig", []]]) == {"src.app.config"}
+    assert resolver.resolve(tool, [[0, "os.path", []], [0, "json", ["dumps"]]]) == set()
+
+
+def test_engine_finds_cycles_through_relative_imports(tmp_path: Path) -> None:
+    pkg = tmp_path / "src" / "app"
+    pkg.mkdir(parents=True)
+    (pkg / "__init__.py").write_text("")
+    (pkg / "models.py").write_text("from .services import run\n")
+    (pkg / "services.py").write_text("from . import models\n")
+
+    engine = SheerAdvancedEngine(str(tmp_path))
+    graph = engine._collect_import_graph()
+    assert graph["src.app.models"] == {"src.app.services"}
+    assert graph["src.app.services"] == {"src.app", "src.app.models"}
+    assert engine.detect_cycle_groups() == [
+        {"modules": ["src.app.models", "src.app.services"], "cycle": ["src.app.models", "src.app.services", "src.app.models"]}
+    ]
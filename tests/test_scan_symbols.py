@@ -0,0 +1,56 @@
+from pathlib import Path
+
+from sheer_audit.scan.advanced import SheerAdvancedEngine
+from sheer_audit.scan.symbols import SymbolIndex
+
+
+def _repo(tmp_path: Path) -> Path:
+    pkg = tmp_path / "pkg"
+    pkg.mkdir()
+    (pkg / "__init__.py").write_text("")
+    (pkg / "billing.py").write_text(
+        "class Invoice:\n    def total(self):\n        return 1\n\n\ndef invoice_total():\n    return 2\n"
+    )
+    (pkg / "users.py").write_text("def total():\n    return 3\n")
+    return tmp_path
+
+
+def test_symbol_index_exact_prefix_substring_and_persistence(tmp_path: Path) -> None:
+    engine = SheerAdvancedEngine(str(_repo(tmp_path)))
+    index = engine.build_symbol_index()
+
+    assert [entry.line for entry in index.exact("pkg/billing.py:Invoice")] == [1]
+    assert [entry.id for entry in index.prefix("pkg/billing.py:")] == [
+        "pkg/billing.py:Invoice",
+        "pkg/billing.py:invoice_total",
+        "pkg/billing.py:total",
+    ]
+    assert [entry.id for entry in index.substring("total")] == [
+        "pkg/billing.py:invoice_total",
+        "pkg/billing.py:total",
+        "pkg/users.py:total",
+    ]
+    assert index.substring("missing") == []
+    assert index.module_file("pkg") == "pkg/__init__.py"
+    assert index.module_file("pkg.users") == "pkg/users.py"
+
+    target = tmp_path / "cache" / "symbols.json"
+    index.save(target)
+    loaded = SymbolIndex.load(target)
+    assert loaded is not None
+    assert loaded.ids == index.ids
+    assert loaded.prefix("pkg/users") == index.prefix("pkg/users")
+
+
+def test_analyze_component_returns_only_matched_symbol_ast(tmp_path: Path) -> None:
+    engine = SheerAdvancedEngine(str(_repo(tmp_path)))
+
+    result = engine.analyze_component("pkg/billing.py:Invoice")
+    assert list(result["ast"]) == ["pkg/billing.py:Invoice"]
+    assert result["ast"]["pkg/billing.py:Invoice"].startswith("ClassDef(name='Invoice'")
+    assert "invoice_total" not in result["ast"]["pkg/billing.py:Invoice"]
+
+    module = SheerAdvancedEngine(str(tmp_path)).analyze_component("pkg.users")
+    assert list(module["ast"]) == ["pkg/users.py"]
+    assert module["ast"]["pkg/users.py"].startswith("Module(")
+    assert [item["id"] for item in module["components"]] == ["pkg/users.py:total"]